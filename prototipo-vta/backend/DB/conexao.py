@@ -1,6 +1,7 @@
 import psycopg2
 import psycopg2.extras
 import os
+from backend.DB.pool import obter_pool
 
 class Conexao:
 
@@ -16,16 +17,26 @@ class Conexao:
             self.db_config = {
                 "dbname": os.getenv("DB_NAME", "agendavta"),
                 "user": os.getenv("DB_USER", "postgres"),
-                "password": os.getenv("DB_PASSWORD", "postgres"),
+                # DB_PASS é o nome usado no .env original das rotas Flask
+                "password": os.getenv("DB_PASSWORD", os.getenv("DB_PASS", "postgres")),
                 "host": os.getenv("DB_HOST", "localhost"),
                 "port": os.getenv("DB_PORT", "5432"),
             }
 
-    # Abre uma conexão com o banco de dados PostgreSQL.
-    def _get_conn(self):
+    # Abre uma nova conexão física com o banco de dados PostgreSQL (usada pelo pool).
+    def _abrir_conexao(self):
         if self.conn_str:
             # Conecta usando string de conexão direta
             return psycopg2.connect(self.conn_str, cursor_factory=psycopg2.extras.RealDictCursor)
         else:
             # Conecta usando dicionário de configuração
-            return psycopg2.connect(**self.db_config, cursor_factory=psycopg2.extras.RealDictCursor)
\ No newline at end of file
+            return psycopg2.connect(**self.db_config, cursor_factory=psycopg2.extras.RealDictCursor)
+
+    # Retorna o pool do processo para esta configuração (compartilhado entre serviços).
+    def _pool(self):
+        chave = self.conn_str or tuple(sorted(self.db_config.items()))
+        return obter_pool(chave, self._abrir_conexao)
+
+    # Empresta uma conexão do pool; ao sair do "with" ela é devolvida (commit/rollback automático).
+    def _get_conn(self):
+        return self._pool().conexao()
@@ -0,0 +1,43 @@
+from flask import g
+from backend.DB.conexao import Conexao
+
+# Configuração única (variáveis de ambiente) compartilhada com os serviços
+_conexao_padrao = None
+
+
+def conexao_padrao() -> Conexao:
+    """Retorna a Conexao padrão do processo (mesmo pool usado pelos serviços)."""
+    global _conexao_padrao
+    if _conexao_padrao is None:
+        _conexao_padrao = Conexao()
+    return _conexao_padrao
+
+
+def obter_conexao():
+    """
+    Retorna a conexão da requisição atual, emprestada do pool na primeira chamada.
+
+    Usa RealDictCursor (linhas como dicionário), igual aos serviços. A conexão
+    é devolvida ao pool automaticamente no teardown do app context.
+
+    Returns:
+        Conexão psycopg2 válida até o fim da requisição
+    """
+    if "db_conn" not in g:
+        emprestimo = conexao_padrao()._get_conn()
+        g.db_conn = emprestimo.__enter__()
+        g.db_emprestimo = emprestimo
+    return g.db_conn
+
+
+def liberar_conexao(exc=None) -> None:
+    """Devolve a conexão da requisição ao pool (commit, ou rollback se houve erro)."""
+    emprestimo = g.pop("db_emprestimo", None)
+    g.pop("db_conn", None)
+    if emprestimo is not None:
+        emprestimo.__exit__(type(exc) if exc else None, exc, None)
+
+
+def init_app(app) -> None:
+    """Registra a devolução da conexão no ciclo de vida da aplicação Flask."""
+    app.teardown_appcontext(liberar_conexao)
@@ -0,0 +1,56 @@
+-- 001_agendamento_sem_conflito.sql
+--
+-- Tabela de agendamentos com detecção de conflito feita pelo próprio PostgreSQL.
+-- Duas restrições de exclusão (GiST sobre tstzrange) impedem que a mesma sala
+-- ou o mesmo profissional tenham agendamentos ativos sobrepostos, mesmo com
+-- várias recepcionistas agendando ao mesmo tempo (sem "verifica e depois insere").
+--
+-- Executar com:  psql -d vta_agenda -f DB/migracoes/001_agendamento_sem_conflito.sql
+
+BEGIN;
+
+-- Necessário para combinar igualdade (sala/profissional) e sobreposição (&&) no mesmo índice GiST
+CREATE EXTENSION IF NOT EXISTS btree_gist;
+
+CREATE TABLE IF NOT EXISTS agendamento (
+    uuid              VARCHAR(36) PRIMARY KEY,
+    fk_sala_uuid      VARCHAR(36) NOT NULL REFERENCES sala (uuid),
+    profissional      VARCHAR(36) NOT NULL,
+    cliente           VARCHAR(36) NOT NULL,
+    pet               VARCHAR(36) NOT NULL,
+    inicio            TIMESTAMPTZ NOT NULL,
+    fim               TIMESTAMPTZ NOT NULL,
+    tipo_atendimento  VARCHAR(100) NOT NULL,
+    observacoes       TEXT,
+    status            VARCHAR(20) NOT NULL DEFAULT 'AGENDADO',
+    criado_por        VARCHAR(36),
+    criado_em         TIMESTAMPTZ NOT NULL DEFAULT now(),
+    cancelado_por     VARCHAR(36),
+    cancelado_em      TIMESTAMPTZ,
+    CONSTRAINT agendamento_periodo_valido CHECK (inicio < fim)
+);
+
+-- Bancos antigos com TIMESTAMP sem fuso: a expressão do índice precisa ser imutável,
+-- o que só vale para tstzrange sobre TIMESTAMPTZ. (Rodar com SET TIME ZONE adequado.)
+ALTER TABLE agendamento
+    ALTER COLUMN inicio TYPE TIMESTAMPTZ,
+    ALTER COLUMN fim TYPE TIMESTAMPTZ;
+
+-- Intervalo semiaberto [inicio, fim): uma consulta pode começar quando a anterior termina
+ALTER TABLE agendamento DROP CONSTRAINT IF EXISTS agendamento_sala_sem_conflito;
+ALTER TABLE agendamento
+    ADD CONSTRAINT agendamento_sala_sem_conflito
+    EXCLUDE USING gist (
+        fk_sala_uuid WITH =,
+        tstzrange(inicio, fim, '[)') WITH &&
+    ) WHERE (status <> 'CANCELADO');
+
+ALTER TABLE agendamento DROP CONSTRAINT IF EXISTS agendamento_profissional_sem_conflito;
+ALTER TABLE agendamento
+    ADD CONSTRAINT agendamento_profissional_sem_conflito
+    EXCLUDE USING gist (
+        profissional WITH =,
+        tstzrange(inicio, fim, '[)') WITH &&
+    ) WHERE (status <> 'CANCELADO');
+
+COMMIT;
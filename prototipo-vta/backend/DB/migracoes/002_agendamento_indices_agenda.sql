@@ -0,0 +1,20 @@
+-- 002_agendamento_indices_agenda.sql
+--
+-- Índices para a leitura da agenda por período (/api/agenda), filtrando
+-- por "inicio dentro da janela" na ordem (inicio, uuid) da paginação.
+--
+-- SUBSTITUÍDA por 013_agendamento_periodo_gist.sql: a agenda passou a
+-- buscar por sobreposição de intervalos (tstzrange && janela), atendida
+-- pelos índices GiST de 013, que também remove estes índices.
+--
+-- Executar com:  psql -d vta_agenda -f DB/migracoes/002_agendamento_indices_agenda.sql
+
+CREATE INDEX IF NOT EXISTS agendamento_sala_inicio_idx
+    ON agendamento (fk_sala_uuid, inicio, uuid);
+
+CREATE INDEX IF NOT EXISTS agendamento_profissional_inicio_idx
+    ON agendamento (profissional, inicio, uuid);
+
+-- Visão geral (sem filtro de sala/profissional)
+CREATE INDEX IF NOT EXISTS agendamento_inicio_idx
+    ON agendamento (inicio, uuid);
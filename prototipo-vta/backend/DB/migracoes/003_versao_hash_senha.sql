@@ -0,0 +1,13 @@
+-- 003_versao_hash_senha.sql
+--
+-- Versão da política de hashing com que cada senha foi gravada
+-- (services/politica_hash.py). NULL = hash anterior à política: formato
+-- legado (SHA-256 puro, werkzeug) ou PBKDF2 com custo antigo, regravado
+-- automaticamente no próximo login bem-sucedido.
+--
+-- Executar com:  psql -d vta_agenda -f DB/migracoes/003_versao_hash_senha.sql
+
+ALTER TABLE usuario ADD COLUMN IF NOT EXISTS versao_hash SMALLINT;
+
+-- Tabela usada pela rota /login (routes.py)
+ALTER TABLE usuarios ADD COLUMN IF NOT EXISTS versao_hash SMALLINT;
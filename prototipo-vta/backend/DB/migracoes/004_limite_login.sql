@@ -0,0 +1,16 @@
+-- 004_limite_login.sql
+--
+-- Token bucket compartilhado do limitador de login
+-- (services/limitador_login.py, BaldePostgres). Só é usado com
+-- LOGIN_LIMITE_COMPARTILHADO=1; sem isso o limite fica em memória por processo.
+--
+-- Executar com:  psql -d vta_agenda -f DB/migracoes/004_limite_login.sql
+
+CREATE UNLOGGED TABLE IF NOT EXISTS limite_login (
+    chave         TEXT PRIMARY KEY,          -- "email:<email>" ou "ip:<ip>"
+    fichas        DOUBLE PRECISION NOT NULL,
+    atualizado_em TIMESTAMPTZ NOT NULL DEFAULT now()
+);
+
+-- Limpeza periódica de chaves paradas (baldes já cheios de novo):
+-- DELETE FROM limite_login WHERE atualizado_em < now() - interval '1 day';
@@ -0,0 +1,21 @@
+-- 005_sessao.sql
+--
+-- Sessões no servidor (services/sessao.py, BackendSessaoPostgres).
+-- Só é usada com SESSAO_BACKEND=postgres. O token entregue ao navegador
+-- nunca é gravado: a chave é o SHA-256 dele.
+--
+-- Executar com:  psql -d vta_agenda -f DB/migracoes/005_sessao.sql
+
+CREATE TABLE IF NOT EXISTS sessao (
+    token_hash CHAR(64) PRIMARY KEY,
+    usuario_id TEXT NOT NULL,
+    perfil     TEXT NOT NULL,
+    criada_em  TIMESTAMPTZ NOT NULL,
+    expira_em  TIMESTAMPTZ NOT NULL
+);
+
+-- Revogação em massa ao desativar usuário
+CREATE INDEX IF NOT EXISTS idx_sessao_usuario ON sessao (usuario_id);
+
+-- Varredura de expiradas
+CREATE INDEX IF NOT EXISTS idx_sessao_expira ON sessao (expira_em);
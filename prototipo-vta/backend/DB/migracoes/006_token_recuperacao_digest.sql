@@ -0,0 +1,34 @@
+-- 006_token_recuperacao_digest.sql
+--
+-- Tokens de recuperação de senha passam a ser guardados só como SHA-256
+-- (AutenticacaoServico._digest_token). A busca em redefinir_senha usa o
+-- índice único do digest; tokens antigos em texto são convertidos e apagados.
+--
+-- Requer PostgreSQL 11+ (função sha256).
+-- Executar com:  psql -d vta_agenda -f DB/migracoes/006_token_recuperacao_digest.sql
+
+BEGIN;
+
+ALTER TABLE tokenrecuperacao ADD COLUMN IF NOT EXISTS token_hash CHAR(64);
+ALTER TABLE tokenrecuperacao ALTER COLUMN token DROP NOT NULL;
+
+UPDATE tokenrecuperacao
+SET token_hash = encode(sha256(convert_to(token, 'UTF8')), 'hex'),
+    token = NULL
+WHERE token IS NOT NULL;
+
+ALTER TABLE tokenrecuperacao ALTER COLUMN token_hash SET NOT NULL;
+
+COMMIT;
+
+CREATE UNIQUE INDEX IF NOT EXISTS idx_tokenrecuperacao_token_hash
+    ON tokenrecuperacao (token_hash);
+
+-- Limpeza em lotes (limpar_tokens_expirados)
+CREATE INDEX IF NOT EXISTS idx_tokenrecuperacao_expiraem
+    ON tokenrecuperacao (expiraem);
+
+-- invalidar_tokens_usuario: só tokens ainda válidos
+CREATE INDEX IF NOT EXISTS idx_tokenrecuperacao_usuario_ativo
+    ON tokenrecuperacao (fk_usuario_idusuario)
+    WHERE utilizado = FALSE;
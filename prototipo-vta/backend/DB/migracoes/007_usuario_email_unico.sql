@@ -0,0 +1,12 @@
+-- 007_usuario_email_unico.sql
+--
+-- Email único em usuario: a importação em massa
+-- (services/provisionamento_usuarios.py) usa ON CONFLICT (email) DO NOTHING
+-- para não duplicar contas criadas em paralelo.
+--
+-- Falha se já houver emails repetidos; conferir antes com:
+--   SELECT email, count(*) FROM usuario GROUP BY email HAVING count(*) > 1;
+--
+-- Executar com:  psql -d vta_agenda -f DB/migracoes/007_usuario_email_unico.sql
+
+CREATE UNIQUE INDEX CONCURRENTLY IF NOT EXISTS idx_usuario_email ON usuario (email);
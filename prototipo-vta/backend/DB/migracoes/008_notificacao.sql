@@ -0,0 +1,24 @@
+-- 008_notificacao.sql
+--
+-- Notificações dos usuários (services/notificacao_repositorio.py).
+--
+-- Executar com:  psql -d vta_agenda -f DB/migracoes/008_notificacao.sql
+
+CREATE TABLE IF NOT EXISTS notificacao (
+    notificacao_id UUID PRIMARY KEY,
+    usuario_id     UUID NOT NULL,
+    tipo           VARCHAR(20) NOT NULL,
+    titulo         TEXT NOT NULL,
+    mensagem       TEXT NOT NULL,
+    criada_em      TIMESTAMPTZ NOT NULL DEFAULT now(),
+    lida           BOOLEAN NOT NULL DEFAULT FALSE
+);
+
+-- Listagem paginada (keyset) das notificações de um usuário
+CREATE INDEX IF NOT EXISTS idx_notificacao_usuario_criada
+    ON notificacao (usuario_id, criada_em DESC, notificacao_id DESC);
+
+-- Não lidas: índice parcial, pequeno mesmo com milhões de notificações lidas
+CREATE INDEX IF NOT EXISTS idx_notificacao_nao_lidas
+    ON notificacao (usuario_id, criada_em DESC)
+    WHERE lida = false;
@@ -0,0 +1,10 @@
+-- 009_notificacao_retencao.sql
+--
+-- Expurgo global de notificações lidas antigas
+-- (NotificacaoRepositorio.excluir_lidas_antes sem usuario_id).
+--
+-- Executar com:  psql -d vta_agenda -f DB/migracoes/009_notificacao_retencao.sql
+
+CREATE INDEX IF NOT EXISTS idx_notificacao_lidas_criada
+    ON notificacao (criada_em)
+    WHERE lida = true;
@@ -0,0 +1,10 @@
+-- 010_notificacao_tipo.sql
+--
+-- Filtros por tipo (NotificacaoRepositorio.buscar_por_tipo): urgentes não
+-- lidas e buscar_por_tipo viram busca no índice em vez de varrer todas as
+-- notificações do usuário.
+--
+-- Executar com:  psql -d vta_agenda -f DB/migracoes/010_notificacao_tipo.sql
+
+CREATE INDEX IF NOT EXISTS idx_notificacao_usuario_tipo_lida
+    ON notificacao (usuario_id, tipo, lida, criada_em DESC);
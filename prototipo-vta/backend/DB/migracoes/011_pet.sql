@@ -0,0 +1,29 @@
+-- 011_pet.sql
+--
+-- Pets persistidos (services/pet_repositorio.py).
+-- A listagem é ordenada por (lower(nome) COLLATE "C", uuid): com collation
+-- "C" o mesmo índice atende a busca por prefixo (LIKE 'abc%') e a
+-- paginação por cursor (keyset).
+--
+-- Executar com:  psql -d vta_agenda -f DB/migracoes/011_pet.sql
+
+CREATE TABLE IF NOT EXISTS pet (
+    uuid        VARCHAR(36) PRIMARY KEY,
+    cliente_id  VARCHAR(36),
+    nome        VARCHAR(100) NOT NULL,
+    especie     VARCHAR(50) NOT NULL,
+    raca        VARCHAR(100) NOT NULL DEFAULT '',
+    nascimento  DATE NOT NULL
+);
+
+-- Pets de um cliente (tela de pets, seletor da agenda, carga em lote)
+CREATE INDEX IF NOT EXISTS pet_cliente_nome_idx
+    ON pet (cliente_id, (lower(nome) COLLATE "C"), uuid);
+
+-- Filtro por espécie
+CREATE INDEX IF NOT EXISTS pet_especie_nome_idx
+    ON pet ((lower(especie)), (lower(nome) COLLATE "C"), uuid);
+
+-- Listagem geral e busca por prefixo do nome
+CREATE INDEX IF NOT EXISTS pet_nome_idx
+    ON pet ((lower(nome) COLLATE "C"), uuid);
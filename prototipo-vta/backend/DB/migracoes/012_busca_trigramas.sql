@@ -0,0 +1,38 @@
+-- 012_busca_trigramas.sql
+--
+-- Busca aproximada sem acentos sobre clientes e pets com pg_trgm
+-- (services/indice_busca.py, BuscaPostgres). Opcional: o índice em
+-- memória (IndiceBusca) não depende desta migração, só lê as tabelas.
+--
+-- Executar com:  psql -d vta_agenda -f DB/migracoes/012_busca_trigramas.sql
+
+CREATE EXTENSION IF NOT EXISTS pg_trgm;
+CREATE EXTENSION IF NOT EXISTS unaccent;
+
+-- unaccent() não é IMMUTABLE (depende do dicionário configurado);
+-- o wrapper com dicionário fixo pode ser usado em índices de expressão.
+CREATE OR REPLACE FUNCTION vta_normalizar(texto TEXT) RETURNS TEXT
+    LANGUAGE sql IMMUTABLE PARALLEL SAFE STRICT
+    AS $$ SELECT lower(public.unaccent('public.unaccent'::regdictionary, texto)) $$;
+
+-- Tabela de clientes lida pelo carregador do índice de busca
+CREATE TABLE IF NOT EXISTS cliente (
+    uuid      VARCHAR(36) PRIMARY KEY,
+    nome      VARCHAR(150) NOT NULL,
+    telefone  VARCHAR(30),
+    email     VARCHAR(150),
+    ativo     BOOLEAN NOT NULL DEFAULT TRUE
+);
+
+CREATE INDEX IF NOT EXISTS cliente_nome_trgm_idx
+    ON cliente USING gin (vta_normalizar(nome) gin_trgm_ops);
+
+CREATE INDEX IF NOT EXISTS cliente_email_trgm_idx
+    ON cliente USING gin (vta_normalizar(email) gin_trgm_ops);
+
+-- Telefone só com dígitos ("(11) 98765-4321" -> "11987654321")
+CREATE INDEX IF NOT EXISTS cliente_telefone_trgm_idx
+    ON cliente USING gin ((regexp_replace(telefone, '\D', '', 'g')) gin_trgm_ops);
+
+CREATE INDEX IF NOT EXISTS pet_nome_trgm_idx
+    ON pet USING gin (vta_normalizar(nome) gin_trgm_ops);
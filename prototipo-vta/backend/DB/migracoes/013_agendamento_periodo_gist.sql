@@ -0,0 +1,28 @@
+-- 013_agendamento_periodo_gist.sql
+--
+-- Índices GiST sobre o intervalo de cada agendamento para a leitura da
+-- agenda por período (/api/agenda, AgendamentoServico.listar_periodo).
+-- A consulta busca os agendamentos que se sobrepõem à janela
+-- (tstzrange(inicio, fim) && janela), incluindo os que começaram antes
+-- dela; os índices de 002 só cobrem "inicio dentro da janela" e os GiST das
+-- restrições de 001 são parciais (status <> 'CANCELADO'). Os btree de 002
+-- deixam de atender consultas e são removidos (só pesavam nas escritas).
+--
+-- Requer btree_gist (criada em 001) para combinar sala/profissional e intervalo.
+--
+-- Executar com:  psql -d vta_agenda -f DB/migracoes/013_agendamento_periodo_gist.sql
+
+CREATE INDEX IF NOT EXISTS agendamento_sala_periodo_idx
+    ON agendamento USING gist (fk_sala_uuid, tstzrange(inicio, fim, '[)'));
+
+CREATE INDEX IF NOT EXISTS agendamento_profissional_periodo_idx
+    ON agendamento USING gist (profissional, tstzrange(inicio, fim, '[)'));
+
+-- Visão geral (sem filtro de sala/profissional)
+CREATE INDEX IF NOT EXISTS agendamento_periodo_idx
+    ON agendamento USING gist (tstzrange(inicio, fim, '[)'));
+
+-- Substituídos pelos índices acima (ver 002_agendamento_indices_agenda.sql)
+DROP INDEX IF EXISTS agendamento_sala_inicio_idx;
+DROP INDEX IF EXISTS agendamento_profissional_inicio_idx;
+DROP INDEX IF EXISTS agendamento_inicio_idx;
@@ -0,0 +1,310 @@
+import os
+import threading
+import time
+import psycopg2
+import psycopg2.extensions
+import psycopg2.pool
+
+
+class PoolConexoes:
+    """
+    Pool de conexões PostgreSQL compartilhado pelo processo.
+
+    Mantém conexões abertas entre requisições para evitar o custo de
+    handshake TCP + autenticação a cada chamada de serviço.
+
+    Attributes:
+        minimo: Conexões mantidas abertas mesmo ociosas
+        maximo: Limite de conexões abertas ao mesmo tempo
+        timeout_espera: Segundos aguardando uma conexão livre antes de falhar
+        max_ociosa: Segundos que uma conexão excedente pode ficar parada no pool
+        verificar_apos: Conexões paradas há mais que isso são testadas (SELECT 1) na retirada
+    """
+
+    def __init__(self, fabrica, minimo: int = 1, maximo: int = 10,
+                 timeout_espera: float = 10.0, max_ociosa: float = 300.0,
+                 verificar_apos: float = 30.0):
+        """
+        Inicializa o pool.
+
+        Args:
+            fabrica: Função sem argumentos que abre uma nova conexão
+            minimo: Número mínimo de conexões mantidas
+            maximo: Número máximo de conexões simultâneas
+            timeout_espera: Tempo máximo de espera por conexão livre
+            max_ociosa: Tempo máximo de ociosidade de conexões excedentes
+            verificar_apos: Ociosidade a partir da qual a conexão é testada
+
+        Raises:
+            ValueError: Se os limites forem inválidos
+        """
+        if minimo < 0:
+            raise ValueError("minimo não pode ser negativo")
+        if maximo < 1 or maximo < minimo:
+            raise ValueError("maximo deve ser >= 1 e >= minimo")
+
+        self._fabrica = fabrica
+        self.minimo = minimo
+        self.maximo = maximo
+        self.timeout_espera = timeout_espera
+        self.max_ociosa = max_ociosa
+        self.verificar_apos = verificar_apos
+
+        # Pilha de (conexao, devolvida_em): a última devolvida é a primeira reutilizada
+        self._livres: list = []
+        self._em_uso = 0
+        self._fechado = False
+        self._cond = threading.Condition(threading.Lock())
+
+    # Métodos de Retirada/Devolução
+
+    def conexao(self) -> "ConexaoEmprestada":
+        """
+        Retorna um context manager que empresta uma conexão do pool.
+
+        Example:
+            >>> with pool.conexao() as conn, conn.cursor() as cur:
+            ...     cur.execute("SELECT 1;")
+        """
+        return ConexaoEmprestada(self)
+
+    def retirar(self):
+        """
+        Retira uma conexão saudável do pool (abrindo uma nova se preciso).
+
+        Returns:
+            Conexão psycopg2 pronta para uso
+
+        Raises:
+            psycopg2.pool.PoolError: Se o pool estiver fechado ou esgotado
+        """
+        limite = time.monotonic() + self.timeout_espera
+
+        with self._cond:
+            while True:
+                if self._fechado:
+                    raise psycopg2.pool.PoolError("Pool de conexões fechado")
+
+                self._recolher_ociosas()
+
+                if self._livres:
+                    conn, devolvida_em = self._livres.pop()
+                    self._em_uso += 1
+                    break
+
+                if self._total() < self.maximo:
+                    conn, devolvida_em = None, None
+                    self._em_uso += 1
+                    break
+
+                restante = limite - time.monotonic()
+                if restante <= 0:
+                    raise psycopg2.pool.PoolError(
+                        f"Pool de conexões esgotado ({self.maximo} em uso)"
+                    )
+                self._cond.wait(restante)
+
+        # Abertura e health check fora do lock para não travar outras threads
+        try:
+            if conn is not None and not self._saudavel(conn, devolvida_em):
+                self._fechar(conn)
+                conn = None
+            if conn is None:
+                conn = self._fabrica()
+        except Exception:
+            with self._cond:
+                self._em_uso -= 1
+                self._cond.notify()
+            raise
+
+        return conn
+
+    def devolver(self, conn, descartar: bool = False) -> None:
+        """
+        Devolve uma conexão ao pool.
+
+        Args:
+            conn: Conexão retirada com retirar()
+            descartar: Se True, fecha a conexão em vez de reaproveitá-la
+        """
+        if not descartar and not conn.closed:
+            try:
+                # Nunca devolve conexão com transação pendente
+                if conn.info.transaction_status != psycopg2.extensions.TRANSACTION_STATUS_IDLE:
+                    conn.rollback()
+            except psycopg2.Error:
+                descartar = True
+
+        with self._cond:
+            self._em_uso -= 1
+            if descartar or conn.closed or self._fechado:
+                self._fechar(conn)
+            else:
+                self._livres.append((conn, time.monotonic()))
+            self._cond.notify()
+
+    # Manutenção
+
+    def recolher_ociosas(self) -> int:
+        """
+        Fecha conexões excedentes (acima de minimo) ociosas há mais de max_ociosa.
+
+        Returns:
+            Número de conexões fechadas
+        """
+        with self._cond:
+            return self._recolher_ociosas()
+
+    def fechar(self) -> None:
+        """Fecha todas as conexões livres e impede novas retiradas."""
+        with self._cond:
+            self._fechado = True
+            for conn, _ in self._livres:
+                self._fechar(conn)
+            self._livres.clear()
+            self._cond.notify_all()
+
+    def estatisticas(self) -> dict:
+        """Retorna contadores do pool (útil para monitoramento)."""
+        with self._cond:
+            return {
+                "livres": len(self._livres),
+                "em_uso": self._em_uso,
+                "minimo": self.minimo,
+                "maximo": self.maximo,
+            }
+
+    # Métodos auxiliares (chamar com o lock adquirido quando indicado)
+
+    def _total(self) -> int:
+        return len(self._livres) + self._em_uso
+
+    def _recolher_ociosas(self) -> int:
+        agora = time.monotonic()
+        fechadas = 0
+        # As mais antigas ficam no início da pilha
+        while self._livres and self._total() > self.minimo:
+            conn, devolvida_em = self._livres[0]
+            if agora - devolvida_em < self.max_ociosa:
+                break
+            self._livres.pop(0)
+            self._fechar(conn)
+            fechadas += 1
+        return fechadas
+
+    def _saudavel(self, conn, devolvida_em: float) -> bool:
+        """Verifica se a conexão ainda responde antes de entregá-la."""
+        if conn.closed:
+            return False
+        if time.monotonic() - devolvida_em < self.verificar_apos:
+            return True
+        try:
+            with conn.cursor() as cur:
+                cur.execute("SELECT 1;")
+            conn.rollback()
+            return True
+        except psycopg2.Error:
+            return False
+
+    @staticmethod
+    def _fechar(conn) -> None:
+        try:
+            conn.close()
+        except psycopg2.Error:
+            pass
+
+
+class ConexaoEmprestada:
+    """
+    Context manager que empresta uma conexão do pool.
+
+    Mantém a semântica do ``with psycopg2.connect(...) as conn`` usada nos
+    serviços: commit ao sair sem erro, rollback em caso de exceção. A
+    diferença é que, ao final, a conexão volta para o pool em vez de
+    ficar aberta.
+    """
+
+    def __init__(self, pool: PoolConexoes):
+        self._pool = pool
+        self._conn = None
+
+    def __enter__(self):
+        self._conn = self._pool.retirar()
+        return self._conn
+
+    def __exit__(self, exc_type, exc, tb):
+        conn, self._conn = self._conn, None
+        descartar = False
+        try:
+            if not conn.closed:
+                if exc_type is None:
+                    conn.commit()
+                else:
+                    conn.rollback()
+        except psycopg2.Error:
+            descartar = True
+        # Conexão derrubada pelo servidor não deve voltar ao pool
+        if isinstance(exc, (psycopg2.OperationalError, psycopg2.InterfaceError)):
+            descartar = True
+        self._pool.devolver(conn, descartar=descartar)
+        return False
+
+
+# ============================================================================
+# REGISTRO DE POOLS DO PROCESSO
+# ============================================================================
+
+_pools: dict = {}
+_pools_pid = os.getpid()
+_pools_lock = threading.Lock()
+
+
+def configuracao_pool_ambiente() -> dict:
+    """Lê os limites do pool das variáveis de ambiente (DB_POOL_*)."""
+    return {
+        "minimo": int(os.getenv("DB_POOL_MIN", "1")),
+        "maximo": int(os.getenv("DB_POOL_MAX", "10")),
+        "timeout_espera": float(os.getenv("DB_POOL_TIMEOUT", "10")),
+        "max_ociosa": float(os.getenv("DB_POOL_MAX_OCIOSA", "300")),
+        "verificar_apos": float(os.getenv("DB_POOL_VERIFICAR_APOS", "30")),
+    }
+
+
+def obter_pool(chave, fabrica, **config) -> PoolConexoes:
+    """
+    Retorna o pool do processo para uma configuração de conexão.
+
+    Todas as instâncias de serviço com a mesma configuração compartilham o
+    mesmo pool. Após um fork (ex.: workers do gunicorn) os pools herdados
+    são descartados, pois conexões não podem ser compartilhadas entre processos.
+
+    Args:
+        chave: Identificador hashable da configuração de conexão
+        fabrica: Função que abre uma nova conexão
+        **config: Limites do pool (padrão: variáveis de ambiente DB_POOL_*)
+
+    Returns:
+        Pool compartilhado
+    """
+    global _pools_pid
+
+    with _pools_lock:
+        if _pools_pid != os.getpid():
+            _pools.clear()
+            _pools_pid = os.getpid()
+
+        pool = _pools.get(chave)
+        if pool is None:
+            parametros = configuracao_pool_ambiente()
+            parametros.update(config)
+            pool = PoolConexoes(fabrica, **parametros)
+            _pools[chave] = pool
+        return pool
+
+
+def fechar_pools() -> None:
+    """Fecha todos os pools do processo (ex.: no encerramento da aplicação)."""
+    with _pools_lock:
+        for pool in _pools.values():
+            pool.fechar()
+        _pools.clear()
@@ -1,7 +1,14 @@
 from flask import Flask
 import os
+import sys
+from pathlib import Path
 from dotenv import load_dotenv
 
+# Permite importar o pacote 'backend' (DB, services) ao rodar 'python app.py' dentro desta pasta
+RAIZ_PROTOTIPO = str(Path(__file__).resolve().parent.parent)
+if RAIZ_PROTOTIPO not in sys.path:
+    sys.path.insert(0, RAIZ_PROTOTIPO)
+
 # Carrega as variáveis de ambiente do arquivo .env
 load_dotenv()
 
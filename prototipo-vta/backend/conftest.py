@@ -86,6 +86,22 @@ def data_atual():
     return datetime.now(timezone.utc)
 
 
+class Relogio:
+    """Relógio controlado pelo teste (avançar com relogio.agora += segundos)."""
+
+    def __init__(self):
+        self.agora = 1_700_000_000.0
+
+    def __call__(self):
+        return self.agora
+
+
+@pytest.fixture
+def relogio():
+    """Relógio falso para injetar no lugar de time.time/time.monotonic."""
+    return Relogio()
+
+
 @pytest.fixture
 def limpar_cache():
     """Limpa caches após cada teste."""
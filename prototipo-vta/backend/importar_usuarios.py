@@ -0,0 +1,32 @@
+# importar_usuarios.py
+#
+# Importa usuários em massa a partir de um CSV (nome,email,senha,perfil)
+# ou JSON (lista de objetos com os mesmos campos) e imprime o relatório.
+# Cada usuário é gravado em usuarios (a tabela em que a rota /login
+# autentica) e em usuario (diretório com o uuid usado nas sessões e
+# notificações), então já pode entrar pelo /login.
+#
+# Uso:  python importar_usuarios.py equipe.csv [relatorio.json]
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from backend.services.provisionamento_usuarios import ProvisionamentoUsuarios, relatorio_json
+
+
+if __name__ == '__main__':
+    if len(sys.argv) < 2:
+        print("Uso: python importar_usuarios.py <arquivo.csv|arquivo.json> [relatorio.json]")
+        sys.exit(2)
+
+    relatorio = ProvisionamentoUsuarios().importar_arquivo(sys.argv[1])
+    saida = relatorio_json(relatorio)
+
+    if len(sys.argv) > 2:
+        Path(sys.argv[2]).write_text(saida, encoding="utf-8")
+        print(f"Relatório gravado em {sys.argv[2]}")
+    else:
+        print(saida)
+
+    sys.exit(1 if relatorio["falhas"] else 0)
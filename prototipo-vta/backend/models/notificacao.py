@@ -23,6 +23,9 @@ class Notificacao:
         "lembrete", "alerta", "sistema"
     })
     
+    # Tipos urgentes e sua prioridade (menor = mais urgente)
+    PRIORIDADE_URGENTE = {"erro": 0, "alerta": 1}
+    
     def __init__(self, usuario_id: UUID | str, tipo: str, titulo: str, mensagem: str,notificacao_id: UUID | str | None = None,criada_em: datetime | None = None,lida: bool = False
     ) -> None:
         """
@@ -141,7 +144,7 @@ class Notificacao:
     
     def is_urgente(self) -> bool:
         """Verifica se a notificação é urgente (erro ou alerta)."""
-        return self.tipo in {"erro", "alerta"}
+        return self.tipo in self.PRIORIDADE_URGENTE
     
     # Métodos de Serialização
     
@@ -0,0 +1,115 @@
+from datetime import datetime, timedelta
+
+
+class Recorrencia:
+    """
+    Regra de repetição de agendamentos (subconjunto do RRULE).
+
+    Exemplos:
+        - Série de vacinas a cada 21 dias, 3 doses:
+          Recorrencia("diaria", intervalo=21, contagem=3)
+        - Fisioterapia semanal às segundas e quintas até o fim do mês:
+          Recorrencia("semanal", dias_semana={0, 3}, ate=datetime(2025, 11, 30))
+
+    Attributes:
+        frequencia: 'diaria' ou 'semanal'
+        intervalo: A cada quantos dias/semanas repetir
+        contagem: Número total de ocorrências (ou None)
+        ate: Data/hora limite da última ocorrência, inclusiva (ou None)
+        dias_semana: Dias da semana (0=segunda ... 6=domingo) para 'semanal'
+    """
+
+    FREQUENCIAS = frozenset({"diaria", "semanal"})
+
+    # Proteção contra regras sem fim prático (ex.: diária por 10 anos)
+    MAX_OCORRENCIAS = 366
+
+    def __init__(self, frequencia: str, intervalo: int = 1, contagem: int | None = None,
+                 ate: datetime | None = None, dias_semana: set[int] | None = None):
+        """
+        Inicializa a regra de recorrência.
+
+        Raises:
+            ValueError: Se a regra for inválida ou ilimitada
+        """
+        frequencia = frequencia.strip().lower() if isinstance(frequencia, str) else ""
+        if frequencia not in self.FREQUENCIAS:
+            raise ValueError(
+                f"Frequência inválida: {frequencia}. Use: {', '.join(sorted(self.FREQUENCIAS))}"
+            )
+
+        if not isinstance(intervalo, int) or intervalo < 1:
+            raise ValueError("Intervalo deve ser um inteiro >= 1")
+
+        if contagem is None and ate is None:
+            raise ValueError("Informe contagem ou data limite (ate)")
+
+        if contagem is not None and not 1 <= contagem <= self.MAX_OCORRENCIAS:
+            raise ValueError(f"Contagem deve estar entre 1 e {self.MAX_OCORRENCIAS}")
+
+        if dias_semana is not None:
+            if frequencia != "semanal":
+                raise ValueError("dias_semana só se aplica à frequência semanal")
+            if not dias_semana or any(d not in range(7) for d in dias_semana):
+                raise ValueError("dias_semana deve conter valores de 0 (segunda) a 6 (domingo)")
+
+        self.frequencia = frequencia
+        self.intervalo = intervalo
+        self.contagem = contagem
+        self.ate = ate
+        self.dias_semana = frozenset(dias_semana) if dias_semana else None
+
+    def __repr__(self) -> str:
+        return (
+            f"Recorrencia(frequencia={self.frequencia!r}, intervalo={self.intervalo}, "
+            f"contagem={self.contagem}, ate={self.ate!r})"
+        )
+
+    def expandir(self, inicio: datetime, fim: datetime) -> list[tuple[datetime, datetime]]:
+        """
+        Gera as ocorrências a partir do primeiro agendamento.
+
+        Args:
+            inicio: Início da primeira ocorrência
+            fim: Fim da primeira ocorrência (a duração é mantida)
+
+        Returns:
+            Lista de (inicio, fim) em ordem cronológica
+
+        Raises:
+            ValueError: Se inicio >= fim ou a regra passar de MAX_OCORRENCIAS
+        """
+        if inicio >= fim:
+            raise ValueError("A data de início deve ser anterior à data de término")
+
+        duracao = fim - inicio
+        ocorrencias = []
+        for atual in self._inicios(inicio):
+            if self.ate is not None and atual > self.ate:
+                break
+            if len(ocorrencias) == self.MAX_OCORRENCIAS:
+                raise ValueError(f"Recorrência gera mais de {self.MAX_OCORRENCIAS} ocorrências")
+            ocorrencias.append((atual, atual + duracao))
+            if self.contagem is not None and len(ocorrencias) == self.contagem:
+                break
+
+        return ocorrencias
+
+    def _inicios(self, inicio: datetime):
+        """Gera infinitamente os inícios candidatos, em ordem."""
+        if self.frequencia == "diaria":
+            passo = timedelta(days=self.intervalo)
+            atual = inicio
+            while True:
+                yield atual
+                atual += passo
+
+        # Semanal: sem dias_semana repete o dia da semana do primeiro agendamento
+        dias = sorted(self.dias_semana) if self.dias_semana else [inicio.weekday()]
+        semana = inicio - timedelta(days=inicio.weekday())
+        while True:
+            for dia in dias:
+                atual = semana + timedelta(days=dia)
+                if atual >= inicio:
+                    yield atual
+            semana += timedelta(weeks=self.intervalo)
@@ -48,13 +48,15 @@ class Sala:
             f"tipo={self.tipo!r}, ativa={self.ativa})"
         )
     
-    def statusEm(self, dataHora: datetime, reservas: list = None) -> str:
+    def statusEm(self, dataHora: datetime, reservas=None) -> str:
         """
         Retorna o status da sala em um horário específico.
         
         Args:
             dataHora: Data/hora para verificar
-            reservas: Lista de reservas (objetos com .inicio e .fim)
+            reservas: Lista de reservas (objetos com .inicio e .fim ou dicts
+                      com as chaves 'inicio' e 'fim', como os do RealDictCursor)
+                      ou um IndiceOcupacao já carregado
             
         Returns:
             'bloqueada', 'ocupada' ou 'livre'
@@ -69,9 +71,18 @@ class Sala:
         if reservas is None:
             reservas = []
         
+        # IndiceOcupacao: busca binária em vez de varrer as reservas
+        if hasattr(reservas, "ocupada_em"):
+            return "ocupada" if reservas.ocupada_em(self.sala_id, dataHora) else "livre"
+        
         for reserva in reservas:
-            if hasattr(reserva, 'inicio') and hasattr(reserva, 'fim'):
-                if reserva.inicio <= dataHora <= reserva.fim:
+            if isinstance(reserva, dict):
+                inicio, fim = reserva.get("inicio"), reserva.get("fim")
+            else:
+                inicio, fim = getattr(reserva, "inicio", None), getattr(reserva, "fim", None)
+            
+            if inicio is not None and fim is not None:
+                if inicio <= dataHora <= fim:
                     return "ocupada"
         
         return "livre"
@@ -3,10 +3,56 @@ import hashlib
 import hmac
 import re
 from datetime import datetime, timezone
+from functools import lru_cache
 from uuid import uuid4, UUID
 from backend.enums.perfil_usuario import PerfilUsuario
 from backend.enums.status_usuario import StatusUsuario
 
+
+# Ações com bit próprio na máscara de permissões; qualquer outra ação
+# não vazia cai no bit de "outras" (só o admin, com todos os bits, pode)
+ACOES = ("visualizar", "criar", "editar", "excluir")
+BIT_ACAO = {acao: 1 << i for i, acao in enumerate(ACOES)}
+BIT_OUTRAS = 1 << len(ACOES)
+MASCARA_TOTAL = -1  # todos os bits, inclusive ações desconhecidas
+
+
+@lru_cache(maxsize=256)
+def _bit_acao_normalizada(acao: str) -> int:
+    acao = acao.strip().lower()
+    if not acao:
+        return 0
+    return BIT_ACAO.get(acao, BIT_OUTRAS)
+
+
+def bit_acao(acao) -> int:
+    """
+    Bit da ação na máscara de permissões (normalização memoizada).
+
+    Args:
+        acao: Nome da ação (visualizar, criar, editar, excluir)
+
+    Returns:
+        Bit da ação, ou 0 para ação inválida (nenhum perfil pode)
+    """
+    if not isinstance(acao, str):
+        return 0
+    return _bit_acao_normalizada(acao)
+
+
+def _calcular_mascaras(permissoes_por_perfil: dict) -> dict:
+    """Pré-calcula a máscara de bits de cada perfil (admin: todos os bits)."""
+    mascaras = {}
+    for perfil in PerfilUsuario:
+        if perfil == PerfilUsuario.ADMIN:
+            mascaras[perfil] = MASCARA_TOTAL
+        else:
+            mascaras[perfil] = sum(
+                BIT_ACAO.get(acao, BIT_OUTRAS) for acao in permissoes_por_perfil.get(perfil, ())
+            )
+    return mascaras
+
+
 class Usuario:
     """
     Representa um usuário do sistema com autenticação e controle de permissões.
@@ -21,6 +67,10 @@ class Usuario:
         ultimo_login: Timestamp do último login (UTC)
     """
     
+    # Marcador para usuários carregados sem o hash (listagens, cache):
+    # não é um hash válido, então nenhuma senha confere com ele
+    HASH_NAO_CARREGADO = "!"
+
     # Permissões padrão (nenhuma por padrão)
     PERMISSOES_PADRAO = frozenset()
 
@@ -31,6 +81,23 @@ class Usuario:
         PerfilUsuario.VETERINARIO: frozenset({"visualizar"}),
     }
 
+    # Máscara de bits por perfil (uma verificação de permissão = um AND)
+    MASCARA_POR_PERFIL = _calcular_mascaras(PERMISSOES_POR_PERFIL)
+
+    # Perfil pelo valor ou pelo nome de exibição gravado na tabela usuarios (ver gerar_hash.py)
+    PERFIL_POR_NOME = {perfil.value: perfil for perfil in PerfilUsuario}
+    PERFIL_POR_NOME.update({
+        "administrador": PerfilUsuario.ADMIN,
+        "veterinário": PerfilUsuario.VETERINARIO,
+    })
+    MASCARA_POR_VALOR = dict(zip(PERFIL_POR_NOME, map(MASCARA_POR_PERFIL.get, PERFIL_POR_NOME.values())))
+
+    # Conjunto efetivo de cada perfil (admin: todas as ações conhecidas)
+    PERMISSOES_EFETIVAS = {
+        perfil: frozenset(ACOES) if perfil == PerfilUsuario.ADMIN else permissoes
+        for perfil, permissoes in PERMISSOES_POR_PERFIL.items()
+    }
+
     # Padrão de validação de email (básico mas mais robusto)
     EMAIL_REGEX = re.compile(r'^[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}$')
 
@@ -252,27 +319,57 @@ class Usuario:
             - Ação é normalizada (lowercase, sem espaços)
         """
         # Usuários inativos não têm permissão
-        if not self.is_ativo():
+        if self.status is not StatusUsuario.ATIVO:
             return False
 
-        # Validação da ação
-        if not isinstance(acao, str):
-            return False
-        
-        acao_limpa = acao.strip().lower()
-        if not acao_limpa:
-            return False
+        return bool(self.MASCARA_POR_PERFIL.get(self.perfil, 0) & bit_acao(acao))
+
+    @classmethod
+    def perfil_pode(cls, perfil, acao) -> bool:
+        """
+        Verifica a permissão de um perfil sem instanciar o usuário.
 
-        # Admin tem acesso total
-        if self.perfil == PerfilUsuario.ADMIN:
-            return True
+        Args:
+            perfil: PerfilUsuario, seu valor ou nome de exibição (vindo da sessão)
+            acao: Nome da ação
 
-        # Verifica permissões do perfil
-        permissoes = self.PERMISSOES_POR_PERFIL.get(
-            self.perfil, 
-            self.PERMISSOES_PADRAO
-        )
-        return acao_limpa in permissoes
+        Returns:
+            True se o perfil tem permissão
+        """
+        return bool(cls.mascara_perfil(perfil) & bit_acao(acao))
+
+    @classmethod
+    def mascara_perfil(cls, perfil) -> int:
+        """
+        Máscara de permissões de um perfil.
+
+        Args:
+            perfil: PerfilUsuario, seu valor ou o nome de exibição
+                ("admin", "Administrador", "Veterinário"...)
+
+        Returns:
+            Máscara de bits (0 para perfil desconhecido)
+        """
+        if isinstance(perfil, PerfilUsuario):
+            return cls.MASCARA_POR_PERFIL.get(perfil, 0)
+        if not isinstance(perfil, str):
+            return 0
+        return cls.MASCARA_POR_VALOR.get(perfil.strip().lower(), 0)
+
+    @classmethod
+    def perfil_por_nome(cls, nome) -> PerfilUsuario:
+        """
+        Converte valor ou nome de exibição ("Administrador", "veterinario"...) em PerfilUsuario.
+
+        Raises:
+            ValueError: Se o perfil não for reconhecido
+        """
+        if isinstance(nome, PerfilUsuario):
+            return nome
+        perfil = cls.PERFIL_POR_NOME.get(nome.strip().lower()) if isinstance(nome, str) else None
+        if perfil is None:
+            raise ValueError(f"Perfil inválido: {nome}")
+        return perfil
 
     def get_permissoes(self) -> frozenset[str]:
         """
@@ -283,14 +380,8 @@ class Usuario:
         """
         if not self.is_ativo():
             return frozenset()
-        
-        if self.perfil == PerfilUsuario.ADMIN:
-            return frozenset({"visualizar", "criar", "editar", "excluir"})
-        
-        return self.PERMISSOES_POR_PERFIL.get(
-            self.perfil, 
-            self.PERMISSOES_PADRAO
-        )
+
+        return self.PERMISSOES_EFETIVAS.get(self.perfil, self.PERMISSOES_PADRAO)
 
     # Métodos de Serialização
 
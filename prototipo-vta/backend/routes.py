@@ -1,24 +1,88 @@
 # routes.py CORRIGIDO
 
-from flask import request, jsonify, session, render_template, redirect, url_for
-import psycopg2
-import psycopg2.extras # Importante para o cursor como dicionário
-from werkzeug.security import check_password_hash
+import json
 import os
+from datetime import datetime
+from functools import wraps
+from uuid import UUID
+from flask import Response, g, request, jsonify, render_template, redirect, stream_with_context, url_for
 
 # Importa a instância 'app' do arquivo app.py
 from app import app
 
-# --- Configuração da Conexão com o Banco de Dados ---
-DB_HOST = os.getenv("DB_HOST")
-DB_NAME = os.getenv("DB_NAME")
-DB_USER = os.getenv("DB_USER")
-DB_PASS = os.getenv("DB_PASS")
+# --- Conexão com o Banco de Dados ---
+# Mesmo pool (e mesmo RealDictCursor) usado pelos serviços em backend/services.
+# Rotas emprestam a conexão só pelo trecho que a usa (with conexao_padrao()._get_conn());
+# obter_conexao() (devolvida no teardown) fica para rotas que a usam a requisição inteira.
+from backend.DB.contexto_flask import conexao_padrao, init_app
 
-def get_db_connection():
-    """Cria e retorna uma nova conexão com o banco de dados."""
-    conn = psycopg2.connect(host=DB_HOST, database=DB_NAME, user=DB_USER, password=DB_PASS)
-    return conn
+init_app(app)
+
+from backend.services.agendamento_servico import AgendamentoServico
+from backend.services.autenticacao_servico import AutenticacaoServico
+from backend.services.executor_hash import HashSobrecarregadoErro, obter_executor
+from backend.services.indice_busca import iniciar_indice_busca, obter_indice_busca
+from backend.services.limitador_login import LoginBloqueadoErro, obter_limitador
+from backend.services.notificacao_repositorio import NotificacaoRepositorio
+from backend.services.notificacao_servico import NotificacaoServico
+from backend.services.pet_repositorio import PetRepositorio
+from backend.services.politica_hash import obter_politica, verificar_senha
+from backend.services.sessao import obter_gerenciador
+from backend.enums.status_usuario import StatusUsuario
+from backend.models.usuario import bit_acao
+
+agendamento_servico = AgendamentoServico()
+autenticacao_servico = AutenticacaoServico()
+notificacao_servico = NotificacaoServico(NotificacaoRepositorio())
+pet_repositorio = PetRepositorio()
+
+# --- Manutenção em segundo plano (intervalos em segundos) ---
+# As limpezas rodam a primeira vez só depois de um intervalo; o índice de busca
+# começa a carregar já na subida, na thread da sua tarefa (/api/busca responde
+# 503 até terminar).
+iniciar_indice_busca()
+autenticacao_servico.iniciar_limpeza_tokens(float(os.getenv("TOKENS_LIMPEZA_INTERVALO", "3600")))
+notificacao_servico.iniciar_retencao(
+    dias=int(os.getenv("NOTIFICACOES_RETENCAO_DIAS", "30")),
+    intervalo=float(os.getenv("NOTIFICACOES_RETENCAO_INTERVALO", "86400"))
+)
+
+# --- Sessões ---
+# O cookie guarda só um token opaco; os dados da sessão ficam no servidor
+# (services/sessao.py), o que permite revogar sessões (logout, usuário desativado).
+# A sessão é identificada pelo uuid do usuário na tabela usuario (o mesmo das
+# notificações e de AutenticacaoServico.desativar_usuario), lido pelo email no
+# mesmo SELECT do login.
+COOKIE_SESSAO = 'vta_sessao'
+
+def sessao_atual():
+    """Sessão da requisição (validada uma vez por requisição) ou None."""
+    if 'sessao' not in g:
+        g.sessao = obter_gerenciador().validar(request.cookies.get(COOKIE_SESSAO))
+    return g.sessao
+
+def requer_permissao(acao):
+    """
+    Protege uma rota de API: 401 sem sessão, 403 se o perfil não pode executar a ação.
+
+    O bit da ação é resolvido uma vez, na decoração; a checagem por
+    requisição é só a busca da sessão no cache e um AND com a máscara do perfil.
+    """
+    bit = bit_acao(acao)
+    if not bit:
+        raise ValueError(f"Ação inválida: {acao!r}")
+
+    def decorador(view):
+        @wraps(view)
+        def protegida(*args, **kwargs):
+            sessao = sessao_atual()
+            if sessao is None:
+                return jsonify({"message": "Não autenticado."}), 401
+            if not sessao.mascara & bit:
+                return jsonify({"message": "Permissão negada."}), 403
+            return view(*args, **kwargs)
+        return protegida
+    return decorador
 
 # --- ROTAS DE PÁGINAS E AUTENTICAÇÃO ---
 
@@ -37,47 +101,97 @@ def login():
     if not email or not senha:
         return jsonify({"message": "Email e senha são obrigatórios!"}), 400
 
-    conn = None
     try:
-        conn = get_db_connection()
-        cur = conn.cursor(cursor_factory=psycopg2.extras.DictCursor)
-        
-        cur.execute("SELECT id, email, senha_hash, perfil FROM usuarios WHERE email = %s", (email,))
-        user = cur.fetchone()
-        
-        cur.close()
-
-        if user and check_password_hash(user['senha_hash'], senha):
-            session['user_id'] = user['id']
-            session['user_perfil'] = user['perfil']
+        # Limite de tentativas por email e IP antes de tocar no banco ou no hash
+        obter_limitador().verificar(email, request.remote_addr)
+
+        # Conexão só durante o SELECT: devolvida ao pool antes do hash (que pode
+        # esperar no executor) e dos serviços que emprestam a sua própria.
+        # O cadastro em usuario (uuid da sessão, status) vem na mesma consulta.
+        with conexao_padrao()._get_conn() as conn, conn.cursor() as cur:
+            cur.execute(
+                """
+                SELECT us.id, us.email, us.senha_hash, us.perfil, u.uuid, u.status
+                FROM usuarios us
+                LEFT JOIN usuario u ON u.email = lower(us.email)
+                WHERE us.email = %s
+                """,
+                (email,)
+            )
+            user = cur.fetchone()
+
+        if not user:
+            # Mesmo custo de uma senha errada: não revela quais emails existem
+            obter_executor().executar(
+                verificar_senha, obter_politica().hash_referencia(obter_executor()), senha
+            )
+
+        # PBKDF2 roda no pool de processos de hashing, fora da thread da requisição.
+        # verificar_senha aceita werkzeug, PBKDF2 do Usuario e SHA-256 legado.
+        if user and obter_executor().executar(verificar_senha, user['senha_hash'], senha):
+            if user['status'] == StatusUsuario.INATIVO.value:
+                return jsonify({"message": "Usuário inativo. Contate o administrador."}), 403
+
+            politica = obter_politica()
+            if politica.precisa_rehash(user['senha_hash']):
+                politica.rehash_em_segundo_plano(
+                    obter_executor(), senha, _gravar_hash_migrado(user['id'], user['senha_hash'])
+                )
+
+            obter_limitador().registrar_sucesso(email)
+            # Conta só da tabela usuarios (sem uuid): fica com o id, que nunca
+            # coincide com um uuid; essas sessões não têm notificações
+            chave = str(user['uuid']) if user['uuid'] else user['id']
+            token = obter_gerenciador().criar(chave, user['perfil'])
             
             # Responde ao front-end com a URL de redirecionamento
-            return jsonify({
+            resposta = jsonify({
                 "message": "Login bem-sucedido! Redirecionando...", 
                 "redirect_url": url_for('dashboard')
-            }), 200
+            })
+            resposta.set_cookie(
+                COOKIE_SESSAO, token,
+                httponly=True, samesite='Lax', secure=request.is_secure
+            )
+            return resposta, 200
         else:
             return jsonify({"message": "Email/usuário ou senha incorretos."}), 401
 
+    except LoginBloqueadoErro as e:
+        return jsonify({"message": str(e)}), 429, {"Retry-After": str(e.retry_after)}
+    except HashSobrecarregadoErro:
+        # Pico de logins: recusa rápido em vez de enfileirar a requisição
+        return jsonify({"message": "Servidor ocupado, tente novamente em instantes."}), 503, {"Retry-After": "1"}
     except Exception as e:
         print(f"Erro no login: {e}")
         return jsonify({"message": "Erro interno no servidor."}), 500
-    finally:
-        if conn:
-            conn.close()
+
+def _gravar_hash_migrado(user_id, hash_antigo):
+    """Callback do rehash em segundo plano (fora da requisição: usa conexão própria do pool)."""
+    def gravar(novo_hash, versao):
+        with conexao_padrao()._get_conn() as conn, conn.cursor() as cur:
+            cur.execute(
+                "UPDATE usuarios SET senha_hash = %s, versao_hash = %s WHERE id = %s AND senha_hash = %s",
+                (novo_hash, versao, user_id, hash_antigo)
+            )
+    return gravar
 
 # Rota de Logout
 @app.route('/logout')
 def logout():
-    session.clear()
-    return redirect(url_for('login_page'))
+    token = request.cookies.get(COOKIE_SESSAO)
+    if token:
+        obter_gerenciador().revogar(token)
+    resposta = redirect(url_for('login_page'))
+    resposta.delete_cookie(COOKIE_SESSAO)
+    return resposta
 
 # --- ROTAS PROTEGIDAS (EXIGEM LOGIN) ---
 
 # Rota do Dashboard
 @app.route('/dashboard')
 def dashboard():
-    if 'user_id' not in session:
+    if sessao_atual() is None:
         return redirect(url_for('login_page'))
     # Renderiza o arquivo HTML do dashboard
     return render_template('2. dashboard_vta.html')
@@ -85,10 +199,183 @@ def dashboard():
 # Rota da Agenda
 @app.route('/agenda')
 def agenda_page():
-    if 'user_id' not in session:
+    if sessao_atual() is None:
         return redirect(url_for('login_page'))
     # Renderiza o arquivo HTML da agenda
     return render_template('3. agenda_vta.html')
 
 # Adicione aqui outras rotas para as demais páginas (clientes, pets, etc.)
-# seguindo o mesmo modelo.
\ No newline at end of file
+# seguindo o mesmo modelo.
+
+# --- API DA AGENDA ---
+
+# Agendamentos de um período [inicio, fim) para as visões de dia/semana/mês
+@app.route('/api/agenda')
+@requer_permissao('visualizar')
+def api_agenda():
+    args = request.args
+    try:
+        inicio = datetime.fromisoformat(args['inicio'])
+        fim = datetime.fromisoformat(args['fim'])
+        itens, proximo = agendamento_servico.listar_periodo(
+            inicio,
+            fim,
+            sala_id=args.get('sala'),
+            profissional_id=args.get('profissional'),
+            status=args.get('status'),
+            cursor=args.get('cursor'),
+            limite=int(args.get('limite', 200))
+        )
+    except KeyError:
+        return jsonify({"message": "Parâmetros 'inicio' e 'fim' são obrigatórios."}), 400
+    except ValueError as e:
+        return jsonify({"message": str(e)}), 400
+
+    return jsonify({"agendamentos": itens, "proximo": proximo}), 200
+
+# --- API DE PETS ---
+
+# Listagem paginada da tela de pets (filtros por cliente, espécie e início do nome)
+@app.route('/api/pets')
+@requer_permissao('visualizar')
+def api_pets():
+    args = request.args
+    try:
+        pets, proximo = pet_repositorio.listar(
+            cliente_id=args.get('cliente'),
+            especie=args.get('especie'),
+            prefixo_nome=args.get('nome'),
+            limite=int(args.get('limite', 50)),
+            cursor=args.get('cursor')
+        )
+    except ValueError as e:
+        return jsonify({"message": str(e)}), 400
+
+    return jsonify({"pets": [p.to_dict() for p in pets], "proximo": proximo}), 200
+
+# Pets de vários clientes em uma chamada (ex.: ?ids=a,b,c para os seletores da agenda)
+@app.route('/api/pets/por-clientes')
+@requer_permissao('visualizar')
+def api_pets_por_clientes():
+    ids = [i for i in request.args.get('ids', '').split(',') if i.strip()]
+    if not ids:
+        return jsonify({"message": "Parâmetro 'ids' é obrigatório."}), 400
+
+    pets = pet_repositorio.buscar_por_clientes(i.strip() for i in ids)
+    return jsonify({
+        cliente_id: [p.to_dict() for p in lista] for cliente_id, lista in pets.items()
+    }), 200
+
+# --- BUSCA ---
+
+# Typeahead da recepção: clientes (nome, telefone, email) e pets (nome),
+# sem diferenciar acentos e aceitando parte do texto (?q=joao&tipo=cliente)
+@app.route('/api/busca')
+@requer_permissao('visualizar')
+def api_busca():
+    consulta = request.args.get('q', '')
+    tipo = request.args.get('tipo')
+    if tipo not in (None, 'cliente', 'pet'):
+        return jsonify({"message": "Parâmetro 'tipo' deve ser 'cliente' ou 'pet'."}), 400
+    try:
+        limite = min(int(request.args.get('limite', 10)), 50)
+    except ValueError:
+        return jsonify({"message": "Parâmetro 'limite' inválido."}), 400
+
+    indice = obter_indice_busca()
+    if indice is None:
+        # Primeira carga do índice ainda em andamento (ver iniciar_indice_busca)
+        return jsonify({"message": "Busca indisponível, tente novamente em instantes."}), 503, {"Retry-After": "5"}
+
+    resultados = indice.buscar(consulta, limite=limite, tipos={tipo} if tipo else None)
+    return jsonify({"resultados": resultados}), 200
+
+# --- API DE NOTIFICAÇÕES ---
+
+def usuario_notificacoes(sessao):
+    """
+    uuid (tabela usuario) com que as notificações da sessão são gravadas e publicadas.
+
+    None para sessões de contas só da tabela usuarios, que não têm uuid
+    nem notificações (ver /login).
+    """
+    try:
+        return str(UUID(sessao.usuario_id))
+    except ValueError:
+        return None
+
+# Badge de não lidas (consultado periodicamente pelo dashboard e pela tela de notificações)
+@app.route('/api/notificacoes/contador')
+def api_notificacoes_contador():
+    sessao = sessao_atual()
+    if sessao is None:
+        return jsonify({"message": "Não autenticado."}), 401
+    usuario_id = usuario_notificacoes(sessao)
+    if usuario_id is None:
+        return jsonify({"nao_lidas": 0}), 200
+    return jsonify({"nao_lidas": notificacao_servico.contar_nao_lidas_por_id(usuario_id)}), 200
+
+# Urgentes (erro, alerta) não lidas, em ordem de prioridade
+@app.route('/api/notificacoes/urgentes')
+def api_notificacoes_urgentes():
+    sessao = sessao_atual()
+    if sessao is None:
+        return jsonify({"message": "Não autenticado."}), 401
+    usuario_id = usuario_notificacoes(sessao)
+    urgentes = notificacao_servico.buscar_urgentes_por_id(usuario_id) if usuario_id else []
+    return jsonify({"urgentes": [n.to_dict() for n in urgentes]}), 200
+
+# Intervalo do comentário de keep-alive no stream SSE (não consulta o banco)
+SSE_KEEPALIVE_SEGUNDOS = 15
+
+# Stream (Server-Sent Events) de notificações novas e da contagem de não lidas.
+# A conexão fica parada na fila do barramento até chegar um evento: sem polling no banco.
+# Ao conectar, o cliente recebe primeiro as urgentes pendentes; depois, eventos
+# urgentes passam à frente dos demais na fila da conexão.
+@app.route('/api/notificacoes/stream')
+def api_notificacoes_stream():
+    sessao = sessao_atual()
+    if sessao is None:
+        return jsonify({"message": "Não autenticado."}), 401
+
+    # Mesmo uuid com que NotificacaoServico publica no barramento
+    usuario_id = usuario_notificacoes(sessao)
+    if usuario_id is None:
+        # Sem notificações para a conta: 204 faz o EventSource não reconectar
+        return Response(status=204)
+
+    token = request.cookies.get(COOKIE_SESSAO)
+
+    def eventos():
+        assinatura = notificacao_servico.barramento.assinar(usuario_id)
+        try:
+            urgentes = notificacao_servico.buscar_urgentes_por_id(usuario_id)
+            if urgentes:
+                yield _evento_sse("urgentes", {"urgentes": [n.to_dict() for n in urgentes]})
+            yield _evento_sse("contador", {"nao_lidas": notificacao_servico.contar_nao_lidas_por_id(usuario_id)})
+            while True:
+                evento = assinatura.proximo(timeout=SSE_KEEPALIVE_SEGUNDOS)
+                # Logout ou usuário desativado com a aba aberta: encerra o stream
+                # (a cada keep-alive ou evento; a sessão vem do cache do gerenciador)
+                if obter_gerenciador().validar(token) is None:
+                    return
+                if evento is None:
+                    yield ": keep-alive\n\n"
+                    continue
+                # O mesmo dict vai para todas as abas do usuário: não alterar
+                dados = {chave: valor for chave, valor in evento.items() if chave != "evento"}
+                if dados.get("nao_lidas") is None:
+                    dados["nao_lidas"] = notificacao_servico.contar_nao_lidas_por_id(usuario_id)
+                yield _evento_sse(evento["evento"], dados)
+        finally:
+            # Cliente desconectou (GeneratorExit) ou erro: libera a fila
+            notificacao_servico.barramento.cancelar(assinatura)
+
+    return Response(
+        stream_with_context(eventos()),
+        mimetype='text/event-stream',
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
+def _evento_sse(nome, dados):
+    return f"event: {nome}\ndata: {json.dumps(dados, default=str)}\n\n"
@@ -0,0 +1,471 @@
+from datetime import datetime, timezone
+from uuid import uuid4
+import psycopg2.errors
+import psycopg2.extras
+from backend.DB.conexao import Conexao
+from backend.enums.status_Agendamento import statusAgendamento
+from backend.models.agendamento import Agendamento
+from backend.models.recorrencia import Recorrencia
+from backend.services.indice_ocupacao import IndiceOcupacao
+
+
+class AgendamentoServico(Conexao):
+    """
+    Serviço responsável pelos agendamentos (UC04).
+
+    A detecção de conflitos de sala e de profissional é feita pelo
+    PostgreSQL através das restrições de exclusão (GiST + tstzrange)
+    criadas em DB/migracoes/001_agendamento_sem_conflito.sql. O serviço
+    apenas insere e traduz a violação em uma mensagem, sem o padrão
+    "verifica e depois insere" (que falha com recepcionistas simultâneas).
+    """
+
+    # Mensagens por restrição de exclusão violada
+    CONFLITOS = {
+        "agendamento_sala_sem_conflito": "Sala já reservada nesse horário.",
+        "agendamento_profissional_sem_conflito": "Profissional já possui agendamento nesse horário.",
+    }
+
+    def __init__(self, conn_str=None, indice: IndiceOcupacao | None = None):
+        """
+        Inicializa o serviço.
+
+        Args:
+            conn_str: String de conexão (None usa variáveis de ambiente)
+            indice: Índice de ocupação em memória a manter atualizado (opcional)
+        """
+        super().__init__(conn_str)
+        self.indice = indice
+
+    def criar_agendamento(self, sala_id: str, profissional_id: str, cliente_id: str,
+                          pet_id: str, inicio: datetime, fim: datetime,
+                          tipo_atendimento: str, observacoes: str = None,
+                          criado_por: str = None) -> Agendamento | None:
+        """
+        Cria um agendamento, deixando o banco rejeitar sobreposições.
+
+        Args:
+            sala_id: UUID da sala
+            profissional_id: Identificador do profissional
+            cliente_id: Identificador do cliente
+            pet_id: Identificador do pet
+            inicio: Data/hora de início
+            fim: Data/hora de término (exclusivo para fins de conflito)
+            tipo_atendimento: Tipo do atendimento
+            observacoes: Observações (opcional)
+            criado_por: Quem criou (opcional)
+
+        Returns:
+            Agendamento criado ou None se inválido/conflitante
+        """
+        try:
+            agendamento = Agendamento(
+                id=str(uuid4()),
+                sala_id=str(sala_id),
+                profissional_id=str(profissional_id),
+                cliente_id=str(cliente_id),
+                pet_id=str(pet_id),
+                inicio=inicio,
+                fim=fim,
+                tipo_atendimento=tipo_atendimento,
+                observacoes=observacoes,
+                criado_por=criado_por
+            )
+        except (ValueError, TypeError, AttributeError) as e:
+            print(f"Erro de validação: {e}")
+            return None
+
+        try:
+            with self._get_conn() as conn, conn.cursor() as cur:
+                cur.execute("""
+                    INSERT INTO agendamento
+                        (uuid, fk_sala_uuid, profissional, cliente, pet, inicio, fim,
+                         tipo_atendimento, observacoes, status, criado_por, criado_em)
+                    VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s);
+                """, (
+                    agendamento.id,
+                    agendamento.sala_id,
+                    agendamento.profissional_id,
+                    agendamento.cliente_id,
+                    agendamento.pet_id,
+                    agendamento.inicio,
+                    agendamento.fim,
+                    agendamento.tipo_atendimento,
+                    agendamento.observacoes,
+                    agendamento.status,
+                    agendamento.criado_por,
+                    agendamento.criado_em
+                ))
+                conn.commit()
+        except psycopg2.errors.ExclusionViolation as e:
+            print(f"Conflito de agendamento: {self._mensagem_conflito(e)}")
+            return None
+
+        if self.indice is not None:
+            self.indice.adicionar(agendamento)
+
+        print(f"✓ Agendamento {agendamento.id} criado com sucesso!")
+        return agendamento
+
+    def criar_recorrentes(self, sala_id: str, profissional_id: str, cliente_id: str,
+                          pet_id: str, inicio: datetime, fim: datetime,
+                          tipo_atendimento: str, recorrencia: Recorrencia,
+                          tudo_ou_nada: bool = True, observacoes: str = None,
+                          criado_por: str = None) -> dict:
+        """
+        Cria uma série de agendamentos (vacinas, fisioterapia semanal...).
+
+        As ocorrências são geradas em memória, verificadas contra a agenda
+        em uma única consulta e inseridas com um único INSERT multi-linhas
+        (execute_values), tudo na mesma transação.
+
+        Args:
+            sala_id, profissional_id, cliente_id, pet_id: Como em criar_agendamento
+            inicio: Início da primeira ocorrência
+            fim: Fim da primeira ocorrência
+            tipo_atendimento: Tipo do atendimento
+            recorrencia: Regra de repetição
+            tudo_ou_nada: Se True, qualquer conflito cancela a série inteira;
+                          se False, cria as ocorrências livres e reporta as demais
+            observacoes: Observações (opcional)
+            criado_por: Quem criou (opcional)
+
+        Returns:
+            Dicionário {"criados": [Agendamento], "conflitos": [dict]} onde cada
+            conflito traz inicio, fim e motivo
+
+        Raises:
+            ValueError: Se os dados ou a regra de recorrência forem inválidos
+        """
+        agendamentos = [
+            Agendamento(
+                id=str(uuid4()),
+                sala_id=str(sala_id),
+                profissional_id=str(profissional_id),
+                cliente_id=str(cliente_id),
+                pet_id=str(pet_id),
+                inicio=ocorrencia_inicio,
+                fim=ocorrencia_fim,
+                tipo_atendimento=tipo_atendimento,
+                observacoes=observacoes,
+                criado_por=criado_por
+            )
+            for ocorrencia_inicio, ocorrencia_fim in recorrencia.expandir(inicio, fim)
+        ]
+
+        resultado = {"criados": [], "conflitos": []}
+
+        try:
+            with self._get_conn() as conn, conn.cursor() as cur:
+                # Uma consulta para todas as ocorrências (sala OU profissional ocupados)
+                conflitos = psycopg2.extras.execute_values(cur, """
+                    SELECT DISTINCT ON (v.idx) v.idx,
+                           CASE WHEN a.fk_sala_uuid = v.sala THEN 'sala' ELSE 'profissional' END AS motivo
+                    FROM (VALUES %s) AS v(idx, inicio, fim, sala, profissional)
+                    JOIN agendamento a
+                      ON a.status != 'CANCELADO'
+                     AND (a.fk_sala_uuid = v.sala OR a.profissional = v.profissional)
+                     AND a.inicio < v.fim
+                     AND a.fim > v.inicio
+                    ORDER BY v.idx, motivo DESC;
+                """, [
+                    (i, a.inicio, a.fim, a.sala_id, a.profissional_id)
+                    for i, a in enumerate(agendamentos)
+                ], template="(%s, %s::timestamptz, %s::timestamptz, %s, %s)",
+                   page_size=Recorrencia.MAX_OCORRENCIAS, fetch=True)
+
+                motivos = {row["idx"]: row["motivo"] for row in conflitos}
+                for idx, motivo in sorted(motivos.items()):
+                    resultado["conflitos"].append(
+                        self._conflito_ocorrencia(agendamentos[idx], motivo)
+                    )
+
+                if motivos and tudo_ou_nada:
+                    print(f"Série não criada: {len(motivos)} ocorrência(s) em conflito")
+                    return resultado
+
+                livres = [a for i, a in enumerate(agendamentos) if i not in motivos]
+                if not livres:
+                    return resultado
+
+                # Modo parcial: ON CONFLICT DO NOTHING ignora ocorrências que perderam
+                # a corrida para outra recepcionista entre a verificação e o INSERT
+                sufixo = "" if tudo_ou_nada else "ON CONFLICT DO NOTHING"
+                inseridos = psycopg2.extras.execute_values(cur, f"""
+                    INSERT INTO agendamento
+                        (uuid, fk_sala_uuid, profissional, cliente, pet, inicio, fim,
+                         tipo_atendimento, observacoes, status, criado_por, criado_em)
+                    VALUES %s
+                    {sufixo}
+                    RETURNING uuid;
+                """, [
+                    (a.id, a.sala_id, a.profissional_id, a.cliente_id, a.pet_id,
+                     a.inicio, a.fim, a.tipo_atendimento, a.observacoes, a.status,
+                     a.criado_por, a.criado_em)
+                    for a in livres
+                ], page_size=Recorrencia.MAX_OCORRENCIAS, fetch=True)
+                conn.commit()
+        except psycopg2.errors.ExclusionViolation as e:
+            # Só ocorre em tudo_ou_nada: a transação inteira foi desfeita
+            print(f"Série não criada: {self._mensagem_conflito(e)}")
+            resultado["conflitos"].append({"inicio": None, "fim": None, "motivo": "concorrente"})
+            return resultado
+
+        ids_inseridos = {row["uuid"] for row in inseridos}
+        for agendamento in livres:
+            if agendamento.id in ids_inseridos:
+                resultado["criados"].append(agendamento)
+                if self.indice is not None:
+                    self.indice.adicionar(agendamento)
+            else:
+                resultado["conflitos"].append(
+                    self._conflito_ocorrencia(agendamento, "concorrente")
+                )
+
+        print(f"✓ {len(resultado['criados'])} agendamento(s) da série criados")
+        return resultado
+
+    def buscar_agendamento(self, agendamento_id: str) -> Agendamento | None:
+        """
+        Busca um agendamento por UUID.
+
+        Args:
+            agendamento_id: UUID do agendamento
+
+        Returns:
+            Agendamento encontrado ou None
+        """
+        with self._get_conn() as conn, conn.cursor() as cur:
+            cur.execute("SELECT * FROM agendamento WHERE uuid = %s;", (agendamento_id,))
+            row = cur.fetchone()
+
+            if not row:
+                return None
+
+            return self._criar_agendamento_from_row(row)
+
+    def remarcar_agendamento(self, agendamento_id: str, inicio: datetime,
+                             fim: datetime, sala_id: str = None) -> bool:
+        """
+        Altera horário (e opcionalmente a sala) de um agendamento ativo.
+
+        Args:
+            agendamento_id: UUID do agendamento
+            inicio: Novo início
+            fim: Novo fim
+            sala_id: Nova sala (None para manter)
+
+        Returns:
+            True se remarcado, False se não encontrado, inválido ou conflitante
+        """
+        if inicio >= fim:
+            print("A data de início deve ser anterior à data de término")
+            return False
+
+        try:
+            with self._get_conn() as conn, conn.cursor() as cur:
+                cur.execute("""
+                    UPDATE agendamento
+                    SET inicio = %s, fim = %s, fk_sala_uuid = COALESCE(%s, fk_sala_uuid)
+                    WHERE uuid = %s AND status != %s
+                    RETURNING uuid, fk_sala_uuid, inicio, fim, status;
+                """, (inicio, fim, sala_id, agendamento_id, statusAgendamento.CANCELADO.value))
+                row = cur.fetchone()
+
+                if not row:
+                    print(f"Agendamento {agendamento_id} não encontrado ou cancelado")
+                    return False
+
+                conn.commit()
+        except psycopg2.errors.ExclusionViolation as e:
+            print(f"Conflito de agendamento: {self._mensagem_conflito(e)}")
+            return False
+
+        if self.indice is not None:
+            self.indice.adicionar(row)
+
+        print(f"✓ Agendamento remarcado com sucesso!")
+        return True
+
+    def cancelar_agendamento(self, agendamento_id: str, cancelado_por: str = None) -> bool:
+        """
+        Cancela um agendamento (libera sala e profissional para o horário).
+
+        Args:
+            agendamento_id: UUID do agendamento
+            cancelado_por: Quem cancelou (opcional)
+
+        Returns:
+            True se cancelado, False se não encontrado ou já cancelado
+        """
+        with self._get_conn() as conn, conn.cursor() as cur:
+            cur.execute("""
+                UPDATE agendamento
+                SET status = %s, cancelado_por = %s, cancelado_em = %s
+                WHERE uuid = %s AND status != %s;
+            """, (
+                statusAgendamento.CANCELADO.value,
+                cancelado_por,
+                datetime.now(timezone.utc),
+                agendamento_id,
+                statusAgendamento.CANCELADO.value
+            ))
+
+            if cur.rowcount == 0:
+                print(f"Agendamento {agendamento_id} não encontrado ou já cancelado")
+                return False
+
+            conn.commit()
+
+        if self.indice is not None:
+            self.indice.remover(agendamento_id)
+
+        print(f"✓ Agendamento cancelado com sucesso!")
+        return True
+
+    def listar_periodo(self, inicio: datetime, fim: datetime, sala_id: str = None,
+                       profissional_id: str = None, status: str = None,
+                       cursor: str = None, limite: int = 200) -> tuple[list[dict], str | None]:
+        """
+        Lista os agendamentos que ocupam parte do período [inicio, fim).
+
+        Inclui os que começam antes da janela e terminam dentro dela (ex.:
+        um atendimento que atravessa a meia-noite na visão do dia). Consulta
+        pensada para as visões de dia/semana/mês da agenda: a sobreposição
+        usa os índices GiST sobre tstzrange(inicio, fim) da migração 013 e a
+        paginação é por cursor (keyset em inicio, uuid) em vez de OFFSET.
+
+        Args:
+            inicio: Início do período
+            fim: Fim do período (exclusivo)
+            sala_id: Filtra por sala (opcional)
+            profissional_id: Filtra por profissional (opcional)
+            status: Filtra por status (opcional)
+            cursor: Cursor retornado pela página anterior (opcional)
+            limite: Máximo de itens por página (1 a 500)
+
+        Returns:
+            Tupla (itens compactos, cursor da próxima página ou None)
+
+        Raises:
+            ValueError: Se período, limite ou cursor forem inválidos
+        """
+        if inicio >= fim:
+            raise ValueError("O início do período deve ser anterior ao fim")
+
+        if not 1 <= limite <= 500:
+            raise ValueError("limite deve estar entre 1 e 500")
+
+        # Sobreposição (inicio < fim da janela AND fim > inicio da janela),
+        # escrita com && para usar os índices GiST
+        filtros = ["tstzrange(inicio, fim, '[)') && tstzrange(%(inicio)s, %(fim)s, '[)')"]
+        parametros = {"inicio": inicio, "fim": fim, "limite": limite + 1}
+
+        if sala_id is not None:
+            filtros.append("fk_sala_uuid = %(sala)s")
+            parametros["sala"] = sala_id
+
+        if profissional_id is not None:
+            filtros.append("profissional = %(profissional)s")
+            parametros["profissional"] = profissional_id
+
+        if status is not None:
+            filtros.append("status = %(status)s")
+            parametros["status"] = status.strip().upper()
+
+        if cursor:
+            # Continua após o último (inicio, uuid) da página anterior
+            parametros["apos_inicio"], parametros["apos_uuid"] = self._ler_cursor(cursor)
+            filtros.append("(inicio, uuid) > (%(apos_inicio)s, %(apos_uuid)s)")
+
+        with self._get_conn() as conn, conn.cursor() as cur:
+            cur.execute(f"""
+                SELECT uuid, fk_sala_uuid, profissional, cliente, pet,
+                       inicio, fim, tipo_atendimento, status
+                FROM agendamento
+                WHERE {' AND '.join(filtros)}
+                ORDER BY inicio, uuid
+                LIMIT %(limite)s;
+            """, parametros)
+            rows = cur.fetchall()
+
+        proximo = None
+        if len(rows) > limite:
+            rows = rows[:limite]
+            proximo = self._gerar_cursor(rows[-1])
+
+        return [self._agendamento_compacto(row) for row in rows], proximo
+
+    @staticmethod
+    def _agendamento_compacto(row: dict) -> dict:
+        """Converte uma linha em dicionário enxuto para o JSON da agenda."""
+        return {
+            "id": row["uuid"],
+            "sala": row["fk_sala_uuid"],
+            "profissional": row["profissional"],
+            "cliente": row["cliente"],
+            "pet": row["pet"],
+            "inicio": row["inicio"].isoformat(),
+            "fim": row["fim"].isoformat(),
+            "tipo": row["tipo_atendimento"],
+            "status": row["status"],
+        }
+
+    @staticmethod
+    def _gerar_cursor(row: dict) -> str:
+        """Cursor opaco com a chave (inicio, uuid) do último item da página."""
+        return f"{row['inicio'].isoformat()}|{row['uuid']}"
+
+    @staticmethod
+    def _ler_cursor(cursor: str) -> tuple[datetime, str]:
+        """Lê o cursor gerado por _gerar_cursor."""
+        try:
+            inicio_iso, agendamento_id = cursor.split("|", 1)
+            return datetime.fromisoformat(inicio_iso), agendamento_id
+        except ValueError:
+            raise ValueError("Cursor inválido")
+
+    def _criar_agendamento_from_row(self, row: dict) -> Agendamento:
+        """
+        Cria objeto Agendamento a partir de uma linha do banco.
+
+        Args:
+            row: Dicionário com dados do banco (fetchone())
+
+        Returns:
+            Instância de Agendamento
+        """
+        agendamento = Agendamento(
+            id=str(row["uuid"]),
+            sala_id=str(row["fk_sala_uuid"]),
+            profissional_id=str(row["profissional"]),
+            cliente_id=str(row["cliente"]),
+            pet_id=str(row["pet"]),
+            inicio=row["inicio"],
+            fim=row["fim"],
+            tipo_atendimento=row["tipo_atendimento"],
+            observacoes=row.get("observacoes"),
+            criado_por=row.get("criado_por")
+        )
+
+        # Restaura os atributos de controle
+        agendamento.status = row["status"]
+        if row.get("criado_em"):
+            agendamento.criado_em = row["criado_em"]
+        agendamento.cancelado_por = row.get("cancelado_por")
+        agendamento.cancelado_em = row.get("cancelado_em")
+        return agendamento
+
+    @staticmethod
+    def _conflito_ocorrencia(agendamento: Agendamento, motivo: str) -> dict:
+        """Descreve uma ocorrência da série que não pôde ser criada."""
+        return {
+            "inicio": agendamento.inicio.isoformat(),
+            "fim": agendamento.fim.isoformat(),
+            "motivo": motivo,
+        }
+
+    def _mensagem_conflito(self, erro) -> str:
+        """Traduz a restrição de exclusão violada em mensagem para a recepção."""
+        restricao = getattr(getattr(erro, "diag", None), "constraint_name", None)
+        return self.CONFLITOS.get(restricao, "Horário indisponível.")
@@ -1,32 +1,130 @@
 from datetime import datetime, timezone, timedelta
 from uuid import UUID
+import hashlib
 import os
+import time
 from backend.enums.perfil_usuario import PerfilUsuario
 from backend.enums.status_usuario import StatusUsuario
 from backend.models.usuario import Usuario
 from backend.DB.conexao import Conexao
+from backend.services.cache_usuarios import COLUNAS_DIRETORIO, CacheUsuarios, obter_cache_usuarios
+from backend.services.executor_hash import ExecutorHashSenha, obter_executor
+from backend.services.limitador_login import LimitadorLogin, obter_limitador
+from backend.services.politica_hash import PoliticaHash, obter_politica, verificar_senha
+from backend.services.sessao import GerenciadorSessoes, obter_gerenciador
+from backend.services.tarefa_periodica import TarefaPeriodica
 
 class AutenticacaoServico(Conexao):
     """
     Serviço responsável por autenticação, gerenciamento de senhas e tokens.
     
-    Utiliza o sistema de hash do Usuario (PBKDF2 com 600k iterações).
+    Utiliza o sistema de hash do Usuario (PBKDF2 com 600k iterações),
+    executado no pool de processos de ExecutorHashSenha. Se a fila de
+    hashing estiver cheia, os métodos propagam HashSobrecarregadoErro
+    para que a rota responda 503 em vez de enfileirar o login.
+
+    Tentativas de login passam antes pelo LimitadorLogin (por email e IP);
+    acima do limite, sessao_login propaga LoginBloqueadoErro (HTTP 429)
+    sem consultar o banco nem calcular hash.
     """
 
     # Configurações de token
     TOKEN_EXPIRACAO_MINUTOS = 30
     TOKEN_TAMANHO_BYTES = 32  # 64 caracteres hex
 
-    def sessao_login(self, email: str, senha: str) -> Usuario | None:
+    # Limpeza de tokens vencidos: DELETEs curtos para não travar a tabela
+    LIMPEZA_LOTE = 1000
+    LIMPEZA_PAUSA_SEGUNDOS = 0.05
+
+    def __init__(self, conn_str=None, executor_hash: ExecutorHashSenha | None = None,
+                 politica_hash: PoliticaHash | None = None,
+                 limitador: LimitadorLogin | None = None,
+                 sessoes: GerenciadorSessoes | None = None,
+                 cache_usuarios: CacheUsuarios | None = None):
+        """
+        Inicializa o serviço.
+
+        Args:
+            conn_str: String de conexão (None usa variáveis de ambiente)
+            executor_hash: Executor de hashing (None usa o compartilhado do processo)
+            politica_hash: Política de hashing (None usa a do ambiente)
+            limitador: Limitador de tentativas de login (None usa o do processo)
+            sessoes: Gerenciador de sessões (None usa o do processo)
+            cache_usuarios: Cache do diretório de usuários (None usa o do processo)
+        """
+        super().__init__(conn_str)
+        self._executor_hash = executor_hash
+        self.politica_hash = politica_hash or obter_politica()
+        self.limitador = limitador or obter_limitador()
+        self._sessoes = sessoes
+        self.cache_usuarios = cache_usuarios if cache_usuarios is not None else obter_cache_usuarios()
+
+    @property
+    def sessoes(self) -> GerenciadorSessoes:
+        """Gerenciador de sessões (obtido sob demanda)."""
+        if self._sessoes is None:
+            self._sessoes = obter_gerenciador()
+        return self._sessoes
+
+    @property
+    def executor_hash(self) -> ExecutorHashSenha:
+        """Executor de hashing (obtido sob demanda)."""
+        if self._executor_hash is None:
+            self._executor_hash = obter_executor()
+        return self._executor_hash
+
+    def _verificar_senha(self, senha_hash: str, senha: str) -> bool:
+        """Verifica a senha em qualquer formato conhecido (PBKDF2, werkzeug, SHA-256 legado)."""
+        return self.executor_hash.executar(verificar_senha, senha_hash, senha)
+
+    def _gerar_hash(self, senha: str) -> str:
+        """Gera hash conforme a política atual, no pool de hashing."""
+        return self.executor_hash.executar(Usuario.hash_senha, senha, self.politica_hash.iteracoes)
+
+    def _migrar_hash(self, idusuario: int, hash_antigo: str, senha: str) -> None:
+        """
+        Regrava em segundo plano um hash fora da política (rehash no login).
+
+        Só atualiza se o hash não mudou nesse meio tempo (ex.: troca de senha).
+        """
+        def gravar(novo_hash: str, versao: int) -> None:
+            with self._get_conn() as conn, conn.cursor() as cur:
+                cur.execute("""
+                    UPDATE usuario SET senhahash = %s, versao_hash = %s
+                    WHERE idusuario = %s AND senhahash = %s;
+                """, (novo_hash, versao, idusuario, hash_antigo))
+                conn.commit()
+
+        self.politica_hash.rehash_em_segundo_plano(self.executor_hash, senha, gravar)
+
+    @staticmethod
+    def _digest_token(token: str) -> str:
+        """SHA-256 do token de recuperação: o banco guarda só o digest."""
+        return hashlib.sha256(token.encode("utf-8")).hexdigest()
+
+    def _simular_verificacao(self, senha: str) -> None:
+        """
+        Verifica a senha contra um hash descartável da política atual.
+
+        Usado quando o email não existe, para que a resposta leve o mesmo
+        tempo de uma senha errada e não revele quais emails estão cadastrados.
+        """
+        self._verificar_senha(self.politica_hash.hash_referencia(self.executor_hash), senha)
+
+    def sessao_login(self, email: str, senha: str, ip: str | None = None) -> Usuario | None:
         """
         Realiza login do usuário.
         
         Args:
             email: Email do usuário
             senha: Senha em texto plano
+            ip: IP de origem (para o limite de tentativas)
             
         Returns:
             Usuario se autenticado com sucesso, None caso contrário
+
+        Raises:
+            LoginBloqueadoErro: Se email ou IP excederem o limite de tentativas
             
         Notes:
             - Valida email, senha e status do usuário
@@ -37,53 +135,65 @@ class AutenticacaoServico(Conexao):
             print("Credenciais inválidas.")
             return None
 
+        # Antes de qualquer acesso ao banco ou hashing
+        self.limitador.verificar(email, ip)
+
         with self._get_conn() as conn, conn.cursor() as cur:
             # Busca usuário por email
             cur.execute(
-                "SELECT * FROM usuario WHERE email = %s;", 
+                f"SELECT {', '.join(COLUNAS_DIRETORIO)}, senhahash FROM usuario WHERE email = %s;",
                 (email.strip().lower(),)
             )
             usuario_row = cur.fetchone()
 
-            # Validações (mensagem genérica para não revelar se email existe)
-            if not usuario_row:
-                print("Credenciais inválidas.")
-                return None
+        # Validações (mensagem genérica e mesmo custo para não revelar se email existe)
+        if not usuario_row:
+            self._simular_verificacao(senha)
+            print("Credenciais inválidas.")
+            return None
 
-            # Valida senha usando o método do Usuario
-            if not Usuario.validar_senha(usuario_row["senhahash"], senha):
-                print("Credenciais inválidas.")
-                return None
+        # Valida senha fora da conexão: o PBKDF2 não segura uma conexão do pool
+        if not self._verificar_senha(usuario_row["senhahash"], senha):
+            print("Credenciais inválidas.")
+            return None
 
-            # Verifica se usuário está ativo
-            status = StatusUsuario(usuario_row["status"])
-            if status != StatusUsuario.ATIVO:
-                print("Usuário inativo. Contate o administrador.")
-                return None
+        # Verifica se usuário está ativo
+        status = StatusUsuario(usuario_row["status"])
+        if status != StatusUsuario.ATIVO:
+            print("Usuário inativo. Contate o administrador.")
+            return None
 
-            # Atualiza último login (se o campo existir na tabela)
-            try:
+        self.limitador.registrar_sucesso(email)
+
+        # Atualiza último login (se o campo existir na tabela)
+        try:
+            with self._get_conn() as conn, conn.cursor() as cur:
                 cur.execute(
                     "UPDATE usuario SET ultimo_login = %s WHERE idusuario = %s;",
                     (datetime.now(timezone.utc), usuario_row["idusuario"])
                 )
                 conn.commit()
-            except Exception as e:
-                # Campo ultimo_login pode não existir na tabela
-                print(f"Aviso: não foi possível atualizar último login: {e}")
+        except Exception as e:
+            # Campo ultimo_login pode não existir na tabela
+            print(f"Aviso: não foi possível atualizar último login: {e}")
+
+        # Hash legado ou com custo abaixo da política: migra sem atrasar o login
+        if self.politica_hash.precisa_rehash(usuario_row["senhahash"]):
+            self._migrar_hash(usuario_row["idusuario"], usuario_row["senhahash"], senha)
 
-            print(f"Usuário {usuario_row['nome']} logado com sucesso!")
+        print(f"Usuário {usuario_row['nome']} logado com sucesso!")
 
-            # Cria objeto Usuario a partir dos dados do banco
-            usuario = self._criar_usuario_from_row(usuario_row)
-            return usuario
+        # Cria objeto Usuario a partir dos dados do banco
+        usuario = self._criar_usuario_from_row(usuario_row)
+        return usuario
 
     def _criar_usuario_from_row(self, row: dict) -> Usuario:
         """
         Cria objeto Usuario a partir de uma linha do banco.
         
         Args:
-            row: Dicionário com dados do banco (fetchone())
+            row: Dicionário com dados do banco (fetchone()) ou registro do cache;
+                sem "senhahash" o usuário recebe Usuario.HASH_NAO_CARREGADO
             
         Returns:
             Instância de Usuario
@@ -100,10 +210,10 @@ class AutenticacaoServico(Conexao):
 
         # Cria usuário
         return Usuario(
-            uuid=UUID(row["uuid"]) if row.get("uuid") else None,
+            usuario_id=UUID(str(row["uuid"])) if row.get("uuid") else None,
             nome=row["nome"],
             email=row["email"],
-            senha_hash=row["senhahash"],
+            senha_hash=row.get("senhahash") or Usuario.HASH_NAO_CARREGADO,
             perfil=PerfilUsuario(row["perfil"]),
             status=StatusUsuario(row["status"]),
             ultimo_login=ultimo_login
@@ -132,8 +242,8 @@ class AutenticacaoServico(Conexao):
         if len(senha) < 8:
             raise ValueError("Senha deve ter no mínimo 8 caracteres")
 
-        # Gera hash da senha usando o método do Usuario
-        senha_hash = Usuario.hash_senha(senha)
+        # Gera hash da senha usando o método do Usuario (no pool de hashing)
+        senha_hash = self._gerar_hash(senha)
 
         # Cria usuário (validações feitas no construtor)
         usuario = Usuario(
@@ -157,14 +267,15 @@ class AutenticacaoServico(Conexao):
 
             # Insere usuário
             cur.execute("""
-                INSERT INTO usuario (uuid, nome, email, senhahash, perfil, status, ultimo_login)
-                VALUES (%s, %s, %s, %s, %s, %s, %s)
+                INSERT INTO usuario (uuid, nome, email, senhahash, versao_hash, perfil, status, ultimo_login)
+                VALUES (%s, %s, %s, %s, %s, %s, %s, %s)
                 RETURNING idusuario;
             """, (
-                usuario.uuid,
+                usuario.usuario_id,
                 usuario.nome,
                 usuario.email,
                 usuario.senha_hash,
+                self.politica_hash.versao,
                 usuario.perfil.value,
                 usuario.status.value,
                 None  # ultimo_login = NULL inicialmente
@@ -172,9 +283,11 @@ class AutenticacaoServico(Conexao):
             
             usuario_id = cur.fetchone()["idusuario"]
             conn.commit()
-            
-            print(f"Usuário {usuario.nome} criado com sucesso! ID: {usuario_id}")
-            return usuario
+
+        self.cache_usuarios.invalidar(email=usuario.email)
+
+        print(f"Usuário {usuario.nome} criado com sucesso! ID: {usuario_id}")
+        return usuario
 
     def alterar_senha(self, email: str, senha_atual: str, senha_nova: str) -> bool:
         """
@@ -204,27 +317,34 @@ class AutenticacaoServico(Conexao):
             )
             usuario_row = cur.fetchone()
 
-            if not usuario_row:
-                print("Usuário não encontrado.")
-                return False
+        if not usuario_row:
+            print("Usuário não encontrado.")
+            return False
 
-            # Valida senha atual
-            if not Usuario.validar_senha(usuario_row["senhahash"], senha_atual):
-                print("Senha atual incorreta.")
-                return False
+        # Valida senha atual
+        if not self._verificar_senha(usuario_row["senhahash"], senha_atual):
+            print("Senha atual incorreta.")
+            return False
 
-            # Gera novo hash
-            novo_hash = Usuario.hash_senha(senha_nova)
+        # Gera novo hash
+        novo_hash = self._gerar_hash(senha_nova)
 
-            # Atualiza no banco
+        with self._get_conn() as conn, conn.cursor() as cur:
+            # Atualiza só se o hash não mudou enquanto validávamos (alteração concorrente)
             cur.execute(
-                "UPDATE usuario SET senhahash = %s WHERE idusuario = %s;",
-                (novo_hash, usuario_row["idusuario"])
+                """
+                UPDATE usuario SET senhahash = %s, versao_hash = %s
+                WHERE idusuario = %s AND senhahash = %s;
+                """,
+                (novo_hash, self.politica_hash.versao, usuario_row["idusuario"], usuario_row["senhahash"])
             )
+            if cur.rowcount == 0:
+                print("Senha alterada por outra sessão. Tente novamente.")
+                return False
             conn.commit()
 
-            print("Senha alterada com sucesso.")
-            return True
+        print("Senha alterada com sucesso.")
+        return True
 
     def solicitar_recuperacao_senha(self, email: str) -> str | None:
         """
@@ -264,12 +384,12 @@ class AutenticacaoServico(Conexao):
             token = os.urandom(self.TOKEN_TAMANHO_BYTES).hex()
             expira_em = datetime.now(timezone.utc) + timedelta(minutes=self.TOKEN_EXPIRACAO_MINUTOS)
 
-            # Insere token no banco
+            # Insere só o digest: quem lê o banco não consegue usar o token
             cur.execute("""
                 INSERT INTO tokenrecuperacao 
-                    (token, expiraem, utilizado, fk_usuario_idusuario)
+                    (token_hash, expiraem, utilizado, fk_usuario_idusuario)
                 VALUES (%s, %s, FALSE, %s);
-            """, (token, expira_em, usuario["idusuario"]))
+            """, (self._digest_token(token), expira_em, usuario["idusuario"]))
             
             conn.commit()
 
@@ -301,45 +421,49 @@ class AutenticacaoServico(Conexao):
             return False
 
         with self._get_conn() as conn, conn.cursor() as cur:
-            # Busca token
+            # Busca pelo digest (índice único), sem join com usuario
             cur.execute("""
-                SELECT t.idtoken, t.expiraem, t.utilizado, u.idusuario
-                FROM tokenrecuperacao t
-                JOIN usuario u ON u.idusuario = t.fk_usuario_idusuario
-                WHERE t.token = %s;
-            """, (token,))
+                SELECT idtoken, expiraem, utilizado, fk_usuario_idusuario AS idusuario
+                FROM tokenrecuperacao
+                WHERE token_hash = %s;
+            """, (self._digest_token(token),))
             
             meta = cur.fetchone()
 
-            # Validações (mensagens genéricas por segurança)
-            if not meta:
-                print("Token inválido ou expirado.")
-                return False
-                
-            if meta["utilizado"]:
-                print("Token inválido ou expirado.")
-                return False
-
-            # Verifica expiração
-            expira_em = meta["expiraem"]
-            if expira_em.tzinfo is None:
-                expira_em = expira_em.replace(tzinfo=timezone.utc)
-                
-            if expira_em <= datetime.now(timezone.utc):
-                print("Token inválido ou expirado.")
-                return False
+        # Validações (mensagens genéricas por segurança)
+        if not meta:
+            print("Token inválido ou expirado.")
+            return False
+            
+        if meta["utilizado"]:
+            print("Token inválido ou expirado.")
+            return False
 
-            # Gera novo hash usando método do Usuario
-            novo_hash = Usuario.hash_senha(nova_senha)
+        # Verifica expiração
+        expira_em = meta["expiraem"]
+        if expira_em.tzinfo is None:
+            expira_em = expira_em.replace(tzinfo=timezone.utc)
             
-            # Atualiza senha e marca token como utilizado
+        if expira_em <= datetime.now(timezone.utc):
+            print("Token inválido ou expirado.")
+            return False
+
+        # Gera novo hash fora da conexão (no pool de hashing)
+        novo_hash = self._gerar_hash(nova_senha)
+
+        with self._get_conn() as conn, conn.cursor() as cur:
+            # Marca o token como utilizado só se ninguém o usou nesse meio tempo
             cur.execute(
-                "UPDATE usuario SET senhahash = %s WHERE idusuario = %s;",
-                (novo_hash, meta["idusuario"])
+                "UPDATE tokenrecuperacao SET utilizado = TRUE WHERE idtoken = %s AND utilizado = FALSE;",
+                (meta["idtoken"],)
             )
+            if cur.rowcount == 0:
+                print("Token inválido ou expirado.")
+                return False
+
             cur.execute(
-                "UPDATE tokenrecuperacao SET utilizado = TRUE WHERE idtoken = %s;",
-                (meta["idtoken"],)
+                "UPDATE usuario SET senhahash = %s, versao_hash = %s WHERE idusuario = %s;",
+                (novo_hash, self.politica_hash.versao, meta["idusuario"])
             )
             
             conn.commit()
@@ -374,27 +498,67 @@ class AutenticacaoServico(Conexao):
             print(f"{tokens_invalidados} token(s) invalidado(s) para usuário {usuario_id}.")
             return tokens_invalidados
 
-    def limpar_tokens_expirados(self) -> int:
+    def limpar_tokens_expirados(self, lote: int | None = None, pausa: float | None = None) -> int:
         """
-        Remove tokens expirados do banco (manutenção).
+        Remove tokens expirados do banco (manutenção), em lotes.
         
+        Cada lote é um DELETE de no máximo `lote` linhas com commit próprio,
+        então os locks em tokenrecuperacao duram pouco mesmo com muitos
+        tokens vencidos acumulados.
+
+        Args:
+            lote: Linhas por DELETE (padrão: LIMPEZA_LOTE)
+            pausa: Segundos entre lotes (padrão: LIMPEZA_PAUSA_SEGUNDOS)
+
         Returns:
             Número de tokens removidos
             
         Notes:
-            Executar periodicamente (cron job, etc)
+            Executar periodicamente (iniciar_limpeza_tokens, cron job, etc)
         """
-        with self._get_conn() as conn, conn.cursor() as cur:
-            cur.execute("""
-                DELETE FROM tokenrecuperacao 
-                WHERE expiraem < %s;
-            """, (datetime.now(timezone.utc),))
-            
-            tokens_removidos = cur.rowcount
-            conn.commit()
-            
-            print(f"{tokens_removidos} token(s) expirado(s) removido(s).")
-            return tokens_removidos
+        lote = lote or self.LIMPEZA_LOTE
+        pausa = self.LIMPEZA_PAUSA_SEGUNDOS if pausa is None else pausa
+        agora = datetime.now(timezone.utc)
+        tokens_removidos = 0
+
+        while True:
+            with self._get_conn() as conn, conn.cursor() as cur:
+                cur.execute("""
+                    DELETE FROM tokenrecuperacao
+                    WHERE idtoken IN (
+                        SELECT idtoken
+                        FROM tokenrecuperacao
+                        WHERE expiraem < %s
+                        LIMIT %s
+                        FOR UPDATE SKIP LOCKED
+                    );
+                """, (agora, lote))
+                
+                removidos = cur.rowcount
+                conn.commit()
+
+            tokens_removidos += removidos
+            if removidos < lote:
+                break
+            if pausa:
+                time.sleep(pausa)
+
+        print(f"{tokens_removidos} token(s) expirado(s) removido(s).")
+        return tokens_removidos
+
+    def iniciar_limpeza_tokens(self, intervalo: float = 3600.0) -> TarefaPeriodica:
+        """
+        Agenda limpar_tokens_expirados em segundo plano.
+
+        Args:
+            intervalo: Segundos entre execuções
+
+        Returns:
+            A tarefa iniciada (chamar parar() para encerrar)
+        """
+        tarefa = TarefaPeriodica("limpeza-tokens-recuperacao", self.limpar_tokens_expirados, intervalo)
+        tarefa.iniciar()
+        return tarefa
 
     def verificar_email_disponivel(self, email: str) -> bool:
         """
@@ -409,6 +573,10 @@ class AutenticacaoServico(Conexao):
         if not email:
             return False
 
+        # Email já no cache está cadastrado; ausência sempre confirma no banco
+        if self.cache_usuarios.por_email(email) is not None:
+            return False
+
         with self._get_conn() as conn, conn.cursor() as cur:
             cur.execute(
                 "SELECT 1 FROM usuario WHERE email = %s LIMIT 1;",
@@ -416,30 +584,80 @@ class AutenticacaoServico(Conexao):
             )
             return cur.fetchone() is None
 
+    def buscar_usuario_por_email(self, email: str) -> Usuario | None:
+        """
+        Busca um usuário pelo email (via cache, sem carregar o hash da senha).
+        
+        Args:
+            email: Email do usuário
+            
+        Returns:
+            Usuario (senha_hash = Usuario.HASH_NAO_CARREGADO) ou None
+        """
+        if not email:
+            return None
+
+        registro = self.cache_usuarios.por_email(email)
+        if registro is None:
+            registro = self._carregar_registro("email", email.strip().lower())
+        return self._criar_usuario_from_row(registro) if registro else None
+
+    def buscar_usuario_por_uuid(self, uuid) -> Usuario | None:
+        """
+        Busca um usuário pelo UUID (via cache, sem carregar o hash da senha).
+        
+        Args:
+            uuid: UUID do usuário
+            
+        Returns:
+            Usuario (senha_hash = Usuario.HASH_NAO_CARREGADO) ou None
+        """
+        if not uuid:
+            return None
+
+        registro = self.cache_usuarios.por_uuid(uuid)
+        if registro is None:
+            registro = self._carregar_registro("uuid", str(uuid))
+        return self._criar_usuario_from_row(registro) if registro else None
+
+    def _carregar_registro(self, coluna: str, valor: str) -> dict | None:
+        """Lê um usuário (colunas do diretório) e o guarda no cache."""
+        with self._get_conn() as conn, conn.cursor() as cur:
+            cur.execute(
+                f"SELECT {', '.join(COLUNAS_DIRETORIO)} FROM usuario WHERE {coluna} = %s;",
+                (valor,)
+            )
+            row = cur.fetchone()
+        return self.cache_usuarios.guardar(row) if row else None
+
     def listar_usuarios_ativos(self) -> list[Usuario]:
         """
         Lista todos os usuários ativos.
         
         Returns:
-            Lista de objetos Usuario ativos
+            Lista de objetos Usuario ativos (sem o hash da senha)
         """
-        with self._get_conn() as conn, conn.cursor() as cur:
-            cur.execute("""
-                SELECT * FROM usuario 
-                WHERE status = %s 
-                ORDER BY nome;
-            """, (StatusUsuario.ATIVO.value,))
-            
-            usuarios = []
-            for row in cur.fetchall():
-                try:
-                    usuario = self._criar_usuario_from_row(row)
-                    usuarios.append(usuario)
-                except Exception as e:
-                    print(f"Erro ao criar usuário {row.get('email')}: {e}")
-                    continue
-            
-            return usuarios
+        registros = self.cache_usuarios.ativos()
+        if registros is None:
+            with self._get_conn() as conn, conn.cursor() as cur:
+                cur.execute(f"""
+                    SELECT {', '.join(COLUNAS_DIRETORIO)} FROM usuario 
+                    WHERE status = %s 
+                    ORDER BY nome;
+                """, (StatusUsuario.ATIVO.value,))
+                rows = cur.fetchall()
+            registros = self.cache_usuarios.guardar_ativos(rows)
+
+        usuarios = []
+        for row in registros:
+            try:
+                usuario = self._criar_usuario_from_row(row)
+                usuarios.append(usuario)
+            except Exception as e:
+                print(f"Erro ao criar usuário {row.get('email')}: {e}")
+                continue
+        
+        return usuarios
 
     def atualizar_perfil_usuario(self, email: str, novo_perfil: PerfilUsuario) -> bool:
         """
@@ -467,12 +685,14 @@ class AutenticacaoServico(Conexao):
                 return False
             
             conn.commit()
-            print(f"Perfil de {email} atualizado para {novo_perfil.value}.")
-            return True
+
+        self.cache_usuarios.invalidar(email=email)
+        print(f"Perfil de {email} atualizado para {novo_perfil.value}.")
+        return True
 
     def desativar_usuario(self, email: str) -> bool:
         """
-        Desativa um usuário (soft delete).
+        Desativa um usuário (soft delete) e encerra todas as sessões dele.
         
         Args:
             email: Email do usuário
@@ -482,7 +702,7 @@ class AutenticacaoServico(Conexao):
         """
         with self._get_conn() as conn, conn.cursor() as cur:
             cur.execute(
-                "UPDATE usuario SET status = %s WHERE email = %s;",
+                "UPDATE usuario SET status = %s WHERE email = %s RETURNING uuid;",
                 (StatusUsuario.INATIVO.value, email.strip().lower())
             )
             
@@ -490,9 +710,17 @@ class AutenticacaoServico(Conexao):
                 print(f"Usuário {email} não encontrado.")
                 return False
             
+            uuids = [row["uuid"] for row in cur.fetchall()]
             conn.commit()
-            print(f"Usuário {email} desativado.")
-            return True
+
+        self.cache_usuarios.invalidar(email=email)
+
+        # Sessões são identificadas pelo uuid do usuário (ver /login em routes.py)
+        for usuario_uuid in uuids:
+            self.sessoes.revogar_usuario(usuario_uuid)
+
+        print(f"Usuário {email} desativado.")
+        return True
 
     def reativar_usuario(self, email: str) -> bool:
         """
@@ -515,5 +743,7 @@ class AutenticacaoServico(Conexao):
                 return False
             
             conn.commit()
-            print(f"Usuário {email} reativado.")
-            return True
\ No newline at end of file
+
+        self.cache_usuarios.invalidar(email=email)
+        print(f"Usuário {email} reativado.")
+        return True
\ No newline at end of file
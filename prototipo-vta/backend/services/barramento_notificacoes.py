@@ -0,0 +1,233 @@
+import itertools
+import json
+import os
+import queue
+import select
+import threading
+from backend.DB.conexao import Conexao
+
+
+class Assinatura:
+    """
+    Fila de eventos de um cliente conectado (uma aba com o stream SSE aberto).
+
+    Eventos marcados com "urgente" saem antes dos demais já enfileirados;
+    entre eventos da mesma prioridade a ordem de chegada é mantida.
+
+    Attributes:
+        usuario_id: Usuário dono da assinatura
+    """
+
+    def __init__(self, usuario_id: str, max_fila: int):
+        self.usuario_id = usuario_id
+        self._fila = queue.PriorityQueue(maxsize=max_fila)
+        self._sequencia = itertools.count()
+
+    def entregar(self, evento: dict) -> bool:
+        """Enfileira sem bloquear; False se a fila do cliente estiver cheia (evento descartado)."""
+        prioridade = 0 if evento.get("urgente") else 1
+        try:
+            self._fila.put_nowait((prioridade, next(self._sequencia), evento))
+            return True
+        except queue.Full:
+            return False
+
+    def proximo(self, timeout: float | None = None) -> dict | None:
+        """Próximo evento, ou None se nada chegar em `timeout` segundos."""
+        try:
+            return self._fila.get(timeout=timeout)[2]
+        except queue.Empty:
+            return None
+
+
+class BarramentoNotificacoes:
+    """
+    Pub/sub em memória de eventos de notificação, por usuário.
+
+    NotificacaoServico publica; cada stream SSE aberto assina o seu
+    usuário e fica bloqueado na fila até chegar um evento, sem consultar o
+    banco enquanto nada acontece. Um cliente lento não segura quem
+    publica: com a fila cheia o evento é descartado para ele (o próximo
+    evento traz a contagem de não lidas atualizada).
+
+    Só alcança clientes conectados neste processo; com vários workers,
+    use BarramentoPostgres.
+    """
+
+    def __init__(self, max_fila: int = 100):
+        """
+        Inicializa o barramento.
+
+        Raises:
+            ValueError: Se max_fila não for positivo
+        """
+        if max_fila <= 0:
+            raise ValueError("max_fila deve ser positivo")
+
+        self.max_fila = max_fila
+        self._assinaturas = {}  # usuario_id -> set de Assinatura
+        self._lock = threading.Lock()
+
+    def assinar(self, usuario_id) -> Assinatura:
+        """Registra um cliente do usuário (chamar cancelar() ao desconectar)."""
+        assinatura = Assinatura(str(usuario_id), self.max_fila)
+        with self._lock:
+            self._assinaturas.setdefault(assinatura.usuario_id, set()).add(assinatura)
+        return assinatura
+
+    def cancelar(self, assinatura: Assinatura) -> None:
+        """Remove o cliente."""
+        with self._lock:
+            assinaturas = self._assinaturas.get(assinatura.usuario_id)
+            if assinaturas is not None:
+                assinaturas.discard(assinatura)
+                if not assinaturas:
+                    del self._assinaturas[assinatura.usuario_id]
+
+    def publicar(self, usuario_id, evento: dict) -> int:
+        """
+        Entrega o evento aos clientes do usuário conectados neste processo.
+
+        Returns:
+            Número de clientes que receberam o evento
+        """
+        with self._lock:
+            assinaturas = list(self._assinaturas.get(str(usuario_id), ()))
+        return sum(1 for assinatura in assinaturas if assinatura.entregar(evento))
+
+    def publicar_lote(self, eventos) -> int:
+        """Publica vários pares (usuario_id, evento); retorna o total de entregas."""
+        return sum(self.publicar(usuario_id, evento) for usuario_id, evento in eventos)
+
+    def total_assinaturas(self) -> int:
+        with self._lock:
+            return sum(len(assinaturas) for assinaturas in self._assinaturas.values())
+
+
+class BarramentoPostgres(Conexao):
+    """
+    Barramento entre workers via LISTEN/NOTIFY do Postgres.
+
+    publicar() faz pg_notify no canal; uma thread de cada processo escuta o
+    canal em uma conexão dedicada e repassa os eventos ao barramento local,
+    então todo worker (inclusive o que publicou) entrega aos seus clientes.
+    O payload do NOTIFY é limitado a ~8000 bytes pelo Postgres.
+    """
+
+    CANAL = "vta_notificacoes"
+
+    def __init__(self, conn_str=None, local: BarramentoNotificacoes | None = None,
+                 intervalo_reconexao: float = 5.0):
+        """
+        Inicializa o barramento (não inicia a escuta).
+
+        Args:
+            conn_str: String de conexão (None usa variáveis de ambiente)
+            local: Barramento do processo que recebe os eventos (None cria um)
+            intervalo_reconexao: Segundos de espera após perder a conexão de escuta
+        """
+        super().__init__(conn_str)
+        self.local = local if local is not None else BarramentoNotificacoes()
+        self.intervalo_reconexao = intervalo_reconexao
+        self._parar = threading.Event()
+        self._thread = None
+
+    def assinar(self, usuario_id) -> Assinatura:
+        return self.local.assinar(usuario_id)
+
+    def cancelar(self, assinatura: Assinatura) -> None:
+        self.local.cancelar(assinatura)
+
+    def publicar(self, usuario_id, evento: dict) -> None:
+        """Envia o evento a todos os workers (entrega acontece na thread de escuta)."""
+        payload = json.dumps({"usuario_id": str(usuario_id), "evento": evento}, default=str)
+        with self._get_conn() as conn, conn.cursor() as cur:
+            cur.execute("SELECT pg_notify(%s, %s);", (self.CANAL, payload))
+            conn.commit()
+
+    def publicar_lote(self, eventos) -> None:
+        """Publica vários pares (usuario_id, evento) com um único comando."""
+        payloads = [
+            json.dumps({"usuario_id": str(usuario_id), "evento": evento}, default=str)
+            for usuario_id, evento in eventos
+        ]
+        if not payloads:
+            return
+        with self._get_conn() as conn, conn.cursor() as cur:
+            cur.execute(
+                "SELECT pg_notify(%s, payload) FROM unnest(%s::text[]) AS payload;",
+                (self.CANAL, payloads)
+            )
+            conn.commit()
+
+    def iniciar(self) -> None:
+        """Inicia a thread de escuta (sem efeito se já estiver rodando)."""
+        if self._thread is not None and self._thread.is_alive():
+            return
+
+        self._parar.clear()
+        self._thread = threading.Thread(target=self._escutar, name="listen-notificacoes", daemon=True)
+        self._thread.start()
+
+    def parar(self) -> None:
+        """Interrompe a escuta."""
+        self._parar.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+
+    def _escutar(self) -> None:
+        while not self._parar.is_set():
+            conn = None
+            try:
+                # Conexão fora do pool: fica presa no LISTEN enquanto o processo viver
+                conn = self._abrir_conexao()
+                conn.autocommit = True
+                with conn.cursor() as cur:
+                    cur.execute(f"LISTEN {self.CANAL};")
+
+                while not self._parar.is_set():
+                    if select.select([conn], [], [], 1.0) == ([], [], []):
+                        continue
+                    conn.poll()
+                    while conn.notifies:
+                        self._repassar(conn.notifies.pop(0).payload)
+            except Exception as e:
+                print(f"Aviso: escuta de notificações interrompida: {e}")
+                self._parar.wait(self.intervalo_reconexao)
+            finally:
+                if conn is not None:
+                    conn.close()
+
+    def _repassar(self, payload: str) -> None:
+        try:
+            mensagem = json.loads(payload)
+            self.local.publicar(mensagem["usuario_id"], mensagem["evento"])
+        except (ValueError, KeyError) as e:
+            print(f"Aviso: payload de notificação inválido: {e}")
+
+
+# ============================================================================
+# BARRAMENTO DO PROCESSO
+# ============================================================================
+
+_barramento = None
+_barramento_lock = threading.Lock()
+
+
+def obter_barramento():
+    """
+    Retorna o barramento do processo.
+
+    NOTIFICACOES_BARRAMENTO=postgres usa LISTEN/NOTIFY (vários workers);
+    o padrão, memoria, só entrega a clientes deste processo.
+    """
+    global _barramento
+    with _barramento_lock:
+        if _barramento is None:
+            if os.getenv("NOTIFICACOES_BARRAMENTO", "memoria").lower() == "postgres":
+                _barramento = BarramentoPostgres()
+                _barramento.iniciar()
+            else:
+                _barramento = BarramentoNotificacoes()
+        return _barramento
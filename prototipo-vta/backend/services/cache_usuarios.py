@@ -0,0 +1,162 @@
+import os
+import threading
+import time
+
+
+# Colunas do diretório de usuários: nunca inclui senhahash
+COLUNAS_DIRETORIO = ("idusuario", "uuid", "nome", "email", "perfil", "status", "ultimo_login")
+
+
+class CacheUsuarios:
+    """
+    Cache read-through do diretório de usuários (tela de usuários, checagem de email).
+
+    Indexado por uuid e por email normalizado, mais a listagem de ativos
+    já ordenada. Guarda só as colunas de COLUNAS_DIRETORIO: hashes de
+    senha nunca ficam em memória. As escritas do AutenticacaoServico
+    invalidam as entradas afetadas; o `ttl` limita quanto tempo um
+    processo enxerga dados alterados por outro.
+
+    Attributes:
+        ttl: Segundos até uma entrada ser considerada velha
+    """
+
+    def __init__(self, ttl: float = 60.0, relogio=time.monotonic):
+        """
+        Inicializa o cache.
+
+        Raises:
+            ValueError: Se ttl não for positivo
+        """
+        if ttl <= 0:
+            raise ValueError("ttl deve ser positivo")
+
+        self.ttl = ttl
+        self._relogio = relogio
+        self._por_uuid = {}    # uuid -> (registro, guardado_em)
+        self._por_email = {}   # email -> uuid
+        self._ativos = None    # (lista de uuids, guardado_em)
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def normalizar_email(email: str) -> str:
+        return email.strip().lower()
+
+    @staticmethod
+    def _registro(row: dict) -> dict:
+        """Copia só as colunas do diretório (descarta senhahash e afins)."""
+        registro = {coluna: row[coluna] for coluna in COLUNAS_DIRETORIO if coluna in row}
+        registro["uuid"] = str(registro["uuid"])
+        return registro
+
+    def _valido(self, guardado_em: float) -> bool:
+        return self._relogio() - guardado_em < self.ttl
+
+    def _guardar(self, registro: dict, agora: float) -> None:
+        antigo = self._por_uuid.get(registro["uuid"])
+        if antigo is not None and antigo[0]["email"] != registro["email"]:
+            self._por_email.pop(antigo[0]["email"], None)
+        self._por_uuid[registro["uuid"]] = (registro, agora)
+        self._por_email[registro["email"]] = registro["uuid"]
+
+    def guardar(self, row: dict) -> dict:
+        """
+        Guarda (ou substitui) um usuário.
+
+        Args:
+            row: Linha do banco (colunas extras são descartadas)
+
+        Returns:
+            Registro guardado
+        """
+        registro = self._registro(row)
+        with self._lock:
+            self._guardar(registro, self._relogio())
+        return registro
+
+    def por_uuid(self, uuid) -> dict | None:
+        """Registro do usuário pelo uuid, ou None se ausente/velho."""
+        with self._lock:
+            entrada = self._por_uuid.get(str(uuid))
+            if entrada is None or not self._valido(entrada[1]):
+                return None
+            return entrada[0]
+
+    def por_email(self, email: str) -> dict | None:
+        """Registro do usuário pelo email (normalizado aqui), ou None se ausente/velho."""
+        with self._lock:
+            uuid = self._por_email.get(self.normalizar_email(email))
+        return self.por_uuid(uuid) if uuid is not None else None
+
+    def ativos(self) -> list[dict] | None:
+        """Listagem de ativos (ordenada por nome), ou None se não carregada/velha."""
+        with self._lock:
+            if self._ativos is None or not self._valido(self._ativos[1]):
+                return None
+            uuids, _ = self._ativos
+            entradas = [self._por_uuid.get(uuid) for uuid in uuids]
+        if any(entrada is None for entrada in entradas):
+            return None
+        return [entrada[0] for entrada in entradas]
+
+    def guardar_ativos(self, rows) -> list[dict]:
+        """
+        Guarda a listagem de ativos (e cada usuário dela nos índices).
+
+        Args:
+            rows: Linhas do banco já ordenadas
+
+        Returns:
+            Registros guardados, na mesma ordem
+        """
+        registros = [self._registro(row) for row in rows]
+        with self._lock:
+            agora = self._relogio()
+            for registro in registros:
+                self._guardar(registro, agora)
+            self._ativos = ([r["uuid"] for r in registros], agora)
+        return registros
+
+    def invalidar(self, uuid=None, email: str | None = None) -> None:
+        """
+        Remove um usuário (por uuid e/ou email) e a listagem de ativos.
+
+        Chamado pelas escritas (criar, atualizar perfil, desativar, reativar).
+        """
+        with self._lock:
+            if email is not None:
+                uuid_email = self._por_email.pop(self.normalizar_email(email), None)
+                if uuid_email is not None:
+                    self._por_uuid.pop(uuid_email, None)
+            if uuid is not None:
+                entrada = self._por_uuid.pop(str(uuid), None)
+                if entrada is not None:
+                    self._por_email.pop(entrada[0]["email"], None)
+            self._ativos = None
+
+    def limpar(self) -> None:
+        """Esvazia o cache."""
+        with self._lock:
+            self._por_uuid.clear()
+            self._por_email.clear()
+            self._ativos = None
+
+    def __len__(self) -> int:
+        return len(self._por_uuid)
+
+
+# ============================================================================
+# CACHE DO PROCESSO
+# ============================================================================
+
+_cache = None
+_cache_lock = threading.Lock()
+
+
+def obter_cache_usuarios() -> CacheUsuarios:
+    """Retorna o cache de usuários do processo (ttl em USUARIOS_CACHE_TTL, segundos)."""
+    global _cache
+    with _cache_lock:
+        if _cache is None:
+            _cache = CacheUsuarios(ttl=float(os.getenv("USUARIOS_CACHE_TTL", "60")))
+        return _cache
@@ -0,0 +1,64 @@
+import threading
+import time
+
+
+class ContadorNaoLidas:
+    """
+    Contagem de notificações não lidas por usuário (badge do dashboard).
+
+    Carregada do banco na primeira consulta de cada usuário e mantida por
+    write-through pelo NotificacaoServico (enviar, marcar como lida,
+    excluir). Ajustes em usuários ainda não carregados são ignorados: a
+    próxima consulta conta no banco. O `ttl` limita quanto tempo um
+    processo enxerga contagens alteradas por outro.
+
+    Attributes:
+        ttl: Segundos até uma contagem ser recarregada do banco
+    """
+
+    def __init__(self, ttl: float = 30.0, relogio=time.monotonic):
+        """
+        Inicializa o contador.
+
+        Raises:
+            ValueError: Se ttl não for positivo
+        """
+        if ttl <= 0:
+            raise ValueError("ttl deve ser positivo")
+
+        self.ttl = ttl
+        self._relogio = relogio
+        self._contagens = {}  # usuario_id -> (contagem, carregada_em)
+        self._lock = threading.Lock()
+
+    def obter(self, usuario_id) -> int | None:
+        """Contagem do usuário, ou None se não carregada/velha."""
+        with self._lock:
+            entrada = self._contagens.get(str(usuario_id))
+            if entrada is None or self._relogio() - entrada[1] >= self.ttl:
+                return None
+            return entrada[0]
+
+    def definir(self, usuario_id, contagem: int) -> int:
+        """Guarda a contagem lida do banco (ou conhecida, ex.: 0 após marcar todas)."""
+        with self._lock:
+            self._contagens[str(usuario_id)] = (contagem, self._relogio())
+        return contagem
+
+    def ajustar(self, usuario_id, delta: int) -> None:
+        """Soma `delta` à contagem do usuário, se carregada (nunca abaixo de zero)."""
+        with self._lock:
+            entrada = self._contagens.get(str(usuario_id))
+            if entrada is not None:
+                self._contagens[str(usuario_id)] = (max(0, entrada[0] + delta), entrada[1])
+
+    def invalidar(self, usuario_id=None) -> None:
+        """Descarta a contagem de um usuário (ou de todos, com None)."""
+        with self._lock:
+            if usuario_id is None:
+                self._contagens.clear()
+            else:
+                self._contagens.pop(str(usuario_id), None)
+
+    def __len__(self) -> int:
+        return len(self._contagens)
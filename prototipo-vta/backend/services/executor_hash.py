@@ -0,0 +1,155 @@
+import os
+import threading
+from concurrent.futures import Future, ProcessPoolExecutor, TimeoutError as FuturoTimeoutError
+from backend.models.usuario import Usuario
+
+
+class HashSobrecarregadoErro(RuntimeError):
+    """Fila de hashing cheia ou lenta: a requisição deve ser recusada (HTTP 503) e repetida depois."""
+
+
+class ExecutorHashSenha:
+    """
+    Executa o hashing de senhas (PBKDF2, centenas de ms por chamada) em
+    um pool de processos limitado, fora da thread da requisição.
+
+    O trabalho de CPU escala entre os núcleos (sem disputar o GIL com o
+    Flask) e a fila tem profundidade máxima: quando está cheia, a chamada
+    falha na hora com HashSobrecarregadoErro em vez de empilhar logins.
+
+    Attributes:
+        max_processos: Processos de hashing (0 executa na própria thread)
+        max_fila: Máximo de hashes pendentes (em execução + aguardando)
+        timeout: Segundos aguardando o resultado de um hash
+    """
+
+    def __init__(self, max_processos: int | None = None, max_fila: int | None = None,
+                 timeout: float = 30.0):
+        """
+        Inicializa o executor.
+
+        Args:
+            max_processos: Número de processos (padrão: núcleos da máquina)
+            max_fila: Profundidade máxima da fila (padrão: 4 por processo)
+            timeout: Tempo máximo de espera por um resultado
+
+        Raises:
+            ValueError: Se os limites forem inválidos
+        """
+        if max_processos is None:
+            max_processos = os.cpu_count() or 1
+        if max_processos < 0:
+            raise ValueError("max_processos não pode ser negativo")
+        if max_fila is None:
+            max_fila = 4 * max(max_processos, 1)
+        if max_fila < 1:
+            raise ValueError("max_fila deve ser >= 1")
+
+        self.max_processos = max_processos
+        self.max_fila = max_fila
+        self.timeout = timeout
+
+        self._vagas = threading.BoundedSemaphore(max_fila)
+        self._pool = None
+        self._pool_lock = threading.Lock()
+
+    def executar(self, funcao, *args):
+        """
+        Executa uma função de hashing no pool e aguarda o resultado.
+
+        Args:
+            funcao: Função importável no nível do módulo (precisa ser picklable)
+            *args: Argumentos da função
+
+        Returns:
+            Resultado da função
+
+        Raises:
+            HashSobrecarregadoErro: Se a fila estiver cheia ou o resultado
+                não chegar dentro do timeout
+        """
+        futuro = self.submeter(funcao, *args)
+        try:
+            return futuro.result(timeout=self.timeout)
+        except FuturoTimeoutError:
+            # Ainda na fila: sai dela e devolve a vaga; em execução, termina sozinho
+            futuro.cancel()
+            raise HashSobrecarregadoErro(
+                f"Hash não concluído em {self.timeout:g}s. Tente novamente."
+            ) from None
+
+    def submeter(self, funcao, *args) -> Future:
+        """
+        Agenda uma função de hashing sem aguardar o resultado.
+
+        Raises:
+            HashSobrecarregadoErro: Se a fila estiver cheia
+        """
+        if not self._vagas.acquire(blocking=False):
+            raise HashSobrecarregadoErro(
+                f"Fila de hashing cheia ({self.max_fila} pendentes). Tente novamente."
+            )
+
+        try:
+            if self.max_processos == 0:
+                futuro = Future()
+                try:
+                    futuro.set_result(funcao(*args))
+                except Exception as e:
+                    futuro.set_exception(e)
+            else:
+                futuro = self._obter_pool().submit(funcao, *args)
+        except Exception:
+            self._vagas.release()
+            raise
+
+        futuro.add_done_callback(lambda _: self._vagas.release())
+        return futuro
+
+    def gerar_hash(self, senha: str) -> str:
+        """Gera o hash da senha (Usuario.hash_senha) fora da thread da requisição."""
+        return self.executar(Usuario.hash_senha, senha)
+
+    def validar_senha(self, senha_hash: str, senha: str) -> bool:
+        """Valida a senha (Usuario.validar_senha) fora da thread da requisição."""
+        return self.executar(Usuario.validar_senha, senha_hash, senha)
+
+    def encerrar(self) -> None:
+        """Encerra os processos do pool."""
+        with self._pool_lock:
+            if self._pool is not None:
+                self._pool.shutdown(wait=True)
+                self._pool = None
+
+    def _obter_pool(self) -> ProcessPoolExecutor:
+        # Criado sob demanda: processos só sobem no primeiro login
+        with self._pool_lock:
+            if self._pool is None:
+                self._pool = ProcessPoolExecutor(max_workers=self.max_processos)
+            return self._pool
+
+
+# ============================================================================
+# EXECUTOR DO PROCESSO
+# ============================================================================
+
+_executor = None
+_executor_lock = threading.Lock()
+
+
+def obter_executor() -> ExecutorHashSenha:
+    """
+    Retorna o executor de hashing compartilhado pelo processo.
+
+    Configurável pelas variáveis de ambiente HASH_PROCESSOS e HASH_MAX_FILA.
+    """
+    global _executor
+    with _executor_lock:
+        if _executor is None:
+            processos = os.getenv("HASH_PROCESSOS")
+            fila = os.getenv("HASH_MAX_FILA")
+            _executor = ExecutorHashSenha(
+                max_processos=int(processos) if processos else None,
+                max_fila=int(fila) if fila else None,
+            )
+        return _executor
@@ -0,0 +1,108 @@
+import heapq
+import threading
+import time
+from backend.models.notificacao import Notificacao
+
+
+class FilaUrgentes:
+    """
+    Heap por usuário das notificações urgentes não lidas (erro antes de alerta).
+
+    Carregada do banco na primeira consulta de cada usuário e mantida por
+    write-through pelo NotificacaoServico, como o ContadorNaoLidas.
+    Remoções (lida, excluída) são preguiçosas: o ID vai para um conjunto
+    de removidas e a entrada é descartada ao chegar ao topo ou quando o
+    heap é compactado.
+
+    Attributes:
+        ttl: Segundos até o heap de um usuário ser recarregado do banco
+    """
+
+    def __init__(self, ttl: float = 30.0, relogio=time.monotonic):
+        """
+        Inicializa a fila.
+
+        Raises:
+            ValueError: Se ttl não for positivo
+        """
+        if ttl <= 0:
+            raise ValueError("ttl deve ser positivo")
+
+        self.ttl = ttl
+        self._relogio = relogio
+        self._heaps = {}      # usuario_id -> (heap, removidas, carregado_em)
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _entrada(notificacao: Notificacao) -> tuple:
+        # Mais urgente primeiro; no mesmo tipo, a mais recente
+        return (
+            Notificacao.PRIORIDADE_URGENTE[notificacao.tipo],
+            -notificacao.criada_em.timestamp(),
+            notificacao.notificacao_id,
+            notificacao,
+        )
+
+    def _carregado(self, usuario_id: str):
+        estado = self._heaps.get(usuario_id)
+        if estado is None or self._relogio() - estado[2] >= self.ttl:
+            return None
+        return estado
+
+    def carregar(self, usuario_id, notificacoes) -> None:
+        """Substitui o heap do usuário pelas urgentes não lidas informadas."""
+        heap = [self._entrada(n) for n in notificacoes if n.is_urgente() and not n.lida]
+        heapq.heapify(heap)
+        with self._lock:
+            self._heaps[str(usuario_id)] = (heap, set(), self._relogio())
+
+    def adicionar(self, notificacao: Notificacao) -> None:
+        """Inclui uma urgente nova (ignorada se o usuário não estiver carregado)."""
+        if not notificacao.is_urgente() or notificacao.lida:
+            return
+        with self._lock:
+            estado = self._carregado(notificacao.usuario_id)
+            if estado is not None:
+                estado[1].discard(notificacao.notificacao_id)
+                heapq.heappush(estado[0], self._entrada(notificacao))
+
+    def remover(self, usuario_id, notificacao_id) -> None:
+        """Tira uma notificação do heap (lida ou excluída)."""
+        with self._lock:
+            estado = self._heaps.get(str(usuario_id))
+            if estado is None:
+                return
+            heap, removidas, _ = estado
+            removidas.add(str(notificacao_id))
+            if len(removidas) > len(heap) // 2:
+                heap[:] = [e for e in heap if e[2] not in removidas]
+                heapq.heapify(heap)
+                removidas.clear()
+
+    def proxima(self, usuario_id) -> Notificacao | None:
+        """Urgente mais prioritária do usuário (None se não houver ou não carregado)."""
+        with self._lock:
+            estado = self._carregado(str(usuario_id))
+            if estado is None:
+                return None
+            heap, removidas, _ = estado
+            while heap and heap[0][2] in removidas:
+                removidas.discard(heapq.heappop(heap)[2])
+            return heap[0][3] if heap else None
+
+    def listar(self, usuario_id) -> list[Notificacao] | None:
+        """Urgentes em ordem de prioridade, ou None se o usuário não estiver carregado."""
+        with self._lock:
+            estado = self._carregado(str(usuario_id))
+            if estado is None:
+                return None
+            heap, removidas, _ = estado
+            return [e[3] for e in sorted(heap) if e[2] not in removidas]
+
+    def invalidar(self, usuario_id=None) -> None:
+        """Descarta o heap de um usuário (ou de todos, com None)."""
+        with self._lock:
+            if usuario_id is None:
+                self._heaps.clear()
+            else:
+                self._heaps.pop(str(usuario_id), None)
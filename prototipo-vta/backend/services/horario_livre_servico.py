@@ -0,0 +1,223 @@
+import heapq
+import os
+from itertools import islice
+from datetime import datetime, time, timedelta, timezone
+from zoneinfo import ZoneInfo
+from backend.DB.conexao import Conexao
+
+
+def mesclar_intervalos(intervalos) -> list[tuple[datetime, datetime]]:
+    """
+    Ordena e une intervalos ocupados que se sobrepõem ou se encostam.
+
+    Args:
+        intervalos: Iterável de (inicio, fim)
+
+    Returns:
+        Lista ordenada de intervalos disjuntos
+    """
+    mesclados = []
+    for inicio, fim in sorted(intervalos):
+        if mesclados and inicio <= mesclados[-1][1]:
+            if fim > mesclados[-1][1]:
+                mesclados[-1] = (mesclados[-1][0], fim)
+        else:
+            mesclados.append((inicio, fim))
+    return mesclados
+
+
+def janelas_livres(ocupados, expediente) -> list[tuple[datetime, datetime]]:
+    """
+    Varre (sweep-line) as janelas de expediente descontando os intervalos ocupados.
+
+    Args:
+        ocupados: Intervalos ocupados já mesclados e ordenados
+        expediente: Janelas de atendimento ordenadas e disjuntas
+
+    Returns:
+        Janelas livres ordenadas
+    """
+    livres = []
+    i = 0
+    for abre, fecha in expediente:
+        cursor = abre
+        # Pula ocupações que terminaram antes desta janela
+        while i < len(ocupados) and ocupados[i][1] <= cursor:
+            i += 1
+        j = i
+        while j < len(ocupados) and ocupados[j][0] < fecha:
+            if ocupados[j][0] > cursor:
+                livres.append((cursor, ocupados[j][0]))
+            cursor = max(cursor, ocupados[j][1])
+            j += 1
+        if cursor < fecha:
+            livres.append((cursor, fecha))
+    return livres
+
+
+class HorarioLivreServico(Conexao):
+    """
+    Serviço de busca de horários livres ("próximo horário de 30 min na
+    sala de cirurgia com o Dr. X nesta semana").
+
+    Carrega de uma só vez as salas candidatas e os intervalos ocupados
+    (salas + profissional) do horizonte pedido e calcula os horários em
+    memória com varredura (sweep-line), sem consultar a disponibilidade
+    minuto a minuto.
+
+    Abertura e fechamento são horários locais da clínica (fuso configurado);
+    o horizonte pedido precisa ter fuso (datetime aware), como as colunas
+    TIMESTAMPTZ da agenda.
+
+    Attributes:
+        fuso: Fuso horário da clínica (ZoneInfo)
+    """
+
+    def __init__(self, conn_str=None, fuso: str | None = None):
+        """
+        Inicializa o serviço.
+
+        Args:
+            conn_str: String de conexão (None usa variáveis de ambiente)
+            fuso: Nome IANA do fuso da clínica (None usa CLINICA_FUSO,
+                padrão America/Sao_Paulo)
+        """
+        super().__init__(conn_str)
+        self.fuso = ZoneInfo(fuso or os.getenv("CLINICA_FUSO", "America/Sao_Paulo"))
+
+    def buscar_horarios(self, duracao: timedelta, inicio: datetime, fim: datetime,
+                        tipo_sala: str = None, profissional_id: str = None,
+                        abertura: time = time(8, 0), fechamento: time = time(18, 0),
+                        dias_semana: frozenset = frozenset(range(6)),
+                        passo: timedelta = timedelta(minutes=15),
+                        quantidade: int = 5) -> list[dict]:
+        """
+        Retorna os primeiros horários livres dentro do horizonte.
+
+        Args:
+            duracao: Duração do atendimento
+            inicio: Início do horizonte de busca (com fuso)
+            fim: Fim do horizonte de busca (com fuso)
+            tipo_sala: Tipo de sala (Sala.tipo); None aceita qualquer sala ativa
+            profissional_id: Profissional que também precisa estar livre (opcional)
+            abertura: Horário de abertura da clínica (hora local)
+            fechamento: Horário de fechamento da clínica (hora local)
+            dias_semana: Dias de atendimento (0=segunda ... 6=domingo)
+            passo: Granularidade dos horários oferecidos (ex.: 15 em 15 min)
+            quantidade: Número máximo de horários retornados
+
+        Returns:
+            Lista de {"sala_id", "sala", "inicio", "fim"} em ordem cronológica,
+            com horários no fuso da clínica
+
+        Raises:
+            ValueError: Se parâmetros forem inválidos (inclusive inicio/fim sem fuso)
+        """
+        if inicio.utcoffset() is None or fim.utcoffset() is None:
+            raise ValueError("inicio e fim devem ter fuso horário (datetime aware)")
+        if duracao <= timedelta(0) or passo <= timedelta(0):
+            raise ValueError("Duração e passo devem ser positivos")
+        if inicio >= fim:
+            raise ValueError("O início do horizonte deve ser anterior ao fim")
+        if abertura >= fechamento:
+            raise ValueError("Abertura deve ser anterior ao fechamento")
+        if quantidade < 1:
+            return []
+
+        salas, ocupados_sala, ocupados_profissional = self._carregar_ocupacao(
+            inicio, fim, tipo_sala, profissional_id
+        )
+
+        expediente = self._janelas_expediente(inicio, fim, abertura, fechamento, dias_semana, self.fuso)
+
+        # Um gerador ordenado de horários por sala; o heap entrega os mais cedo primeiro
+        geradores = []
+        for sala_id, nome in salas:
+            ocupados = mesclar_intervalos(ocupados_sala.get(sala_id, []) + ocupados_profissional)
+            livres = janelas_livres(ocupados, expediente)
+            geradores.append(self._horarios(livres, duracao, passo, sala_id, nome, self.fuso))
+
+        return [
+            {"sala_id": sala_id, "sala": nome, "inicio": slot_inicio, "fim": slot_fim}
+            for slot_inicio, nome, sala_id, slot_fim in islice(heapq.merge(*geradores), quantidade)
+        ]
+
+    def _carregar_ocupacao(self, inicio, fim, tipo_sala, profissional_id):
+        """Carrega salas candidatas e intervalos ocupados em uma conexão."""
+        filtro_tipo = "AND s.tipo = %(tipo)s" if tipo_sala is not None else ""
+        parametros = {
+            "inicio": inicio,
+            "fim": fim,
+            "tipo": tipo_sala,
+            "profissional": profissional_id,
+        }
+
+        with self._get_conn() as conn, conn.cursor() as cur:
+            cur.execute(f"""
+                SELECT s.uuid AS sala_id, s.nome, a.inicio, a.fim
+                FROM sala s
+                LEFT JOIN agendamento a
+                  ON a.fk_sala_uuid = s.uuid
+                 AND a.status != 'CANCELADO'
+                 AND a.inicio < %(fim)s
+                 AND a.fim > %(inicio)s
+                WHERE s.ativa = TRUE
+                  {filtro_tipo}
+                ORDER BY s.nome;
+            """, parametros)
+
+            salas = {}
+            ocupados_sala = {}
+            for row in cur.fetchall():
+                salas.setdefault(row["sala_id"], row["nome"])
+                if row["inicio"] is not None:
+                    ocupados_sala.setdefault(row["sala_id"], []).append((row["inicio"], row["fim"]))
+
+            ocupados_profissional = []
+            if profissional_id is not None:
+                cur.execute("""
+                    SELECT inicio, fim
+                    FROM agendamento
+                    WHERE profissional = %(profissional)s
+                      AND status != 'CANCELADO'
+                      AND inicio < %(fim)s
+                      AND fim > %(inicio)s;
+                """, parametros)
+                ocupados_profissional = [(row["inicio"], row["fim"]) for row in cur.fetchall()]
+
+        return list(salas.items()), ocupados_sala, ocupados_profissional
+
+    @staticmethod
+    def _janelas_expediente(inicio, fim, abertura, fechamento, dias_semana, fuso):
+        """
+        Gera as janelas de atendimento de cada dia do horizonte, em UTC.
+
+        Dias, abertura e fechamento são os do calendário local da clínica;
+        a conversão para UTC só acontece depois de montar cada janela.
+        """
+        janelas = []
+        dia = inicio.astimezone(fuso).date()
+        ultimo_dia = fim.astimezone(fuso).date()
+        while dia <= ultimo_dia:
+            if dia.weekday() in dias_semana:
+                abre = max(datetime.combine(dia, abertura, tzinfo=fuso).astimezone(timezone.utc), inicio)
+                fecha = min(datetime.combine(dia, fechamento, tzinfo=fuso).astimezone(timezone.utc), fim)
+                if abre < fecha:
+                    janelas.append((abre, fecha))
+            dia += timedelta(days=1)
+        return janelas
+
+    @staticmethod
+    def _horarios(livres, duracao, passo, sala_id, nome, fuso):
+        """Gera (inicio, nome, sala_id, fim) alinhados ao passo dentro das janelas livres."""
+        for janela_inicio, janela_fim in livres:
+            # Alinha ao passo contado a partir da meia-noite local (ex.: 09:07 -> 09:15)
+            local = janela_inicio.astimezone(fuso)
+            meia_noite = local.replace(hour=0, minute=0, second=0, microsecond=0)
+            atual = meia_noite + -((meia_noite - local) // passo) * passo
+            # Soma em UTC: passos exatos mesmo em dia de horário de verão
+            atual = atual.astimezone(timezone.utc)
+            while atual + duracao <= janela_fim:
+                yield atual.astimezone(fuso), nome, sala_id, (atual + duracao).astimezone(fuso)
+                atual += passo
+
@@ -0,0 +1,465 @@
+import os
+import re
+import threading
+import unicodedata
+from bisect import bisect_left
+from collections import Counter
+from heapq import nsmallest
+from itertools import chain, islice
+from backend.DB.conexao import Conexao
+from backend.services.tarefa_periodica import TarefaPeriodica
+
+
+_ESPACOS = re.compile(r"[^0-9a-z@.]+")
+_NAO_DIGITOS = re.compile(r"\D+")
+
+
+def normalizar_texto(texto) -> str:
+    """
+    Normaliza para busca: sem acentos, minúsculas, só letras/dígitos/@/. e espaços simples.
+
+    Example:
+        >>> normalizar_texto("  João  da Silva ")
+        'joao da silva'
+    """
+    if not texto:
+        return ""
+    sem_acentos = "".join(
+        c for c in unicodedata.normalize("NFKD", str(texto)) if not unicodedata.combining(c)
+    )
+    return _ESPACOS.sub(" ", sem_acentos.lower()).strip()
+
+
+def normalizar_telefone(telefone) -> str:
+    """Só os dígitos do telefone ("(11) 98765-4321" -> "11987654321")."""
+    return _NAO_DIGITOS.sub("", str(telefone)) if telefone else ""
+
+
+def trigramas(texto: str) -> set[str]:
+    """
+    Trigramas de um texto já normalizado, com o mesmo preenchimento do
+    pg_trgm: cada palavra vira "  palavra " antes de ser fatiada.
+    """
+    resultado = set()
+    for palavra in texto.split():
+        preenchida = f"  {palavra} "
+        resultado.update(preenchida[i:i + 3] for i in range(len(preenchida) - 2))
+    return resultado
+
+
+def trigramas_de_inicio(texto: str) -> set[str]:
+    """
+    Trigrama de início de cada palavra ("ana souza" -> " an", " so"; "a" -> "  a").
+
+    Um campo com palavras começadas como as da consulta contém todos eles.
+    """
+    return {f"  {palavra}"[1:4] if len(palavra) > 1 else f"  {palavra}" for palavra in texto.split()}
+
+
+def trigramas_internos(texto: str) -> set[str]:
+    """
+    Trigramas sem preenchimento (só os de dentro das palavras).
+
+    Usados na consulta: se ela é um pedaço do campo ("bor" em "boris",
+    "98765" no telefone), todos os seus trigramas internos estão no campo.
+    Palavras com menos de 3 letras usam os trigramas de início de palavra
+    ("jo" -> "  j", " jo"), que casam com qualquer palavra começada por elas.
+    """
+    resultado = set()
+    for palavra in texto.split():
+        fatiada = palavra if len(palavra) >= 3 else f"  {palavra}"
+        resultado.update(fatiada[i:i + 3] for i in range(len(fatiada) - 2))
+    return resultado
+
+
+class IndiceBusca:
+    """
+    Índice de trigramas em memória para busca aproximada (typeahead).
+
+    Cada documento (um cliente ou um pet) tem campos de texto; as listas
+    invertidas guardam, por trigrama e por tipo, as posições dos documentos
+    que o contêm em algum campo (uma busca filtrada por tipo só percorre as
+    listas desse tipo). Os documentos guardam só o texto normalizado
+    (os trigramas de cada campo são recalculados na pontuação), o que
+    mantém o índice na casa das dezenas de MB com centenas de milhares de
+    registros. Uma busca conta os trigramas da consulta compartilhados por
+    documento (candidatos) e só calcula a pontuação exata dos melhores; no
+    empate da última vaga ficam os que também têm palavras começando como
+    as da consulta (senão "Ana Souza" perde a vaga para centenas de
+    "Adriana Souza" indexadas antes).
+
+    Pontuação de um campo (0 a 1,2): 0,7 x fração dos trigramas da
+    consulta presentes no campo + 0,3 x similaridade de Jaccard (como a
+    similarity() do pg_trgm) + 0,2 se alguma palavra do campo começar pela
+    consulta. O documento vale o seu melhor campo.
+
+    Remoções marcam o documento como removido; as listas são compactadas
+    quando os removidos passam de um quarto do total.
+
+    Attributes:
+        limiar: Pontuação mínima para um resultado aparecer
+    """
+
+    # Máximo de candidatos pontuados por busca (multiplicado pelo limite pedido)
+    CANDIDATOS_POR_RESULTADO = 10
+
+    # Entradas de listas percorridas por busca: os trigramas mais comuns
+    # (listas maiores) ficam de fora quando o total passa disso, e uma
+    # consulta de um trigrama só (ex.: uma letra) olha só o início da lista
+    LIMITE_VARREDURA = 30_000
+
+    def __init__(self, limiar: float = 0.3):
+        self.limiar = limiar
+        self._documentos = []     # posição -> (tipo, chave, campos, dados) ou None se removido
+        self._posicao = {}        # (tipo, chave) -> posição
+        self._listas = {}         # trigrama -> {tipo: [posições crescentes]}
+        self._removidos = 0
+        self._lock = threading.RLock()
+
+    def __len__(self) -> int:
+        return len(self._posicao)
+
+    def adicionar(self, tipo: str, chave, campos: dict, dados: dict | None = None) -> None:
+        """
+        Indexa (ou reindexa) um documento.
+
+        Args:
+            tipo: Tipo do documento ("cliente", "pet")
+            chave: ID do documento dentro do tipo
+            campos: nome do campo -> texto já normalizado (vazios são ignorados)
+            dados: Dados devolvidos nos resultados (ex.: nome original)
+        """
+        campos = {nome: texto for nome, texto in campos.items() if texto}
+        with self._lock:
+            self._remover((tipo, str(chave)))
+            self._incluir((tipo, str(chave), campos, dados or {}))
+            self._talvez_compactar()
+
+    def remover(self, tipo: str, chave) -> bool:
+        """Tira um documento do índice; False se não estava indexado."""
+        with self._lock:
+            removido = self._remover((tipo, str(chave)))
+            self._talvez_compactar()
+            return removido
+
+    def _incluir(self, documento: tuple) -> None:
+        tipo, chave, campos, _ = documento
+        posicao = len(self._documentos)
+        self._documentos.append(documento)
+        self._posicao[(tipo, chave)] = posicao
+        todos = set()
+        for texto in campos.values():
+            todos |= trigramas(texto)
+        for trigrama in todos:
+            self._listas.setdefault(trigrama, {}).setdefault(tipo, []).append(posicao)
+
+    def _remover(self, identificador) -> bool:
+        posicao = self._posicao.pop(identificador, None)
+        if posicao is None:
+            return False
+        self._documentos[posicao] = None
+        self._removidos += 1
+        return True
+
+    def _talvez_compactar(self) -> None:
+        """Refaz as listas sem os removidos quando eles passam de um quarto do total."""
+        if self._removidos <= max(1000, len(self._documentos) // 4):
+            return
+        documentos = [d for d in self._documentos if d is not None]
+        self._documentos, self._posicao, self._listas, self._removidos = [], {}, {}, 0
+        for documento in documentos:
+            self._incluir(documento)
+
+    def buscar(self, consulta: str, limite: int = 10, tipos=None) -> list[dict]:
+        """
+        Busca aproximada, sem diferenciar acentos e maiúsculas.
+
+        Args:
+            consulta: Texto digitado (normalizado aqui)
+            limite: Máximo de resultados
+            tipos: Restringe aos tipos informados (None busca em todos)
+
+        Returns:
+            Lista de {"tipo", "id", "campo", "pontuacao", "dados"}, melhores primeiro
+        """
+        texto = normalizar_texto(consulta)
+        if not texto:
+            return []
+        digitos = normalizar_telefone(consulta)
+
+        consultas = [(texto, trigramas_internos(texto), trigramas(texto))]
+        if len(digitos) >= 3 and digitos != texto.replace(" ", ""):
+            consultas.append((digitos, trigramas_internos(digitos), trigramas(digitos)))
+
+        with self._lock:
+            candidatos = Counter()
+            varridas = 0
+            for _, internos, _ in consultas:
+                # Só as listas dos tipos pedidos: o corte de candidatos e o
+                # limite de varredura valem só para documentos que podem sair
+                grupos = [self._listas_do_trigrama(t, tipos) for t in internos]
+                # Listas menores primeiro: trigramas raros discriminam mais
+                for i, (tamanho, listas) in enumerate(sorted(grupos, key=lambda g: g[0])):
+                    posicoes = chain.from_iterable(listas)
+                    if varridas + tamanho > self.LIMITE_VARREDURA:
+                        if i:
+                            break
+                        posicoes = islice(posicoes, self.LIMITE_VARREDURA)
+                        tamanho = self.LIMITE_VARREDURA
+                    candidatos.update(posicoes)
+                    varridas += tamanho
+
+            resultados = []
+            for posicao in self._melhores_candidatos(
+                candidatos, limite * self.CANDIDATOS_POR_RESULTADO, consultas, tipos
+            ):
+                documento = self._documentos[posicao]
+                if documento is None:
+                    continue
+                tipo, chave, campos, dados = documento
+                campo, pontuacao = self._pontuar(consultas, campos)
+                if pontuacao >= self.limiar:
+                    resultados.append({
+                        "tipo": tipo, "id": chave, "campo": campo,
+                        "pontuacao": round(pontuacao, 3), "dados": dados,
+                    })
+
+        resultados.sort(key=lambda r: (-r["pontuacao"], r["id"]))
+        return resultados[:limite]
+
+    def _melhores_candidatos(self, candidatos: Counter, quantidade: int, consultas, tipos) -> list[int]:
+        """
+        Posições dos `quantidade` candidatos com mais trigramas em comum.
+
+        No grupo empatado na última vaga, passam na frente os documentos
+        com palavras começando como as da consulta: o grupo é filtrado
+        pelas listas dos trigramas de início de palavra (da mais curta à
+        mais longa; uma lista que esvaziaria o grupo é ignorada). As listas
+        são crescentes: com o grupo pequeno perto da lista, cada posição é
+        procurada por bisseção em vez de percorrer a lista inteira.
+        """
+        if len(candidatos) <= quantidade:
+            return list(candidatos)
+
+        # Contagem da última vaga: percorre o histograma das contagens
+        vagas = quantidade
+        for corte, total in sorted(Counter(candidatos.values()).items(), reverse=True):
+            if total >= vagas:
+                break
+            vagas -= total
+        acima = [posicao for posicao, n in candidatos.items() if n > corte]
+        empatados = {posicao for posicao, n in candidatos.items() if n == corte}
+
+        # Os de internos não desempatam: todo empatado já os tem
+        inicios = set()
+        for texto, internos, _ in consultas:
+            inicios |= trigramas_de_inicio(texto) - internos
+        grupos = sorted(
+            (self._listas_do_trigrama(trigrama, tipos) for trigrama in inicios), key=lambda g: g[0]
+        )
+
+        preferidos = empatados
+        for _, listas in grupos:
+            filtrado = set()
+            for lista in listas:
+                if len(lista) < 20 * len(preferidos):
+                    filtrado |= preferidos.intersection(lista)
+                    continue
+                for posicao in preferidos:
+                    i = bisect_left(lista, posicao)
+                    if i < len(lista) and lista[i] == posicao:
+                        filtrado.add(posicao)
+            if filtrado:
+                preferidos = filtrado
+
+        # Posições menores foram indexadas antes: ordem estável entre buscas
+        escolhidos = nsmallest(vagas, preferidos)
+        if len(escolhidos) < vagas:
+            escolhidos += nsmallest(vagas - len(escolhidos), empatados - preferidos)
+        return acima + escolhidos
+
+    def _listas_do_trigrama(self, trigrama: str, tipos) -> tuple[int, list]:
+        """(total de posições, listas) do trigrama, só dos tipos pedidos (None: todos)."""
+        por_tipo = self._listas.get(trigrama, {})
+        listas = [lista for tipo, lista in por_tipo.items() if tipos is None or tipo in tipos]
+        return sum(map(len, listas)), listas
+
+    @staticmethod
+    def _pontuar(consultas, campos: dict) -> tuple[str | None, float]:
+        melhor_campo, melhor = None, 0.0
+        for nome, texto_campo in campos.items():
+            tri_campo = trigramas(texto_campo)
+            for texto, internos, completos in consultas:
+                if not internos:
+                    continue
+                cobertura = len(internos & tri_campo) / len(internos)
+                jaccard = len(completos & tri_campo) / len(completos | tri_campo)
+                pontuacao = 0.7 * cobertura + 0.3 * jaccard
+                if any(palavra.startswith(texto) for palavra in texto_campo.split()) \
+                        or texto_campo.startswith(texto):
+                    pontuacao += 0.2
+                if pontuacao > melhor:
+                    melhor_campo, melhor = nome, pontuacao
+        return melhor_campo, melhor
+
+
+def documento_cliente(cliente_id, nome, telefone=None, email=None) -> tuple:
+    """Campos e dados indexados de um cliente (para IndiceBusca.adicionar)."""
+    campos = {
+        "nome": normalizar_texto(nome),
+        "telefone": normalizar_telefone(telefone),
+        "email": normalizar_texto(email),
+    }
+    return "cliente", cliente_id, campos, {"nome": nome, "telefone": telefone, "email": email}
+
+
+def documento_pet(pet) -> tuple:
+    """Campos e dados indexados de um pet (para IndiceBusca.adicionar)."""
+    campos = {"nome": normalizar_texto(pet.nome)}
+    dados = {"nome": pet.nome, "especie": pet.especie, "cliente_id": pet.cliente_id}
+    return "pet", pet.pet_id, campos, dados
+
+
+class CarregadorBusca(Conexao):
+    """
+    Monta o IndiceBusca a partir das tabelas cliente e pet.
+
+    As linhas são lidas com cursor nomeado (server-side), em blocos, para
+    não trazer centenas de milhares de linhas de uma vez para a memória.
+    """
+
+    TAMANHO_BLOCO = 5000
+
+    def carregar(self, limiar: float = 0.3) -> IndiceBusca:
+        """
+        Lê clientes e pets e devolve um índice novo (o atual segue atendendo).
+
+        Returns:
+            Índice carregado
+        """
+        indice = IndiceBusca(limiar=limiar)
+        consultas = (
+            ("clientes", "SELECT uuid, nome, telefone, email FROM cliente WHERE ativo;",
+             lambda row: documento_cliente(row["uuid"], row["nome"], row["telefone"], row["email"])),
+            ("pets", "SELECT uuid, cliente_id, nome, especie FROM pet;",
+             lambda row: ("pet", row["uuid"], {"nome": normalizar_texto(row["nome"])},
+                          {"nome": row["nome"], "especie": row["especie"], "cliente_id": row["cliente_id"]})),
+        )
+
+        with self._get_conn() as conn:
+            for nome, sql, documento in consultas:
+                with conn.cursor(name=f"busca_{nome}") as cur:
+                    cur.itersize = self.TAMANHO_BLOCO
+                    cur.execute(sql)
+                    for row in cur:
+                        indice.adicionar(*documento(row))
+            conn.commit()
+
+        print(f"Índice de busca carregado: {len(indice)} registro(s).")
+        return indice
+
+
+class BuscaPostgres(Conexao):
+    """
+    Busca direto no banco com pg_trgm (migração 012), sem índice em memória.
+
+    Alternativa para quando a memória do worker é curta; usa o operador
+    <% (word_similarity) sobre vta_normalizar(), atendido pelos índices GIN.
+    """
+
+    def buscar(self, consulta: str, limite: int = 10) -> list[dict]:
+        """
+        Busca clientes (nome, telefone, email) e pets (nome) parecidos com a consulta.
+
+        O telefone é comparado só pelos dígitos da consulta (com 3 ou mais),
+        na mesma expressão do índice cliente_telefone_trgm_idx.
+
+        Returns:
+            Lista de {"tipo", "id", "campo", "pontuacao", "dados"}, melhores primeiro
+        """
+        texto = normalizar_texto(consulta)
+        if not texto:
+            return []
+        digitos = normalizar_telefone(consulta)
+        if len(digitos) < 3:
+            digitos = None
+
+        with self._get_conn() as conn, conn.cursor() as cur:
+            cur.execute(r"""
+                SELECT * FROM (
+                    SELECT 'cliente' AS tipo, uuid AS id, nome,
+                           greatest(word_similarity(%(q)s, vta_normalizar(nome)),
+                                    word_similarity(%(q)s, vta_normalizar(email)),
+                                    word_similarity(%(d)s, regexp_replace(telefone, '\D', '', 'g'))) AS pontuacao
+                    FROM cliente
+                    WHERE ativo AND (%(q)s <%% vta_normalizar(nome) OR %(q)s <%% vta_normalizar(email)
+                                     OR %(d)s <%% regexp_replace(telefone, '\D', '', 'g'))
+                    UNION ALL
+                    SELECT 'pet', uuid, nome, word_similarity(%(q)s, vta_normalizar(nome))
+                    FROM pet
+                    WHERE %(q)s <%% vta_normalizar(nome)
+                ) AS encontrados
+                ORDER BY pontuacao DESC, id
+                LIMIT %(limite)s;
+            """, {"q": texto, "d": digitos, "limite": limite})
+            rows = cur.fetchall()
+
+        return [
+            {"tipo": row["tipo"], "id": row["id"], "campo": None,
+             "pontuacao": float(row["pontuacao"]), "dados": {"nome": row["nome"]}}
+            for row in rows
+        ]
+
+
+# ============================================================================
+# ÍNDICE DO PROCESSO
+# ============================================================================
+
+_indice = None
+_recarga = None
+_indice_lock = threading.Lock()
+
+
+# Com a recarga desligada, segundos entre tentativas até a primeira carga dar certo
+INTERVALO_NOVA_TENTATIVA = 60.0
+
+
+def _recarregar() -> None:
+    global _indice
+    _indice = CarregadorBusca().carregar()
+
+
+def _carregar_se_vazio() -> None:
+    if _indice is None:
+        _recarregar()
+
+
+def iniciar_indice_busca() -> TarefaPeriodica:
+    """
+    Carrega o índice de busca em segundo plano (chamar na subida do app).
+
+    A carga roda na thread da tarefa, sem prender requisições; até ela
+    terminar, obter_indice_busca() devolve None. Com BUSCA_RECARGA > 0
+    (segundos, padrão 300) o índice é refeito nesse intervalo e a troca é
+    atômica; uma carga que falha é registrada e repetida na rodada seguinte.
+    Com BUSCA_RECARGA = 0 o índice não é refeito: só a primeira carga é
+    tentada de novo (a cada INTERVALO_NOVA_TENTATIVA) até dar certo.
+
+    Returns:
+        A tarefa iniciada (a mesma em chamadas repetidas)
+    """
+    global _recarga
+    with _indice_lock:
+        if _recarga is None:
+            intervalo = float(os.getenv("BUSCA_RECARGA", "300"))
+            funcao = _recarregar
+            if intervalo <= 0:
+                funcao, intervalo = _carregar_se_vazio, INTERVALO_NOVA_TENTATIVA
+            _recarga = TarefaPeriodica("recarga-indice-busca", funcao, intervalo, imediata=True)
+            _recarga.iniciar()
+        return _recarga
+
+
+def obter_indice_busca() -> IndiceBusca | None:
+    """Retorna o índice de busca do processo, ou None enquanto a primeira carga não termina."""
+    return _indice
@@ -0,0 +1,234 @@
+from bisect import bisect_left, bisect_right, insort
+from datetime import timedelta
+
+
+def _campo(reserva, *nomes):
+    """Lê o primeiro campo existente de uma reserva (dict do RealDictCursor ou objeto)."""
+    for nome in nomes:
+        if isinstance(reserva, dict):
+            if reserva.get(nome) is not None:
+                return reserva[nome]
+        elif getattr(reserva, nome, None) is not None:
+            return getattr(reserva, nome)
+    return None
+
+
+class IndiceOcupacao:
+    """
+    Índice em memória da ocupação das salas (array ordenado por sala).
+
+    Cada sala guarda seus agendamentos ordenados por início, junto com a
+    maior duração já indexada. Assim "a sala está ocupada em t?" só
+    precisa olhar os agendamentos que começam em [t - maior_duracao, t],
+    localizados por busca binária: O(log n + k), com k = agendamentos
+    que começam nessa janela (na prática 0 ou 1, já que uma sala não tem
+    reservas sobrepostas).
+
+    Aceita tanto objetos Agendamento (sala_id, id) quanto linhas do banco
+    (dicts com fk_sala_uuid, uuid). Agendamentos cancelados são ignorados.
+
+    Semântica:
+        - ocupada_em(t): intervalo fechado, inicio <= t <= fim (igual a Sala.statusEm)
+        - salas_livres(a, b): sobreposição com o período semiaberto [a, b)
+    """
+
+    CAMPOS_SALA = ("sala_id", "fk_sala_uuid")
+    CAMPOS_ID = ("id", "uuid", "agendamento_id")
+
+    def __init__(self, agendamentos=None):
+        """
+        Inicializa o índice.
+
+        Args:
+            agendamentos: Agendamentos iniciais (carregados em lote)
+        """
+        # sala_id -> lista ordenada de (inicio, fim, agendamento_id)
+        self._por_sala: dict = {}
+        # sala_id -> maior duração indexada (nunca diminui; mantém a busca correta)
+        self._maior_duracao: dict = {}
+        # agendamento_id -> (sala_id, entrada) para remoção/atualização
+        self._entradas: dict = {}
+
+        if agendamentos:
+            self.carregar(agendamentos)
+
+    def __len__(self) -> int:
+        return len(self._entradas)
+
+    def __contains__(self, agendamento_id) -> bool:
+        return str(agendamento_id) in self._entradas
+
+    # Construção e atualização
+
+    def carregar(self, agendamentos) -> int:
+        """
+        Adiciona agendamentos em lote (uma ordenação por sala no final).
+
+        Args:
+            agendamentos: Iterável de dicts ou objetos com inicio/fim/sala
+
+        Returns:
+            Número de agendamentos indexados
+        """
+        salas_alteradas = set()
+        total = 0
+        for agendamento in agendamentos:
+            entrada = self._extrair(agendamento)
+            if entrada is None:
+                continue
+            sala_id, item = entrada
+            self._descartar(item[2])
+            self._por_sala.setdefault(sala_id, []).append(item)
+            self._registrar(sala_id, item)
+            salas_alteradas.add(sala_id)
+            total += 1
+
+        for sala_id in salas_alteradas:
+            self._por_sala[sala_id].sort()
+        return total
+
+    def adicionar(self, agendamento) -> bool:
+        """
+        Indexa (ou reindexa) um agendamento criado/alterado.
+
+        Args:
+            agendamento: Dict ou objeto com inicio/fim/sala
+
+        Returns:
+            True se indexado, False se ignorado (cancelado ou incompleto)
+        """
+        entrada = self._extrair(agendamento)
+        agendamento_id = _campo(agendamento, *self.CAMPOS_ID)
+        if entrada is None:
+            # Ex.: agendamento que passou a CANCELADO deixa de ocupar a sala
+            if agendamento_id is not None:
+                self.remover(agendamento_id)
+            return False
+
+        sala_id, item = entrada
+        self._descartar(item[2])
+        insort(self._por_sala.setdefault(sala_id, []), item)
+        self._registrar(sala_id, item)
+        return True
+
+    def remover(self, agendamento_id) -> bool:
+        """
+        Remove um agendamento do índice (ex.: cancelamento).
+
+        Args:
+            agendamento_id: ID do agendamento
+
+        Returns:
+            True se removido, False se não estava indexado
+        """
+        return self._descartar(str(agendamento_id))
+
+    # Consultas
+
+    def ocupada_em(self, sala_id, dataHora) -> bool:
+        """
+        Verifica se a sala tem agendamento em um instante.
+
+        Args:
+            sala_id: ID da sala
+            dataHora: Instante a verificar
+
+        Returns:
+            True se algum agendamento cobre inicio <= dataHora <= fim
+        """
+        itens = self._por_sala.get(str(sala_id))
+        if not itens:
+            return False
+
+        limite = bisect_right(itens, (dataHora, _MAXIMO))
+        desde = bisect_left(itens, (dataHora - self._maior_duracao[str(sala_id)],))
+        return any(fim >= dataHora for _, fim, _ in itens[desde:limite])
+
+    def ocupada_entre(self, sala_id, inicio, fim) -> bool:
+        """
+        Verifica se a sala tem agendamento sobrepondo o período [inicio, fim).
+
+        Args:
+            sala_id: ID da sala
+            inicio: Início do período
+            fim: Fim do período (exclusivo)
+
+        Returns:
+            True se algum agendamento tem a.inicio < fim e a.fim > inicio
+        """
+        itens = self._por_sala.get(str(sala_id))
+        if not itens:
+            return False
+
+        limite = bisect_left(itens, (fim,))
+        desde = bisect_right(itens, (inicio - self._maior_duracao[str(sala_id)], _MAXIMO))
+        return any(a_fim > inicio for _, a_fim, _ in itens[desde:limite])
+
+    def salas_livres(self, sala_ids, inicio, fim) -> list:
+        """
+        Filtra as salas sem agendamento no período [inicio, fim).
+
+        Args:
+            sala_ids: IDs das salas candidatas (ex.: salas ativas)
+            inicio: Início do período
+            fim: Fim do período (exclusivo)
+
+        Returns:
+            IDs livres, na mesma ordem recebida
+        """
+        return [s for s in sala_ids if not self.ocupada_entre(s, inicio, fim)]
+
+    def reservas_da_sala(self, sala_id) -> list:
+        """Retorna os intervalos (inicio, fim, agendamento_id) da sala, ordenados."""
+        return list(self._por_sala.get(str(sala_id), []))
+
+    # Métodos auxiliares
+
+    def _extrair(self, agendamento):
+        """Normaliza um agendamento em (sala_id, (inicio, fim, id)) ou None se ignorado."""
+        status = _campo(agendamento, "status")
+        if status is not None and str(getattr(status, "value", status)).upper() == "CANCELADO":
+            return None
+
+        sala_id = _campo(agendamento, *self.CAMPOS_SALA)
+        inicio = _campo(agendamento, "inicio")
+        fim = _campo(agendamento, "fim")
+        if sala_id is None or inicio is None or fim is None:
+            return None
+
+        agendamento_id = _campo(agendamento, *self.CAMPOS_ID)
+        if agendamento_id is None:
+            # Sem ID não há como remover depois; usa identidade do objeto
+            agendamento_id = f"anonimo-{id(agendamento)}"
+        return str(sala_id), (inicio, fim, str(agendamento_id))
+
+    def _registrar(self, sala_id: str, item: tuple) -> None:
+        inicio, fim, agendamento_id = item
+        duracao = fim - inicio
+        if duracao > self._maior_duracao.get(sala_id, timedelta(0)):
+            self._maior_duracao[sala_id] = duracao
+        self._entradas[agendamento_id] = (sala_id, item)
+
+    def _descartar(self, agendamento_id: str) -> bool:
+        registro = self._entradas.pop(agendamento_id, None)
+        if registro is None:
+            return False
+        sala_id, item = registro
+        itens = self._por_sala[sala_id]
+        pos = bisect_left(itens, item)
+        if pos < len(itens) and itens[pos] == item:
+            itens.pop(pos)
+        return True
+
+
+class _Maximo:
+    """Sentinela que compara maior que qualquer valor (fecha tuplas nas buscas binárias)."""
+
+    def __lt__(self, other):
+        return False
+
+    def __gt__(self, other):
+        return True
+
+
+_MAXIMO = _Maximo()
@@ -0,0 +1,235 @@
+import math
+import os
+import threading
+import time
+from backend.DB.conexao import Conexao
+
+
+class LoginBloqueadoErro(RuntimeError):
+    """
+    Tentativas de login acima do limite: a rota deve responder HTTP 429.
+
+    Attributes:
+        retry_after: Segundos até a próxima tentativa ser aceita
+    """
+
+    def __init__(self, retry_after: float):
+        self.retry_after = max(1, math.ceil(retry_after))
+        super().__init__(
+            f"Muitas tentativas de login. Tente novamente em {self.retry_after} segundos."
+        )
+
+
+class BaldeMemoria:
+    """
+    Token bucket em memória, por chave.
+
+    Cada chave tem até `capacidade` fichas, repostas continuamente ao
+    longo da janela (capacidade / janela fichas por segundo), o que
+    aproxima uma janela deslizante sem guardar o horário de cada tentativa.
+    Tentativas recusadas não consomem fichas.
+
+    Attributes:
+        max_chaves: Máximo de chaves mantidas (as mais antigas são descartadas)
+    """
+
+    def __init__(self, max_chaves: int = 100_000, relogio=time.monotonic):
+        self.max_chaves = max_chaves
+        self._relogio = relogio
+        self._baldes = {}  # chave -> [fichas, atualizado_em]
+        self._lock = threading.Lock()
+
+    def consumir(self, chave: str, capacidade: int, janela: float) -> float:
+        """
+        Consome uma ficha da chave.
+
+        Args:
+            chave: Chave do limite (ex.: "email:joao@example.com")
+            capacidade: Tentativas permitidas por janela
+            janela: Duração da janela em segundos
+
+        Returns:
+            0.0 se a tentativa foi aceita; senão, segundos até a próxima ficha
+        """
+        taxa = capacidade / janela
+        agora = self._relogio()
+
+        with self._lock:
+            balde = self._baldes.pop(chave, None)
+            if balde is None:
+                fichas = float(capacidade)
+            else:
+                fichas = min(capacidade, balde[0] + (agora - balde[1]) * taxa)
+
+            if fichas >= 1:
+                fichas -= 1
+                espera = 0.0
+            else:
+                espera = (1 - fichas) / taxa
+
+            # Reinsere no fim: o dict fica em ordem de uso (mais antigas no início)
+            self._baldes[chave] = [fichas, agora]
+            while len(self._baldes) > self.max_chaves:
+                del self._baldes[next(iter(self._baldes))]
+
+        return espera
+
+    def limpar(self, chave: str) -> None:
+        """Remove a chave (limite volta à capacidade cheia)."""
+        with self._lock:
+            self._baldes.pop(chave, None)
+
+
+class BaldePostgres(Conexao):
+    """
+    Token bucket compartilhado entre processos/servidores (tabela limite_login).
+
+    Cada consumo é um único UPSERT atômico. Tentativas recusadas deixam o
+    saldo negativo (no máximo uma ficha), o que penaliza quem insiste
+    durante o bloqueio.
+    """
+
+    def consumir(self, chave: str, capacidade: int, janela: float) -> float:
+        """Mesma interface de BaldeMemoria.consumir."""
+        taxa = capacidade / janela
+
+        with self._get_conn() as conn, conn.cursor() as cur:
+            cur.execute("""
+                INSERT INTO limite_login (chave, fichas, atualizado_em)
+                VALUES (%(chave)s, %(capacidade)s - 1, now())
+                ON CONFLICT (chave) DO UPDATE SET
+                    fichas = GREATEST(-1, LEAST(
+                        %(capacidade)s,
+                        limite_login.fichas
+                          + EXTRACT(EPOCH FROM now() - limite_login.atualizado_em) * %(taxa)s
+                    ) - 1),
+                    atualizado_em = now()
+                RETURNING fichas;
+            """, {"chave": chave, "capacidade": capacidade, "taxa": taxa})
+            fichas = float(cur.fetchone()["fichas"])
+            conn.commit()
+
+        return 0.0 if fichas >= 0 else -fichas / taxa
+
+    def limpar(self, chave: str) -> None:
+        """Remove a chave (limite volta à capacidade cheia)."""
+        with self._get_conn() as conn, conn.cursor() as cur:
+            cur.execute("DELETE FROM limite_login WHERE chave = %s;", (chave,))
+            conn.commit()
+
+
+class LimitadorLogin:
+    """
+    Limita tentativas de login por email e por IP de origem.
+
+    A verificação acontece antes de qualquer acesso ao banco ou hashing,
+    então uma rajada de credential stuffing é recusada sem custo de CPU.
+    O balde em memória é sempre consultado primeiro; o backend compartilhado
+    (opcional) só é consultado quando o local aceita, para que vários
+    processos/servidores somem as tentativas.
+
+    Attributes:
+        max_por_email: Tentativas por email na janela
+        max_por_ip: Tentativas por IP na janela
+        janela: Duração da janela em segundos
+    """
+
+    def __init__(self, max_por_email: int = 5, max_por_ip: int = 30, janela: float = 300.0,
+                 backend=None, memoria: BaldeMemoria | None = None):
+        """
+        Inicializa o limitador.
+
+        Args:
+            max_por_email: Tentativas por email na janela
+            max_por_ip: Tentativas por IP na janela
+            janela: Duração da janela em segundos
+            backend: Balde compartilhado (ex.: BaldePostgres) ou None
+            memoria: Balde local (None cria um novo)
+
+        Raises:
+            ValueError: Se os limites forem inválidos
+        """
+        if max_por_email < 1 or max_por_ip < 1:
+            raise ValueError("Limites de tentativas devem ser >= 1")
+        if janela <= 0:
+            raise ValueError("Janela deve ser positiva")
+
+        self.max_por_email = max_por_email
+        self.max_por_ip = max_por_ip
+        self.janela = janela
+        self.backend = backend
+        self.memoria = memoria or BaldeMemoria()
+
+    @staticmethod
+    def _chaves(email: str | None, ip: str | None) -> list[tuple[str, str]]:
+        chaves = []
+        if email:
+            chaves.append(("email", f"email:{email.strip().lower()}"))
+        if ip:
+            chaves.append(("ip", f"ip:{ip}"))
+        return chaves
+
+    def verificar(self, email: str | None, ip: str | None = None) -> None:
+        """
+        Registra uma tentativa de login e recusa se o limite foi atingido.
+
+        Args:
+            email: Email informado (normalizado aqui)
+            ip: IP de origem da requisição
+
+        Raises:
+            LoginBloqueadoErro: Se email ou IP estiverem acima do limite
+        """
+        for balde in (self.memoria, self.backend):
+            if balde is None:
+                continue
+
+            espera = 0.0
+            for tipo, chave in self._chaves(email, ip):
+                capacidade = self.max_por_email if tipo == "email" else self.max_por_ip
+                espera = max(espera, balde.consumir(chave, capacidade, self.janela))
+
+            if espera > 0:
+                raise LoginBloqueadoErro(espera)
+
+    def registrar_sucesso(self, email: str | None) -> None:
+        """Login bem-sucedido: zera o limite do email (o do IP continua valendo)."""
+        chaves = [chave for tipo, chave in self._chaves(email, None)]
+        for balde in (self.memoria, self.backend):
+            if balde is None:
+                continue
+            for chave in chaves:
+                try:
+                    balde.limpar(chave)
+                except Exception as e:
+                    print(f"Aviso: não foi possível limpar limite de login: {e}")
+
+
+# ============================================================================
+# LIMITADOR DO PROCESSO
+# ============================================================================
+
+_limitador = None
+_limitador_lock = threading.Lock()
+
+
+def obter_limitador() -> LimitadorLogin:
+    """
+    Retorna o limitador de login compartilhado pelo processo.
+
+    Configurável por LOGIN_MAX_EMAIL, LOGIN_MAX_IP, LOGIN_JANELA (segundos)
+    e LOGIN_LIMITE_COMPARTILHADO=1 (usa a tabela limite_login do Postgres).
+    """
+    global _limitador
+    with _limitador_lock:
+        if _limitador is None:
+            backend = None
+            if os.getenv("LOGIN_LIMITE_COMPARTILHADO", "0") == "1":
+                backend = BaldePostgres()
+            _limitador = LimitadorLogin(
+                max_por_email=int(os.getenv("LOGIN_MAX_EMAIL", "5")),
+                max_por_ip=int(os.getenv("LOGIN_MAX_IP", "30")),
+                janela=float(os.getenv("LOGIN_JANELA", "300")),
+                backend=backend,
+            )
+        return _limitador
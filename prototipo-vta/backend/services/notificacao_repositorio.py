@@ -0,0 +1,336 @@
+import time
+from datetime import datetime
+import psycopg2.extras
+from backend.DB.conexao import Conexao
+from backend.models.notificacao import Notificacao
+
+
+class NotificacaoRepositorio(Conexao):
+    """
+    Repositório de notificações no Postgres (tabela notificacao).
+
+    Implementa a interface esperada por NotificacaoServico. As consultas
+    por usuário seguem a ordem dos índices das migrações 008 e 010:
+        - (usuario_id, criada_em DESC, notificacao_id DESC) para listagens
+        - parcial (usuario_id, criada_em DESC) WHERE lida = false para não lidas
+        - (usuario_id, tipo, lida, criada_em DESC) para filtros por tipo
+    e a listagem é paginada por keyset (criada_em, notificacao_id), sem OFFSET.
+    """
+
+    COLUNAS = "notificacao_id, usuario_id, tipo, titulo, mensagem, criada_em, lida"
+
+    # Limite por página na listagem
+    LIMITE_MAXIMO = 1000
+
+    # Linhas por INSERT multi-linhas (execute_values)
+    TAMANHO_PAGINA = 500
+
+    # Expurgo de antigas: linhas por DELETE e pausa entre lotes
+    EXPURGO_LOTE = 1000
+    EXPURGO_PAUSA_SEGUNDOS = 0.05
+
+    def salvar(self, notificacao: Notificacao) -> Notificacao:
+        """
+        Insere uma notificação.
+
+        Args:
+            notificacao: Notificação a persistir
+
+        Returns:
+            A própria notificação
+        """
+        with self._get_conn() as conn, conn.cursor() as cur:
+            cur.execute(f"""
+                INSERT INTO notificacao ({self.COLUNAS})
+                VALUES (%s, %s, %s, %s, %s, %s, %s);
+            """, self._valores(notificacao))
+            conn.commit()
+        return notificacao
+
+    def salvar_em_lote(self, notificacoes: list[Notificacao]) -> int:
+        """
+        Insere várias notificações com INSERT multi-linhas, em uma transação.
+
+        Args:
+            notificacoes: Notificações a persistir
+
+        Returns:
+            Número de notificações inseridas
+        """
+        if not notificacoes:
+            return 0
+
+        with self._get_conn() as conn, conn.cursor() as cur:
+            psycopg2.extras.execute_values(
+                cur,
+                f"INSERT INTO notificacao ({self.COLUNAS}) VALUES %s;",
+                [self._valores(n) for n in notificacoes],
+                page_size=self.TAMANHO_PAGINA
+            )
+            conn.commit()
+        return len(notificacoes)
+
+    def buscar_por_id(self, notificacao_id: str) -> Notificacao | None:
+        """
+        Busca uma notificação pelo ID.
+
+        Returns:
+            Notificacao ou None se não existir
+        """
+        with self._get_conn() as conn, conn.cursor() as cur:
+            cur.execute(
+                f"SELECT {self.COLUNAS} FROM notificacao WHERE notificacao_id = %s;",
+                (str(notificacao_id),)
+            )
+            row = cur.fetchone()
+        return self._criar_notificacao_from_row(row) if row else None
+
+    def buscar_por_usuario(self, usuario_id: str, lida: bool | None = None) -> list[Notificacao]:
+        """
+        Busca as notificações de um usuário, mais recentes primeiro.
+
+        Args:
+            usuario_id: ID do usuário
+            lida: True/False filtra pelo status de leitura; None traz todas
+
+        Returns:
+            Lista de notificações
+        """
+        itens, _ = self.listar_pagina(usuario_id, lida=lida, limite=None)
+        return itens
+
+    def listar_pagina(self, usuario_id: str, lida: bool | None = None,
+                      limite: int | None = 50, cursor: str | None = None) -> tuple[list[Notificacao], str | None]:
+        """
+        Lista uma página de notificações do usuário (keyset por criada_em, notificacao_id).
+
+        Args:
+            usuario_id: ID do usuário
+            lida: Filtro de leitura (None traz todas)
+            limite: Itens por página (até LIMITE_MAXIMO; None sem limite)
+            cursor: Cursor devolvido pela página anterior
+
+        Returns:
+            (notificações, cursor da próxima página ou None)
+
+        Raises:
+            ValueError: Se limite ou cursor forem inválidos
+        """
+        if limite is not None and not 1 <= limite <= self.LIMITE_MAXIMO:
+            raise ValueError(f"Limite deve estar entre 1 e {self.LIMITE_MAXIMO}")
+
+        filtros = ["usuario_id = %(usuario_id)s"]
+        parametros = {"usuario_id": str(usuario_id)}
+
+        if lida is not None:
+            filtros.append("lida = %(lida)s")
+            parametros["lida"] = lida
+
+        if cursor:
+            parametros["antes_criada"], parametros["antes_id"] = self.ler_cursor(cursor)
+            filtros.append("(criada_em, notificacao_id) < (%(antes_criada)s, %(antes_id)s)")
+
+        limitador = ""
+        if limite is not None:
+            # Um item a mais indica se existe próxima página
+            parametros["limite"] = limite + 1
+            limitador = "LIMIT %(limite)s"
+
+        with self._get_conn() as conn, conn.cursor() as cur:
+            cur.execute(f"""
+                SELECT {self.COLUNAS}
+                FROM notificacao
+                WHERE {' AND '.join(filtros)}
+                ORDER BY criada_em DESC, notificacao_id DESC
+                {limitador};
+            """, parametros)
+            rows = cur.fetchall()
+
+        proximo = None
+        if limite is not None and len(rows) > limite:
+            rows = rows[:limite]
+            proximo = self.gerar_cursor(rows[-1]["criada_em"], rows[-1]["notificacao_id"])
+
+        return [self._criar_notificacao_from_row(row) for row in rows], proximo
+
+    def contar_nao_lidas(self, usuario_id: str) -> int:
+        """
+        Conta as não lidas do usuário (index-only scan no índice parcial).
+
+        Returns:
+            Número de notificações não lidas
+        """
+        with self._get_conn() as conn, conn.cursor() as cur:
+            cur.execute(
+                "SELECT count(*) AS total FROM notificacao WHERE usuario_id = %s AND lida = FALSE;",
+                (str(usuario_id),)
+            )
+            return cur.fetchone()["total"]
+
+    def buscar_por_tipo(self, usuario_id: str, tipos, lida: bool | None = None,
+                        limite: int | None = None) -> list[Notificacao]:
+        """
+        Busca notificações do usuário de determinados tipos, mais recentes primeiro.
+
+        Args:
+            usuario_id: ID do usuário
+            tipos: Tipos aceitos (ex.: ["erro", "alerta"])
+            lida: Filtro de leitura (None traz todas)
+            limite: Máximo de notificações (None sem limite)
+
+        Returns:
+            Lista de notificações
+        """
+        filtros = ["usuario_id = %(usuario_id)s", "tipo = ANY(%(tipos)s)"]
+        parametros = {"usuario_id": str(usuario_id), "tipos": list(tipos)}
+
+        if lida is not None:
+            filtros.append("lida = %(lida)s")
+            parametros["lida"] = lida
+
+        limitador = ""
+        if limite is not None:
+            parametros["limite"] = limite
+            limitador = "LIMIT %(limite)s"
+
+        with self._get_conn() as conn, conn.cursor() as cur:
+            cur.execute(f"""
+                SELECT {self.COLUNAS}
+                FROM notificacao
+                WHERE {' AND '.join(filtros)}
+                ORDER BY criada_em DESC, notificacao_id DESC
+                {limitador};
+            """, parametros)
+            rows = cur.fetchall()
+
+        return [self._criar_notificacao_from_row(row) for row in rows]
+
+    def atualizar(self, notificacao: Notificacao) -> bool:
+        """
+        Atualiza uma notificação existente.
+
+        Returns:
+            True se atualizada, False se não encontrada
+        """
+        with self._get_conn() as conn, conn.cursor() as cur:
+            cur.execute("""
+                UPDATE notificacao
+                SET tipo = %s, titulo = %s, mensagem = %s, lida = %s
+                WHERE notificacao_id = %s;
+            """, (notificacao.tipo, notificacao.titulo, notificacao.mensagem,
+                  notificacao.lida, notificacao.notificacao_id))
+            atualizada = cur.rowcount > 0
+            conn.commit()
+        return atualizada
+
+    def excluir(self, notificacao_id: str) -> bool:
+        """
+        Exclui uma notificação.
+
+        Returns:
+            True se excluída, False se não encontrada
+        """
+        with self._get_conn() as conn, conn.cursor() as cur:
+            cur.execute("DELETE FROM notificacao WHERE notificacao_id = %s;", (str(notificacao_id),))
+            excluida = cur.rowcount > 0
+            conn.commit()
+        return excluida
+
+    def marcar_todas_como_lidas(self, usuario_id: str) -> int:
+        """
+        Marca como lidas, em um único UPDATE, todas as não lidas do usuário.
+
+        Returns:
+            Número de notificações marcadas
+        """
+        with self._get_conn() as conn, conn.cursor() as cur:
+            cur.execute("""
+                UPDATE notificacao
+                SET lida = TRUE
+                WHERE usuario_id = %s AND lida = FALSE;
+            """, (str(usuario_id),))
+            marcadas = cur.rowcount
+            conn.commit()
+        return marcadas
+
+    def excluir_lidas_antes(self, limite_data: datetime, usuario_id: str | None = None,
+                            lote: int | None = None, pausa: float | None = None) -> int:
+        """
+        Exclui notificações lidas criadas antes de `limite_data`, em lotes.
+
+        Cada lote é um DELETE de no máximo `lote` linhas com commit próprio,
+        para não segurar locks na tabela durante um expurgo grande.
+
+        Args:
+            limite_data: Notificações criadas antes desta data são excluídas
+            usuario_id: Restringe a um usuário (None expurga de todos)
+            lote: Linhas por DELETE (padrão: EXPURGO_LOTE)
+            pausa: Segundos entre lotes (padrão: EXPURGO_PAUSA_SEGUNDOS)
+
+        Returns:
+            Número de notificações excluídas
+        """
+        lote = lote or self.EXPURGO_LOTE
+        pausa = self.EXPURGO_PAUSA_SEGUNDOS if pausa is None else pausa
+
+        filtros = ["lida = TRUE", "criada_em < %(limite_data)s"]
+        parametros = {"limite_data": limite_data, "lote": lote}
+        if usuario_id is not None:
+            filtros.append("usuario_id = %(usuario_id)s")
+            parametros["usuario_id"] = str(usuario_id)
+
+        total = 0
+        while True:
+            with self._get_conn() as conn, conn.cursor() as cur:
+                cur.execute(f"""
+                    DELETE FROM notificacao
+                    WHERE notificacao_id IN (
+                        SELECT notificacao_id
+                        FROM notificacao
+                        WHERE {' AND '.join(filtros)}
+                        LIMIT %(lote)s
+                        FOR UPDATE SKIP LOCKED
+                    );
+                """, parametros)
+                excluidas = cur.rowcount
+                conn.commit()
+
+            total += excluidas
+            if excluidas < lote:
+                break
+            if pausa:
+                time.sleep(pausa)
+
+        return total
+
+    @staticmethod
+    def _valores(notificacao: Notificacao) -> tuple:
+        return (notificacao.notificacao_id, notificacao.usuario_id, notificacao.tipo,
+                notificacao.titulo, notificacao.mensagem, notificacao.criada_em, notificacao.lida)
+
+    @staticmethod
+    def gerar_cursor(criada_em: datetime, notificacao_id) -> str:
+        """Cursor opaco com a chave (criada_em, notificacao_id) do último item da página."""
+        return f"{criada_em.isoformat()}|{notificacao_id}"
+
+    @staticmethod
+    def ler_cursor(cursor: str) -> tuple[datetime, str]:
+        """Lê o cursor gerado por gerar_cursor."""
+        try:
+            criada_iso, notificacao_id = cursor.split("|", 1)
+            return datetime.fromisoformat(criada_iso), notificacao_id
+        except ValueError:
+            raise ValueError("Cursor inválido")
+
+    @staticmethod
+    def _criar_notificacao_from_row(row: dict) -> Notificacao:
+        """Cria objeto Notificacao a partir de uma linha do banco."""
+        return Notificacao(
+            notificacao_id=row["notificacao_id"],
+            usuario_id=row["usuario_id"],
+            tipo=row["tipo"],
+            titulo=row["titulo"],
+            mensagem=row["mensagem"],
+            criada_em=row["criada_em"],
+            lida=row["lida"]
+        )
@@ -1,8 +1,13 @@
-from datetime import datetime, timezone
+from datetime import datetime, timedelta, timezone
 from uuid import UUID
 from typing import List, Optional
 from backend.models.notificacao import Notificacao
 from backend.models.usuario import Usuario
+from backend.services.barramento_notificacoes import obter_barramento
+from backend.services.contador_nao_lidas import ContadorNaoLidas
+from backend.services.fila_urgentes import FilaUrgentes
+from backend.services.notificacao_repositorio import NotificacaoRepositorio
+from backend.services.tarefa_periodica import TarefaPeriodica
 
 
 class NotificacaoServico:
@@ -16,14 +21,26 @@ class NotificacaoServico:
         - Interagir com a camada de persistência
     """
     
-    def __init__(self, repositorio=None):
+    def __init__(self, repositorio=None, contador: Optional[ContadorNaoLidas] = None, barramento=None,
+                 urgentes: Optional[FilaUrgentes] = None):
         """
         Inicializa o serviço de notificações.
         
         Args:
-            repositorio: Repositório para persistência (opcional, para testes pode ser None)
+            repositorio: Repositório para persistência (opcional, para testes pode ser None).
+                Deve oferecer salvar, buscar_por_id, buscar_por_usuario, listar_pagina,
+                salvar_em_lote, buscar_por_tipo, atualizar, excluir,
+                marcar_todas_como_lidas, excluir_lidas_antes e contar_nao_lidas
+                (ver NotificacaoRepositorio)
+            contador: Contagem de não lidas por usuário (None cria uma para o serviço)
+            barramento: Pub/sub que entrega eventos aos streams SSE
+                (None usa o do processo, ver obter_barramento)
+            urgentes: Heap de urgentes não lidas por usuário (None cria um para o serviço)
         """
         self.repositorio = repositorio
+        self.contador = contador if contador is not None else ContadorNaoLidas()
+        self.barramento = barramento if barramento is not None else obter_barramento()
+        self.urgentes = urgentes if urgentes is not None else FilaUrgentes()
         # Cache em memória para quando não houver repositório
         self._notificacoes_cache: List[Notificacao] = []
     
@@ -63,11 +80,11 @@ class NotificacaoServico:
         
         # Cria a notificação
         notificacao = Notificacao(
-            usuarioId=usuario.uuid,
+            usuario_id=usuario.usuario_id,
             tipo=tipo,
             titulo=titulo,
             mensagem=mensagem,
-            criadaEm=datetime.now(timezone.utc),
+            criada_em=datetime.now(timezone.utc),
             lida=False
         )
         
@@ -78,7 +95,36 @@ class NotificacaoServico:
             # Fallback para cache em memória (útil para testes)
             self._notificacoes_cache.append(notificacao)
         
+        self.contador.ajustar(notificacao.usuario_id, 1)
+        self.urgentes.adicionar(notificacao)
+        self._publicar_nova(notificacao)
         return notificacao
+
+    def _evento_nova(self, notificacao: Notificacao) -> dict:
+        """Evento de nova notificação (nao_lidas é None se a contagem não estiver carregada)."""
+        return {
+            "evento": "notificacao",
+            "notificacao": notificacao.to_dict(),
+            "nao_lidas": self.contador.obter(notificacao.usuario_id),
+            "urgente": notificacao.is_urgente(),
+        }
+
+    def _publicar(self, usuario_id: str, evento: dict) -> None:
+        """
+        Publica um evento para os streams do usuário.
+
+        A notificação já está gravada: falha no barramento só é registrada.
+        """
+        try:
+            self.barramento.publicar(usuario_id, evento)
+        except Exception as e:
+            print(f"Aviso: falha ao publicar notificação: {e}")
+
+    def _publicar_nova(self, notificacao: Notificacao) -> None:
+        self._publicar(notificacao.usuario_id, self._evento_nova(notificacao))
+
+    def _publicar_contador(self, usuario_id: str) -> None:
+        self._publicar(usuario_id, {"evento": "contador", "nao_lidas": self.contador.obter(usuario_id)})
     
     def listarNaoLidas(self, usuario: Usuario) -> List[Notificacao]:
         """
@@ -105,24 +151,15 @@ class NotificacaoServico:
         if not isinstance(usuario, Usuario):
             raise ValueError("usuario deve ser uma instância de Usuario")
         
-        # Busca notificações
+        # Busca notificações (o repositório já devolve ordenado)
         if self.repositorio:
-            notificacoes = self.repositorio.buscar_por_usuario(usuario.uuid, lida=False)
-        else:
-            # Fallback para cache em memória
-            notificacoes = [
-                n for n in self._notificacoes_cache 
-                if n.usuarioId == usuario.uuid and not n.lida
-            ]
-        
-        # Ordena por data (mais recentes primeiro)
-        notificacoes_ordenadas = sorted(
-            notificacoes, 
-            key=lambda n: n.criadaEm, 
-            reverse=True
-        )
-        
-        return notificacoes_ordenadas
+            return self.repositorio.buscar_por_usuario(usuario.usuario_id, lida=False)
+
+        # Fallback para cache em memória
+        return self._ordenar([
+            n for n in self._notificacoes_cache
+            if n.usuario_id == usuario.usuario_id and not n.lida
+        ])
     
     def listarTodas(self, usuario: Usuario, limite: int = 50) -> List[Notificacao]:
         """
@@ -138,30 +175,59 @@ class NotificacaoServico:
         Raises:
             ValueError: Se usuário for None ou inválido
         """
+        notificacoes, _ = self.listarPagina(usuario, limite=limite)
+        return notificacoes
+
+    def listarPagina(self, usuario: Usuario, limite: int = 50,
+                     cursor: Optional[str] = None) -> tuple[List[Notificacao], Optional[str]]:
+        """
+        Lista uma página das notificações de um usuário (paginação por keyset).
+
+        Args:
+            usuario: Usuário para buscar notificações
+            limite: Número máximo de notificações na página (padrão: 50)
+            cursor: Cursor devolvido pela página anterior (None para a primeira)
+
+        Returns:
+            (notificações mais recentes primeiro, cursor da próxima página ou None)
+
+        Raises:
+            ValueError: Se usuário for None ou inválido, ou cursor/limite inválidos
+
+        Example:
+            >>> pagina, proximo = servico.listarPagina(usuario, limite=20)
+            >>> seguinte, _ = servico.listarPagina(usuario, limite=20, cursor=proximo)
+        """
         if usuario is None:
             raise ValueError("Usuário não pode ser None")
         
         if not isinstance(usuario, Usuario):
             raise ValueError("usuario deve ser uma instância de Usuario")
         
-        # Busca notificações
         if self.repositorio:
-            notificacoes = self.repositorio.buscar_por_usuario(usuario.uuid)
-        else:
-            # Fallback para cache em memória
-            notificacoes = [
-                n for n in self._notificacoes_cache 
-                if n.usuarioId == usuario.uuid
-            ]
-        
-        # Ordena e limita
-        notificacoes_ordenadas = sorted(
-            notificacoes, 
-            key=lambda n: n.criadaEm, 
-            reverse=True
-        )
-        
-        return notificacoes_ordenadas[:limite]
+            return self.repositorio.listar_pagina(usuario.usuario_id, limite=limite, cursor=cursor)
+
+        # Fallback para cache em memória, com a mesma chave do repositório
+        notificacoes = self._ordenar([
+            n for n in self._notificacoes_cache
+            if n.usuario_id == usuario.usuario_id
+        ])
+        if cursor:
+            chave = NotificacaoRepositorio.ler_cursor(cursor)
+            notificacoes = [n for n in notificacoes if (n.criada_em, n.notificacao_id) < chave]
+
+        proximo = None
+        if len(notificacoes) > limite:
+            notificacoes = notificacoes[:limite]
+            ultima = notificacoes[-1]
+            proximo = NotificacaoRepositorio.gerar_cursor(ultima.criada_em, ultima.notificacao_id)
+
+        return notificacoes, proximo
+
+    @staticmethod
+    def _ordenar(notificacoes: List[Notificacao]) -> List[Notificacao]:
+        """Mais recentes primeiro (desempate por ID, como no índice do banco)."""
+        return sorted(notificacoes, key=lambda n: (n.criada_em, n.notificacao_id), reverse=True)
     
     def marcarComoLida(self, notificacao_id: UUID | str) -> bool:
         """
@@ -174,22 +240,32 @@ class NotificacaoServico:
             True se marcada com sucesso, False se não encontrada
             
         Example:
-            >>> servico.marcarComoLida(notificacao.id)
+            >>> servico.marcarComoLida(notificacao.notificacao_id)
         """
-        if self.repositorio:
-            notificacao = self.repositorio.buscar_por_id(str(notificacao_id))
-            if notificacao:
-                notificacao.marcarComoLida()
+        notificacao = self._buscar(notificacao_id)
+        if notificacao is None:
+            return False
+
+        if not notificacao.lida:
+            notificacao.marcar_como_lida()
+            if self.repositorio:
                 self.repositorio.atualizar(notificacao)
-                return True
-        else:
-            # Fallback para cache em memória
-            for notif in self._notificacoes_cache:
-                if notif.id == str(notificacao_id):
-                    notif.marcarComoLida()
-                    return True
-        
-        return False
+            self.contador.ajustar(notificacao.usuario_id, -1)
+            if notificacao.is_urgente():
+                self.urgentes.remover(notificacao.usuario_id, notificacao.notificacao_id)
+            self._publicar_contador(notificacao.usuario_id)
+
+        return True
+
+    def _buscar(self, notificacao_id: UUID | str) -> Optional[Notificacao]:
+        """Busca uma notificação no repositório (ou no cache em memória)."""
+        if self.repositorio:
+            return self.repositorio.buscar_por_id(str(notificacao_id))
+
+        for notif in self._notificacoes_cache:
+            if notif.notificacao_id == str(notificacao_id):
+                return notif
+        return None
     
     def marcarTodasComoLidas(self, usuario: Usuario) -> int:
         """
@@ -210,14 +286,19 @@ class NotificacaoServico:
         if not isinstance(usuario, Usuario):
             raise ValueError("usuario deve ser uma instância de Usuario")
         
-        nao_lidas = self.listarNaoLidas(usuario)
-        
-        for notificacao in nao_lidas:
-            notificacao.marcarComoLida()
-            if self.repositorio:
-                self.repositorio.atualizar(notificacao)
-        
-        return len(nao_lidas)
+        if self.repositorio:
+            marcadas = self.repositorio.marcar_todas_como_lidas(usuario.usuario_id)
+        else:
+            # Fallback para cache em memória
+            nao_lidas = self.listarNaoLidas(usuario)
+            for notificacao in nao_lidas:
+                notificacao.marcar_como_lida()
+            marcadas = len(nao_lidas)
+
+        self.contador.definir(usuario.usuario_id, 0)
+        self.urgentes.carregar(usuario.usuario_id, [])
+        self._publicar_contador(usuario.usuario_id)
+        return marcadas
     
     def excluir(self, notificacao_id: UUID | str) -> bool:
         """
@@ -229,16 +310,23 @@ class NotificacaoServico:
         Returns:
             True se excluída com sucesso, False se não encontrada
         """
+        notificacao = self._buscar(notificacao_id)
+        if notificacao is None:
+            return False
+
         if self.repositorio:
-            return self.repositorio.excluir(str(notificacao_id))
+            excluida = self.repositorio.excluir(notificacao.notificacao_id)
         else:
             # Fallback para cache em memória
-            for i, notif in enumerate(self._notificacoes_cache):
-                if notif.id == str(notificacao_id):
-                    self._notificacoes_cache.pop(i)
-                    return True
-        
-        return False
+            self._notificacoes_cache.remove(notificacao)
+            excluida = True
+
+        if excluida and not notificacao.lida:
+            self.contador.ajustar(notificacao.usuario_id, -1)
+            if notificacao.is_urgente():
+                self.urgentes.remover(notificacao.usuario_id, notificacao.notificacao_id)
+            self._publicar_contador(notificacao.usuario_id)
+        return excluida
     
     def excluirAntigas(self, usuario: Usuario, dias: int = 30) -> int:
         """
@@ -260,23 +348,70 @@ class NotificacaoServico:
         if not isinstance(usuario, Usuario):
             raise ValueError("usuario deve ser uma instância de Usuario")
         
-        todas = self.listarTodas(usuario, limite=1000)
-        agora = datetime.now(timezone.utc)
-        contador = 0
-        
-        for notificacao in todas:
-            # Só exclui notificações lidas
-            if notificacao.lida:
-                idade_em_dias = (agora - notificacao.criadaEm).days
-                if idade_em_dias > dias:
-                    if self.excluir(notificacao.id):
-                        contador += 1
-        
-        return contador
+        return self._excluir_lidas_antes(self._data_corte(dias), usuario.usuario_id)
+
+    def excluir_antigas_de_todos(self, dias: int = 30) -> int:
+        """
+        Exclui notificações lidas antigas de todos os usuários (retenção global).
+
+        Args:
+            dias: Notificações lidas mais antigas que X dias serão excluídas (padrão: 30)
+
+        Returns:
+            Número de notificações excluídas
+        """
+        excluidas = self._excluir_lidas_antes(self._data_corte(dias))
+        print(f"{excluidas} notificação(ões) antiga(s) excluída(s).")
+        return excluidas
+
+    def iniciar_retencao(self, dias: int = 30, intervalo: float = 86400.0) -> TarefaPeriodica:
+        """
+        Agenda excluir_antigas_de_todos em segundo plano.
+
+        Args:
+            dias: Idade mínima (em dias) das notificações lidas excluídas
+            intervalo: Segundos entre execuções (padrão: 1 dia)
+
+        Returns:
+            A tarefa iniciada (chamar parar() para encerrar)
+        """
+        tarefa = TarefaPeriodica(
+            "retencao-notificacoes", lambda: self.excluir_antigas_de_todos(dias), intervalo
+        )
+        tarefa.iniciar()
+        return tarefa
+
+    @staticmethod
+    def _data_corte(dias: int) -> datetime:
+        """
+        Criadas antes deste instante são "mais antigas que `dias` dias".
+
+        Mantém o critério original, idade em dias completos > dias: com
+        dias=30, uma notificação de 30 dias e meio ainda fica.
+        """
+        if dias < 0:
+            raise ValueError("dias não pode ser negativo")
+        return datetime.now(timezone.utc) - timedelta(days=dias + 1)
+
+    def _excluir_lidas_antes(self, limite_data: datetime, usuario_id: Optional[str] = None) -> int:
+        """Exclui lidas criadas antes de limite_data (de um usuário ou de todos)."""
+        if self.repositorio:
+            return self.repositorio.excluir_lidas_antes(limite_data, usuario_id=usuario_id)
+
+        # Fallback para cache em memória
+        antes = len(self._notificacoes_cache)
+        self._notificacoes_cache = [
+            n for n in self._notificacoes_cache
+            if not (n.lida and n.criada_em < limite_data
+                    and (usuario_id is None or n.usuario_id == usuario_id))
+        ]
+        return antes - len(self._notificacoes_cache)
     
     def contar_nao_lidas(self, usuario: Usuario) -> int:
         """
         Conta o número de notificações não lidas de um usuário.
+
+        Usa a contagem mantida em memória (ver contar_nao_lidas_por_id).
         
         Args:
             usuario: Usuário para contar notificações
@@ -293,11 +428,43 @@ class NotificacaoServico:
         if not isinstance(usuario, Usuario):
             raise ValueError("usuario deve ser uma instância de Usuario")
         
-        return len(self.listarNaoLidas(usuario))
+        return self.contar_nao_lidas_por_id(usuario.usuario_id)
+
+    def contar_nao_lidas_por_id(self, usuario_id: UUID | str) -> int:
+        """
+        Conta as não lidas pelo ID do usuário (badge, /api/notificacoes/contador).
+
+        A contagem vem do contador em memória; só na primeira consulta (ou
+        depois do ttl) é feito um COUNT no índice parcial de não lidas.
+
+        Args:
+            usuario_id: ID do usuário
+
+        Returns:
+            Número de notificações não lidas
+        """
+        usuario_id = str(usuario_id)
+        contagem = self.contador.obter(usuario_id)
+        if contagem is not None:
+            return contagem
+
+        if self.repositorio:
+            contagem = self.repositorio.contar_nao_lidas(usuario_id)
+        else:
+            contagem = sum(
+                1 for n in self._notificacoes_cache
+                if n.usuario_id == usuario_id and not n.lida
+            )
+        return self.contador.definir(usuario_id, contagem)
     
-    def enviar_em_lote(self, usuarios: List[Usuario], mensagem: str, tipo: str = "info", titulo: str = "Notificação") -> List[Notificacao]:
+    def enviar_em_lote(self, usuarios: List[Usuario], mensagem: str, tipo: str = "info",
+                       titulo: str = "Notificação") -> tuple[List[Notificacao], List[Usuario]]:
         """
-        Envia a mesma notificação para múltiplos usuários.
+        Envia a mesma notificação para múltiplos usuários (ex.: aviso a todos os ativos).
+        
+        Mensagem, tipo e título são validados uma vez; as notificações são
+        gravadas com um único INSERT multi-linhas (repositorio.salvar_em_lote).
+        Usuários repetidos na lista recebem uma só notificação.
         
         Args:
             usuarios: Lista de usuários que receberão a notificação
@@ -306,39 +473,82 @@ class NotificacaoServico:
             titulo: Título da notificação (padrão: "Notificação")
             
         Returns:
-            Lista de notificações criadas
+            (notificações criadas, usuários ignorados por estarem inativos)
             
         Raises:
-            ValueError: Se lista de usuários for vazia
+            ValueError: Se lista de usuários for vazia, algum item não for
+                Usuario, ou mensagem/tipo/título forem inválidos
             
         Example:
             >>> usuarios_ativos = [u1, u2, u3]
-            >>> servico.enviar_em_lote(usuarios_ativos, "Manutenção programada", "aviso")
+            >>> criadas, ignorados = servico.enviar_em_lote(usuarios_ativos, "Manutenção programada", "aviso")
         """
         if not usuarios:
             raise ValueError("Lista de usuários não pode ser vazia")
         
-        notificacoes = []
+        if not all(isinstance(u, Usuario) for u in usuarios):
+            raise ValueError("usuarios deve conter apenas instâncias de Usuario")
+        
+        if not mensagem or not mensagem.strip():
+            raise ValueError("Mensagem não pode ser vazia")
+        
+        ativos = []
+        ignorados = []
+        vistos = set()
         for usuario in usuarios:
-            try:
-                notif = self.enviar(usuario, mensagem, tipo, titulo)
-                notificacoes.append(notif)
-            except ValueError:
-                # Ignora usuários inválidos ou inativos
-                continue
+            if not usuario.is_ativo():
+                ignorados.append(usuario)
+            elif usuario.usuario_id not in vistos:
+                vistos.add(usuario.usuario_id)
+                ativos.append(usuario)
+        
+        if not ativos:
+            return [], ignorados
+        
+        # A primeira valida tipo/título/mensagem; as demais reaproveitam os valores normalizados
+        criada_em = datetime.now(timezone.utc)
+        modelo = Notificacao(
+            usuario_id=ativos[0].usuario_id, tipo=tipo, titulo=titulo,
+            mensagem=mensagem, criada_em=criada_em
+        )
+        notificacoes = [modelo] + [
+            Notificacao(
+                usuario_id=usuario.usuario_id, tipo=modelo.tipo, titulo=modelo.titulo,
+                mensagem=modelo.mensagem, criada_em=criada_em
+            )
+            for usuario in ativos[1:]
+        ]
         
-        return notificacoes
+        if self.repositorio:
+            self.repositorio.salvar_em_lote(notificacoes)
+        else:
+            # Fallback para cache em memória
+            self._notificacoes_cache.extend(notificacoes)
+        
+        for notificacao in notificacoes:
+            self.contador.ajustar(notificacao.usuario_id, 1)
+            self.urgentes.adicionar(notificacao)
+        
+        try:
+            self.barramento.publicar_lote(
+                [(n.usuario_id, self._evento_nova(n)) for n in notificacoes]
+            )
+        except Exception as e:
+            print(f"Aviso: falha ao publicar notificações: {e}")
+        
+        return notificacoes, ignorados
     
-    def buscar_por_tipo(self, usuario: Usuario, tipo: str) -> List[Notificacao]:
+    def buscar_por_tipo(self, usuario: Usuario, tipo: str, limite: int = 1000) -> List[Notificacao]:
         """
         Busca notificações de um usuário por tipo.
         
         Args:
             usuario: Usuário para buscar notificações
             tipo: Tipo de notificação a buscar
+            limite: Máximo de notificações (mais recentes primeiro, padrão: 1000)
             
         Returns:
-            Lista de notificações do tipo especificado
+            Lista de notificações do tipo especificado (vazia se o tipo não existir)
             
         Raises:
             ValueError: Se usuário for None ou inválido
@@ -349,8 +559,18 @@ class NotificacaoServico:
         if not isinstance(usuario, Usuario):
             raise ValueError("usuario deve ser uma instância de Usuario")
         
-        todas = self.listarTodas(usuario, limite=1000)
-        return [n for n in todas if n.is_tipo(tipo)]
+        tipo = tipo.strip().lower() if isinstance(tipo, str) else ""
+        if tipo not in Notificacao.TIPOS_VALIDOS:
+            return []
+        
+        if self.repositorio:
+            return self.repositorio.buscar_por_tipo(usuario.usuario_id, [tipo], limite=limite)
+
+        # Fallback para cache em memória
+        return self._ordenar([
+            n for n in self._notificacoes_cache
+            if n.usuario_id == usuario.usuario_id and n.tipo == tipo
+        ])[:limite]
     
     def buscar_urgentes(self, usuario: Usuario) -> List[Notificacao]:
         """
@@ -360,7 +580,8 @@ class NotificacaoServico:
             usuario: Usuário para buscar notificações
             
         Returns:
-            Lista de notificações urgentes não lidas
+            Lista de notificações urgentes não lidas, erros antes de alertas
+            e, no mesmo tipo, mais recentes primeiro
             
         Raises:
             ValueError: Se usuário for None ou inválido
@@ -371,5 +592,33 @@ class NotificacaoServico:
         if not isinstance(usuario, Usuario):
             raise ValueError("usuario deve ser uma instância de Usuario")
         
-        nao_lidas = self.listarNaoLidas(usuario)
-        return [n for n in nao_lidas if n.is_urgente()]
\ No newline at end of file
+        return self.buscar_urgentes_por_id(usuario.usuario_id)
+
+    def buscar_urgentes_por_id(self, usuario_id: UUID | str) -> List[Notificacao]:
+        """
+        Urgentes não lidas pelo ID do usuário (tela, stream SSE).
+
+        Servidas do heap em memória; só na primeira consulta (ou depois do
+        ttl) o heap é carregado do banco pelo índice (usuario_id, tipo, lida).
+
+        Args:
+            usuario_id: ID do usuário
+
+        Returns:
+            Lista de notificações urgentes não lidas em ordem de prioridade
+        """
+        usuario_id = str(usuario_id)
+        urgentes = self.urgentes.listar(usuario_id)
+        if urgentes is not None:
+            return urgentes
+
+        tipos = list(Notificacao.PRIORIDADE_URGENTE)
+        if self.repositorio:
+            notificacoes = self.repositorio.buscar_por_tipo(usuario_id, tipos, lida=False)
+        else:
+            notificacoes = [
+                n for n in self._notificacoes_cache
+                if n.usuario_id == usuario_id and n.tipo in tipos and not n.lida
+            ]
+        self.urgentes.carregar(usuario_id, notificacoes)
+        return self.urgentes.listar(usuario_id) or []
@@ -0,0 +1,210 @@
+from backend.DB.conexao import Conexao
+from backend.models.pet import Pet
+
+
+class PetRepositorio(Conexao):
+    """
+    Repositório de pets no Postgres (tabela pet, migração 011).
+
+    A listagem é paginada por keyset na chave (lower(nome), uuid), a mesma
+    dos índices por cliente, por espécie e por nome; buscar_por_clientes
+    carrega os pets de vários clientes em uma consulta (tela de pets e
+    seletores da agenda, sem N+1).
+    """
+
+    COLUNAS = "uuid, cliente_id, nome, especie, raca, nascimento"
+
+    # Chave de ordenação da listagem (precisa bater com os índices da migração 011)
+    ORDEM_NOME = 'lower(nome) COLLATE "C"'
+
+    # Limite por página na listagem
+    LIMITE_MAXIMO = 500
+
+    def salvar(self, pet: Pet) -> Pet:
+        """
+        Insere um pet.
+
+        Returns:
+            O próprio pet
+        """
+        with self._get_conn() as conn, conn.cursor() as cur:
+            cur.execute(f"""
+                INSERT INTO pet ({self.COLUNAS})
+                VALUES (%s, %s, %s, %s, %s, %s);
+            """, (str(pet.pet_id), self._cliente(pet.cliente_id), pet.nome,
+                  pet.especie, pet.raca, pet.nascimento))
+            conn.commit()
+        return pet
+
+    def atualizar(self, pet: Pet) -> bool:
+        """
+        Atualiza um pet existente.
+
+        Returns:
+            True se atualizado, False se não encontrado
+        """
+        with self._get_conn() as conn, conn.cursor() as cur:
+            cur.execute("""
+                UPDATE pet
+                SET cliente_id = %s, nome = %s, especie = %s, raca = %s, nascimento = %s
+                WHERE uuid = %s;
+            """, (self._cliente(pet.cliente_id), pet.nome, pet.especie, pet.raca,
+                  pet.nascimento, str(pet.pet_id)))
+            atualizado = cur.rowcount > 0
+            conn.commit()
+        return atualizado
+
+    def deletar(self, pet_id) -> bool:
+        """
+        Remove um pet.
+
+        Returns:
+            True se removido, False se não encontrado
+        """
+        with self._get_conn() as conn, conn.cursor() as cur:
+            cur.execute("DELETE FROM pet WHERE uuid = %s;", (str(pet_id),))
+            removido = cur.rowcount > 0
+            conn.commit()
+        return removido
+
+    def buscar_por_uuid(self, pet_id) -> Pet | None:
+        """
+        Busca um pet pelo UUID.
+
+        Returns:
+            Pet ou None se não existir
+        """
+        with self._get_conn() as conn, conn.cursor() as cur:
+            cur.execute(f"SELECT {self.COLUNAS} FROM pet WHERE uuid = %s;", (str(pet_id),))
+            row = cur.fetchone()
+        return self._criar_pet_from_row(row) if row else None
+
+    def buscar_por_clientes(self, cliente_ids) -> dict[str, list[Pet]]:
+        """
+        Carrega, em uma consulta, os pets de vários clientes.
+
+        Args:
+            cliente_ids: IDs dos clientes
+
+        Returns:
+            Dicionário cliente_id -> pets ordenados por nome
+            (todo cliente pedido aparece, com lista vazia se não tiver pets)
+        """
+        ids = list(dict.fromkeys(self._cliente(c) for c in cliente_ids))
+        resultado = {cliente_id: [] for cliente_id in ids}
+        if not ids:
+            return resultado
+
+        with self._get_conn() as conn, conn.cursor() as cur:
+            cur.execute(f"""
+                SELECT {self.COLUNAS}
+                FROM pet
+                WHERE cliente_id = ANY(%s)
+                ORDER BY cliente_id, {self.ORDEM_NOME}, uuid;
+            """, (ids,))
+            rows = cur.fetchall()
+
+        for row in rows:
+            resultado[row["cliente_id"]].append(self._criar_pet_from_row(row))
+        return resultado
+
+    def buscar_por_cliente(self, cliente_id) -> list[Pet]:
+        """Pets de um cliente, ordenados por nome."""
+        return self.buscar_por_clientes([cliente_id])[self._cliente(cliente_id)]
+
+    def listar(self, cliente_id=None, especie: str | None = None,
+               prefixo_nome: str | None = None, limite: int = 50,
+               cursor: str | None = None) -> tuple[list[Pet], str | None]:
+        """
+        Lista uma página de pets ordenada por nome (keyset por lower(nome), uuid).
+
+        Args:
+            cliente_id: Filtra pelos pets do cliente
+            especie: Filtra pela espécie (sem diferenciar maiúsculas)
+            prefixo_nome: Filtra pelo início do nome (sem diferenciar maiúsculas)
+            limite: Itens por página (até LIMITE_MAXIMO)
+            cursor: Cursor devolvido pela página anterior
+
+        Returns:
+            (pets, cursor da próxima página ou None)
+
+        Raises:
+            ValueError: Se limite ou cursor forem inválidos
+        """
+        if not 1 <= limite <= self.LIMITE_MAXIMO:
+            raise ValueError(f"Limite deve estar entre 1 e {self.LIMITE_MAXIMO}")
+
+        filtros = []
+        parametros = {"limite": limite + 1}  # um a mais indica se existe próxima página
+
+        if cliente_id is not None:
+            filtros.append("cliente_id = %(cliente_id)s")
+            parametros["cliente_id"] = self._cliente(cliente_id)
+
+        if especie:
+            filtros.append("lower(especie) = %(especie)s")
+            parametros["especie"] = especie.strip().lower()
+
+        if prefixo_nome and prefixo_nome.strip():
+            filtros.append(f"{self.ORDEM_NOME} LIKE %(prefixo)s")
+            parametros["prefixo"] = self._escapar_like(prefixo_nome.strip().lower()) + "%"
+
+        if cursor:
+            parametros["apos_nome"], parametros["apos_uuid"] = self._ler_cursor(cursor)
+            filtros.append(
+                f'({self.ORDEM_NOME}, uuid) > (%(apos_nome)s COLLATE "C", %(apos_uuid)s)'
+            )
+
+        where = f"WHERE {' AND '.join(filtros)}" if filtros else ""
+
+        with self._get_conn() as conn, conn.cursor() as cur:
+            cur.execute(f"""
+                SELECT {self.COLUNAS}
+                FROM pet
+                {where}
+                ORDER BY {self.ORDEM_NOME}, uuid
+                LIMIT %(limite)s;
+            """, parametros)
+            rows = cur.fetchall()
+
+        proximo = None
+        if len(rows) > limite:
+            rows = rows[:limite]
+            proximo = self._gerar_cursor(rows[-1])
+
+        return [self._criar_pet_from_row(row) for row in rows], proximo
+
+    @staticmethod
+    def _cliente(cliente_id) -> str | None:
+        """cliente_id como gravado na tabela (VARCHAR, como em agendamento.cliente)."""
+        return str(cliente_id) if cliente_id is not None else None
+
+    @staticmethod
+    def _escapar_like(texto: str) -> str:
+        return texto.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+
+    @staticmethod
+    def _gerar_cursor(row: dict) -> str:
+        """Cursor opaco com a chave (lower(nome), uuid) do último item da página."""
+        return f"{row['nome'].lower()}|{row['uuid']}"
+
+    @staticmethod
+    def _ler_cursor(cursor: str) -> tuple[str, str]:
+        """Lê o cursor gerado por _gerar_cursor (o nome pode conter '|', o uuid não)."""
+        try:
+            nome, pet_id = cursor.rsplit("|", 1)
+            return nome, pet_id
+        except ValueError:
+            raise ValueError("Cursor inválido")
+
+    @staticmethod
+    def _criar_pet_from_row(row: dict) -> Pet:
+        """Cria objeto Pet a partir de uma linha do banco."""
+        return Pet(
+            pet_id=row["uuid"],
+            cliente_id=row["cliente_id"],
+            nome=row["nome"],
+            especie=row["especie"],
+            raca=row["raca"],
+            nascimento=row["nascimento"]
+        )
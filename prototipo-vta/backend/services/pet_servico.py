@@ -1,110 +1,156 @@
 from typing import List, Optional
 from uuid import UUID
-from models.pet import Pet
+from backend.models.pet import Pet
+from backend.services.indice_busca import IndiceBusca, documento_pet
 
 
 class PetServico:
     """
     Serviço para gerenciar operações relacionadas a pets.
-    
+
+    Os pets ficam em um dicionário pelo ID normalizado (str) e em um índice
+    secundário por cliente_id, então criar, atualizar, buscar e deletar
+    custam O(1) em média; a ordem de cadastro é preservada nas listagens.
+
     Attributes:
-        pets: Lista de pets cadastrados no sistema
+        pets: Lista (cópia) dos pets cadastrados no sistema
+        indice: Índice de busca aproximada por nome (mantido a cada escrita)
     """
-    
-    def __init__(self):
-        """Inicializa o serviço com uma lista vazia de pets."""
-        self.pets: List[Pet] = []
-    
+
+    def __init__(self, indice: IndiceBusca | None = None):
+        """
+        Inicializa o serviço sem pets.
+
+        Args:
+            indice: Índice de busca compartilhado (None cria um só para os pets)
+        """
+        self.indice = indice if indice is not None else IndiceBusca()
+        self._por_id: dict[str, Pet] = {}
+        # cliente_id -> {pet_id: Pet}, na ordem de cadastro
+        self._por_cliente: dict[int | None, dict[str, Pet]] = {}
+        # pet_id -> cliente_id com que o pet foi indexado
+        self._cliente_de: dict[str, int | None] = {}
+
+    @property
+    def pets(self) -> List[Pet]:
+        return list(self._por_id.values())
+
+    def _indexar(self, chave: str, pet: Pet) -> None:
+        self._por_id[chave] = pet
+        self._por_cliente.setdefault(pet.cliente_id, {})[chave] = pet
+        self._cliente_de[chave] = pet.cliente_id
+        self.indice.adicionar(*documento_pet(pet))
+
+    def _desindexar_cliente(self, chave: str) -> None:
+        cliente_id = self._cliente_de.pop(chave)
+        pets_cliente = self._por_cliente[cliente_id]
+        del pets_cliente[chave]
+        if not pets_cliente:
+            del self._por_cliente[cliente_id]
+
     def criar(self, pet: Pet) -> Pet:
         """
         Adiciona um novo pet ao sistema.
-        
+
         Args:
             pet: Objeto Pet a ser cadastrado
-            
+
         Returns:
             O pet cadastrado
-            
+
         Raises:
             ValueError: Se já existir um pet com o mesmo UUID
         """
-        # Verifica se já existe um pet com este UUID
-        if any(p.pet_id == pet.pet_id for p in self.pets):
+        chave = str(pet.pet_id)
+        if chave in self._por_id:
             raise ValueError(f"Pet com UUID {pet.pet_id} já existe")
-        
-        self.pets.append(pet)
+
+        self._indexar(chave, pet)
         return pet
-    
+
     def atualizar(self, pet: Pet) -> Pet:
         """
         Atualiza os dados de um pet existente.
-        
+
         Args:
             pet: Objeto Pet com os dados atualizados
-            
+
         Returns:
             O pet atualizado
-            
+
         Raises:
             ValueError: Se o pet não for encontrado
         """
-        for i, p in enumerate(self.pets):
-            if p.pet_id == pet.pet_id:
-                self.pets[i] = pet
-                return pet
-        
-        raise ValueError(f"Pet com UUID {pet.pet_id} não encontrado")
-    
+        chave = str(pet.pet_id)
+        if chave not in self._por_id:
+            raise ValueError(f"Pet com UUID {pet.pet_id} não encontrado")
+
+        # Mantém a posição na listagem geral; reindexa o cliente (pode ter mudado)
+        self._desindexar_cliente(chave)
+        self._indexar(chave, pet)
+        return pet
+
     def buscar_por_cliente(self, cliente_id: int) -> List[Pet]:
         """
         Busca todos os pets de um cliente específico.
-        
+
         Args:
             cliente_id: ID do cliente
-            
+
         Returns:
             Lista de pets pertencentes ao cliente (pode ser vazia)
         """
-        return [pet for pet in self.pets if pet.cliente_id == cliente_id]
-    
+        return list(self._por_cliente.get(cliente_id, {}).values())
+
     def buscar_por_uuid(self, pet_id: UUID | str) -> Optional[Pet]:
         """
         Busca um pet pelo seu UUID.
-        
+
         Args:
             pet_id: UUID do pet (pode ser string ou UUID)
-            
+
         Returns:
             O pet encontrado ou None se não existir
         """
-        pet_id_str = str(pet_id)
-        for pet in self.pets:
-            if str(pet.pet_id) == pet_id_str:
-                return pet
-        return None
-    
+        return self._por_id.get(str(pet_id))
+
     def listar_todos(self) -> List[Pet]:
         """
         Lista todos os pets cadastrados.
-        
+
         Returns:
             Lista com todos os pets
         """
-        return self.pets.copy()
-    
+        return self.pets
+
     def deletar(self, pet_id: UUID | str) -> bool:
         """
         Remove um pet do sistema.
-        
+
         Args:
             pet_id: UUID do pet a ser removido
-            
+
         Returns:
             True se o pet foi removido, False se não foi encontrado
         """
-        pet_id_str = str(pet_id)
-        for i, pet in enumerate(self.pets):
-            if str(pet.pet_id) == pet_id_str:
-                self.pets.pop(i)
-                return True
-        return False
\ No newline at end of file
+        chave = str(pet_id)
+        if self._por_id.pop(chave, None) is None:
+            return False
+
+        self._desindexar_cliente(chave)
+        self.indice.remover("pet", chave)
+        return True
+
+    def buscar_por_nome(self, texto: str, limite: int = 10) -> List[Pet]:
+        """
+        Busca aproximada pelo nome (sem acentos/maiúsculas, aceita parte do nome).
+
+        Args:
+            texto: Nome ou parte dele (ex.: "bor" encontra "Bóris")
+            limite: Máximo de pets
+
+        Returns:
+            Pets mais parecidos primeiro
+        """
+        resultados = self.indice.buscar(texto, limite=limite, tipos={"pet"})
+        return [self._por_id[r["id"]] for r in resultados if r["id"] in self._por_id]
@@ -0,0 +1,214 @@
+import hashlib
+import hmac
+import os
+import re
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from werkzeug.security import check_password_hash
+from backend.models.usuario import Usuario
+from backend.services.executor_hash import ExecutorHashSenha, HashSobrecarregadoErro
+
+
+# Formatos de hash reconhecidos
+FORMATO_PBKDF2 = "pbkdf2_sha256"       # iterations$salt$hash (Usuario.hash_senha)
+FORMATO_WERKZEUG = "werkzeug"          # pbkdf2:sha256:N$salt$hash / scrypt:...$salt$hash
+FORMATO_SHA256_LEGADO = "sha256"       # hex puro, sem salt (INSEGURO)
+FORMATO_DESCONHECIDO = "desconhecido"
+
+_SHA256_HEX = re.compile(r"^[0-9a-fA-F]{64}$")
+
+
+def identificar_formato(senha_hash: str) -> str:
+    """
+    Identifica o formato de um hash armazenado.
+
+    Args:
+        senha_hash: Hash vindo do banco
+
+    Returns:
+        Uma das constantes FORMATO_*
+    """
+    if not isinstance(senha_hash, str) or not senha_hash:
+        return FORMATO_DESCONHECIDO
+
+    if senha_hash.startswith(("pbkdf2:", "scrypt:")):
+        return FORMATO_WERKZEUG
+
+    partes = senha_hash.split("$")
+    if len(partes) == 3 and partes[0].isdigit():
+        return FORMATO_PBKDF2
+
+    if _SHA256_HEX.match(senha_hash):
+        return FORMATO_SHA256_LEGADO
+
+    return FORMATO_DESCONHECIDO
+
+
+def verificar_senha(senha_hash: str, senha: str) -> bool:
+    """
+    Verifica a senha contra qualquer formato reconhecido.
+
+    Função de módulo (picklable) para rodar no ExecutorHashSenha.
+
+    Args:
+        senha_hash: Hash armazenado
+        senha: Senha em texto plano
+
+    Returns:
+        True se a senha confere
+    """
+    if not isinstance(senha, str) or not senha:
+        return False
+
+    formato = identificar_formato(senha_hash)
+
+    if formato == FORMATO_PBKDF2:
+        return Usuario.validar_senha(senha_hash, senha)
+
+    if formato == FORMATO_WERKZEUG:
+        try:
+            return check_password_hash(senha_hash, senha)
+        except ValueError:
+            return False
+
+    if formato == FORMATO_SHA256_LEGADO:
+        hash_simples = hashlib.sha256(senha.encode("utf-8")).hexdigest()
+        return hmac.compare_digest(senha_hash.lower(), hash_simples)
+
+    return False
+
+
+class PoliticaHash:
+    """
+    Política central de hashing de senhas.
+
+    Define o formato e o custo (iterações PBKDF2) atuais. Hashes em
+    formatos antigos ou com custo menor continuam válidos para login e são
+    regravados em segundo plano no primeiro login bem-sucedido, sem
+    obrigar o usuário a redefinir a senha.
+
+    Attributes:
+        versao: Número da política, gravado junto do hash (coluna versao_hash)
+        iteracoes: Iterações PBKDF2-SHA256 exigidas
+    """
+
+    # Threads que gravam os hashes regravados no banco
+    GRAVACAO_THREADS = 2
+
+    def __init__(self, versao: int = 2, iteracoes: int = 600_000):
+        """
+        Inicializa a política.
+
+        Raises:
+            ValueError: Se iterações abaixo do mínimo aceito por Usuario.hash_senha
+        """
+        if iteracoes < 100_000:
+            raise ValueError("Número de iterações muito baixo (mínimo: 100.000)")
+
+        self.versao = versao
+        self.iteracoes = iteracoes
+        self._hash_referencia = None
+        self._gravacoes = None
+        self._gravacoes_lock = threading.Lock()
+
+    @classmethod
+    def do_ambiente(cls) -> "PoliticaHash":
+        """Cria a política a partir de HASH_POLITICA_VERSAO e HASH_ITERACOES."""
+        return cls(
+            versao=int(os.getenv("HASH_POLITICA_VERSAO", "2")),
+            iteracoes=int(os.getenv("HASH_ITERACOES", "600000")),
+        )
+
+    def gerar(self, senha: str) -> str:
+        """Gera hash no formato e custo atuais (chamar via executor em rotas)."""
+        return Usuario.hash_senha(senha, self.iteracoes)
+
+    def hash_referencia(self, executor: ExecutorHashSenha) -> str:
+        """
+        Hash descartável no custo atual, gerado uma vez por processo.
+
+        Verificar a senha contra ele quando o email não existe deixa a
+        resposta com o mesmo tempo de uma senha errada.
+        """
+        if self._hash_referencia is None:
+            self._hash_referencia = executor.executar(
+                Usuario.hash_senha, os.urandom(16).hex(), self.iteracoes
+            )
+        return self._hash_referencia
+
+    def precisa_rehash(self, senha_hash: str) -> bool:
+        """
+        Indica se o hash está fora da política atual.
+
+        Args:
+            senha_hash: Hash armazenado (já verificado)
+
+        Returns:
+            True para formatos legados ou PBKDF2 com menos iterações
+        """
+        if identificar_formato(senha_hash) != FORMATO_PBKDF2:
+            return True
+        return int(senha_hash.split("$", 1)[0]) < self.iteracoes
+
+    def rehash_em_segundo_plano(self, executor: ExecutorHashSenha, senha: str,
+                                ao_concluir) -> bool:
+        """
+        Agenda a regravação do hash sem atrasar a resposta do login.
+
+        A gravação (ao_concluir) roda em uma thread própria da política,
+        não na thread que entrega os resultados do pool de hashing: esperar
+        uma conexão do banco ali atrasaria os hashes de todos os logins.
+
+        Args:
+            executor: Executor de hashing
+            senha: Senha em texto plano (recém-validada)
+            ao_concluir: Função chamada com (novo_hash, versao) ao terminar
+
+        Returns:
+            True se agendado, False se a fila de hashing estava cheia
+            (a migração fica para o próximo login)
+        """
+        try:
+            futuro = executor.submeter(Usuario.hash_senha, senha, self.iteracoes)
+        except HashSobrecarregadoErro:
+            return False
+
+        gravacoes = self._executor_gravacoes()
+
+        def _gravar(novo_hash):
+            try:
+                ao_concluir(novo_hash, self.versao)
+            except Exception as e:
+                print(f"Aviso: não foi possível atualizar o hash da senha: {e}")
+
+        def _repassar(f):
+            # Thread de resultados do pool: só entrega o hash à thread de gravação
+            try:
+                novo_hash = f.result()
+            except Exception as e:
+                print(f"Aviso: não foi possível atualizar o hash da senha: {e}")
+                return
+            gravacoes.submit(_gravar, novo_hash)
+
+        futuro.add_done_callback(_repassar)
+        return True
+
+    def _executor_gravacoes(self) -> ThreadPoolExecutor:
+        """Threads de gravação dos hashes regravados (criadas no primeiro uso)."""
+        with self._gravacoes_lock:
+            if self._gravacoes is None:
+                self._gravacoes = ThreadPoolExecutor(
+                    max_workers=self.GRAVACAO_THREADS, thread_name_prefix="rehash-gravacao"
+                )
+            return self._gravacoes
+
+
+_politica = None
+
+
+def obter_politica() -> PoliticaHash:
+    """Retorna a política de hashing do processo (configurada pelo ambiente)."""
+    global _politica
+    if _politica is None:
+        _politica = PoliticaHash.do_ambiente()
+    return _politica
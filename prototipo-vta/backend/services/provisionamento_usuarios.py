@@ -0,0 +1,302 @@
+import csv
+import json
+import time
+from collections import deque
+from datetime import datetime, timezone
+import psycopg2.extras
+from backend.DB.conexao import Conexao
+from backend.enums.perfil_usuario import PerfilUsuario
+from backend.enums.status_usuario import StatusUsuario
+from backend.models.usuario import Usuario
+from backend.services.cache_usuarios import CacheUsuarios, obter_cache_usuarios
+from backend.services.executor_hash import ExecutorHashSenha, HashSobrecarregadoErro
+from backend.services.politica_hash import PoliticaHash, obter_politica
+
+
+class ProvisionamentoUsuarios(Conexao):
+    """
+    Importação em massa de usuários (onboarding de uma rede de clínicas).
+
+    Fluxo de importar():
+        1. Valida e deduplica os emails em memória
+        2. Descarta, com uma consulta, emails já cadastrados
+        3. Calcula os hashes das senhas em paralelo no pool de processos
+        4. Insere todos os usuários com execute_values em uma única transação,
+           em usuario (diretório, uuid das notificações e sessões) e em
+           usuarios (tabela lida pela rota /login)
+
+    Linhas inválidas viram falhas no relatório, sem abortar as demais.
+    """
+
+    # Linhas por INSERT multi-linhas (execute_values)
+    TAMANHO_PAGINA = 500
+
+    # Campos que precisam ser texto em cada registro
+    CAMPOS_TEXTO = ("nome", "email", "senha")
+
+    # Perfil como gravado em usuarios (nomes de exibição, ver gerar_hash.py)
+    PERFIL_LOGIN = {
+        PerfilUsuario.ADMIN: "Administrador",
+        PerfilUsuario.RECEPCIONISTA: "Recepcionista",
+        PerfilUsuario.VETERINARIO: "Veterinário",
+    }
+
+    def __init__(self, conn_str=None, executor_hash: ExecutorHashSenha | None = None,
+                 politica_hash: PoliticaHash | None = None,
+                 cache_usuarios: CacheUsuarios | None = None):
+        """
+        Inicializa o serviço.
+
+        Args:
+            conn_str: String de conexão (None usa variáveis de ambiente)
+            executor_hash: Executor de hashing (None cria um próprio para a
+                importação, sem disputar a fila dos logins)
+            politica_hash: Política de hashing (None usa a do ambiente)
+            cache_usuarios: Cache do diretório (None usa o do processo)
+        """
+        super().__init__(conn_str)
+        self.executor_hash = executor_hash
+        self.politica_hash = politica_hash or obter_politica()
+        self.cache_usuarios = cache_usuarios if cache_usuarios is not None else obter_cache_usuarios()
+
+    # ------------------------------------------------------------------
+    # Entrada
+    # ------------------------------------------------------------------
+
+    @staticmethod
+    def ler_csv(arquivo) -> list[dict]:
+        """
+        Lê usuários de um CSV com cabeçalho nome,email,senha,perfil.
+
+        Args:
+            arquivo: Caminho ou arquivo texto aberto
+
+        Returns:
+            Lista de dicionários (uma entrada por linha)
+        """
+        if isinstance(arquivo, str):
+            with open(arquivo, newline="", encoding="utf-8-sig") as f:
+                return list(csv.DictReader(f))
+        return list(csv.DictReader(arquivo))
+
+    @staticmethod
+    def ler_json(arquivo) -> list[dict]:
+        """
+        Lê usuários de um JSON (lista de objetos com nome, email, senha, perfil).
+
+        Raises:
+            ValueError: Se o conteúdo não for uma lista
+        """
+        if isinstance(arquivo, str):
+            with open(arquivo, encoding="utf-8") as f:
+                dados = json.load(f)
+        else:
+            dados = json.load(arquivo)
+
+        if not isinstance(dados, list):
+            raise ValueError("O JSON deve conter uma lista de usuários")
+        return dados
+
+    def importar_arquivo(self, caminho: str) -> dict:
+        """Importa um arquivo .csv ou .json (pela extensão)."""
+        if caminho.lower().endswith(".json"):
+            return self.importar(self.ler_json(caminho))
+        return self.importar(self.ler_csv(caminho))
+
+    # ------------------------------------------------------------------
+    # Importação
+    # ------------------------------------------------------------------
+
+    def importar(self, registros) -> dict:
+        """
+        Cria os usuários em lote.
+
+        Args:
+            registros: Iterável de dicts com nome, email, senha e perfil
+                       (perfil opcional, padrão recepcionista)
+
+        Returns:
+            Relatório {"total", "criados": [{"linha", "email", "uuid"}],
+                       "falhas": [{"linha", "email", "erro"}]}
+            (linha conta a partir de 1, na ordem da entrada)
+        """
+        registros = list(registros)
+        relatorio = {"total": len(registros), "criados": [], "falhas": []}
+
+        validos = self._validar(registros, relatorio["falhas"])
+        if not validos:
+            return relatorio
+
+        # Emails já cadastrados (em qualquer das duas tabelas): uma consulta para o lote inteiro
+        emails = [item["email"] for item in validos]
+        with self._get_conn() as conn, conn.cursor() as cur:
+            cur.execute("""
+                SELECT email FROM usuario WHERE email = ANY(%s)
+                UNION
+                SELECT lower(email) FROM usuarios WHERE lower(email) = ANY(%s);
+            """, (emails, emails))
+            existentes = {row["email"] for row in cur.fetchall()}
+
+        novos = []
+        for item in validos:
+            if item["email"] in existentes:
+                relatorio["falhas"].append(self._falha(item["linha"], item["email"], "Email já cadastrado"))
+            else:
+                novos.append(item)
+
+        if not novos:
+            return self._ordenar(relatorio)
+
+        for item, senha_hash in zip(novos, self._gerar_hashes([item["senha"] for item in novos])):
+            item["senha_hash"] = senha_hash
+
+        usuarios = [
+            Usuario(
+                nome=item["nome"],
+                email=item["email"],
+                senha_hash=item["senha_hash"],
+                perfil=item["perfil"],
+                status=StatusUsuario.ATIVO
+            )
+            for item in novos
+        ]
+
+        with self._get_conn() as conn, conn.cursor() as cur:
+            # ON CONFLICT cobre emails criados por outro processo depois da checagem
+            inseridos = psycopg2.extras.execute_values(cur, """
+                INSERT INTO usuario (uuid, nome, email, senhahash, versao_hash, perfil, status, ultimo_login)
+                VALUES %s
+                ON CONFLICT (email) DO NOTHING
+                RETURNING email;
+            """, [
+                (u.usuario_id, u.nome, u.email, u.senha_hash, self.politica_hash.versao,
+                 u.perfil.value, u.status.value, None)
+                for u in usuarios
+            ], page_size=self.TAMANHO_PAGINA, fetch=True)
+            criados = {row["email"] for row in inseridos}
+
+            # Login (routes.py) autentica em usuarios; mesma transação do diretório
+            if criados:
+                psycopg2.extras.execute_values(cur, """
+                    INSERT INTO usuarios (nome, email, senha_hash, perfil, versao_hash)
+                    VALUES %s;
+                """, [
+                    (u.nome, u.email, u.senha_hash, self.PERFIL_LOGIN[u.perfil], self.politica_hash.versao)
+                    for u in usuarios if u.email in criados
+                ], page_size=self.TAMANHO_PAGINA)
+            conn.commit()
+
+        for item, usuario in zip(novos, usuarios):
+            if usuario.email in criados:
+                relatorio["criados"].append(
+                    {"linha": item["linha"], "email": usuario.email, "uuid": usuario.usuario_id}
+                )
+            else:
+                relatorio["falhas"].append(self._falha(item["linha"], usuario.email, "Email já cadastrado"))
+
+        self.cache_usuarios.invalidar()
+        print(f"{len(relatorio['criados'])} usuário(s) criado(s), {len(relatorio['falhas'])} falha(s).")
+        return self._ordenar(relatorio)
+
+    def _validar(self, registros: list, falhas: list) -> list[dict]:
+        """Valida campos e deduplica emails; linhas inválidas vão para `falhas`."""
+        validos = []
+        vistos = {}  # email -> linha da primeira ocorrência
+
+        for linha, registro in enumerate(registros, start=1):
+            if not isinstance(registro, dict):
+                falhas.append(self._falha(linha, None, "Registro deve ser um objeto"))
+                continue
+
+            # JSON pode trazer números, listas etc.: só texto (ou ausente) segue
+            nao_texto = [
+                campo for campo in self.CAMPOS_TEXTO
+                if registro.get(campo) is not None and not isinstance(registro[campo], str)
+            ]
+            if nao_texto:
+                email = registro.get("email")
+                email = email.strip().lower() if isinstance(email, str) else ""
+                falhas.append(self._falha(linha, email or None, f"Campo(s) devem ser texto: {', '.join(nao_texto)}"))
+                continue
+
+            nome = (registro.get("nome") or "").strip()
+            email = (registro.get("email") or "").strip().lower()
+            senha = registro.get("senha") or ""
+
+            if not nome:
+                erro = "Nome não pode ser vazio"
+            elif not Usuario._validar_email(email):
+                erro = f"Email inválido: {email}"
+            elif len(senha.strip()) < 8:
+                # Mesmo critério de Usuario.hash_senha (só espaços é senha vazia)
+                erro = "Senha deve ter no mínimo 8 caracteres"
+            elif email in vistos:
+                erro = f"Email duplicado no arquivo (linha {vistos[email]})"
+            else:
+                erro = None
+
+            if erro is None:
+                try:
+                    perfil = Usuario.perfil_por_nome(registro.get("perfil") or PerfilUsuario.RECEPCIONISTA)
+                except ValueError as e:
+                    erro = str(e)
+
+            if erro is not None:
+                falhas.append(self._falha(linha, email or None, erro))
+                continue
+
+            vistos[email] = linha
+            validos.append({"linha": linha, "nome": nome, "email": email, "senha": senha, "perfil": perfil})
+
+        return validos
+
+    def _gerar_hashes(self, senhas: list[str]) -> list[str]:
+        """
+        Calcula os hashes em paralelo, mantendo a fila do executor cheia.
+
+        Quando a fila do executor enche, espera o hash pendente mais antigo
+        (ou, sem pendentes próprios, um instante) antes de submeter o próximo.
+        """
+        executor = self.executor_hash
+        proprio = executor is None
+        if proprio:
+            executor = ExecutorHashSenha()
+
+        try:
+            hashes = []
+            pendentes = deque()
+            for senha in senhas:
+                while True:
+                    try:
+                        pendentes.append(
+                            executor.submeter(Usuario.hash_senha, senha, self.politica_hash.iteracoes)
+                        )
+                        break
+                    except HashSobrecarregadoErro:
+                        if pendentes:
+                            hashes.append(pendentes.popleft().result())
+                        else:
+                            time.sleep(0.01)
+            while pendentes:
+                hashes.append(pendentes.popleft().result())
+            return hashes
+        finally:
+            if proprio:
+                executor.encerrar()
+
+    @staticmethod
+    def _falha(linha: int, email, erro: str) -> dict:
+        return {"linha": linha, "email": email, "erro": erro}
+
+    @staticmethod
+    def _ordenar(relatorio: dict) -> dict:
+        relatorio["falhas"].sort(key=lambda f: f["linha"])
+        return relatorio
+
+
+def relatorio_json(relatorio: dict) -> str:
+    """Serializa o relatório de importação (com data de geração)."""
+    return json.dumps(
+        {"gerado_em": datetime.now(timezone.utc).isoformat(), **relatorio},
+        ensure_ascii=False, indent=2
+    )
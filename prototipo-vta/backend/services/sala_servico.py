@@ -1,5 +1,6 @@
 from backend.DB.conexao import Conexao
 from backend.models.sala import Sala
+from backend.services.indice_ocupacao import IndiceOcupacao
 from datetime import datetime
 
 class SalaServico(Conexao):
@@ -251,6 +252,23 @@ class SalaServico(Conexao):
             print(f"✓ Sala excluída com sucesso!")
             return True
     
+    def _criar_sala_from_row(self, row: dict) -> Sala:
+        """
+        Cria objeto Sala a partir de uma linha do banco.
+        
+        Args:
+            row: Dicionário com dados do banco (fetchone())
+            
+        Returns:
+            Instância de Sala
+        """
+        return Sala(
+            sala_id=row["uuid"],
+            nome=row["nome"],
+            tipo=row["tipo"],
+            ativa=row["ativa"]
+        )
+    
     def consultar_disponibilidade(self, sala_uuid: str, 
                                   dataHora: datetime) -> str:
         """
@@ -263,12 +281,14 @@ class SalaServico(Conexao):
         Returns:
             'bloqueada', 'ocupada', 'livre' ou 'sala_nao_encontrada'
         """
-        sala = self.buscar_sala(sala_uuid)
-        if not sala:
-            return "sala_nao_encontrada"
-        
-        # Busca reservas/agendamentos da sala nesse horário
+        # Sala e reservas na mesma conexão emprestada do pool
         with self._get_conn() as conn, conn.cursor() as cur:
+            cur.execute("SELECT * FROM sala WHERE uuid = %s;", (sala_uuid,))
+            row = cur.fetchone()
+            if not row:
+                return "sala_nao_encontrada"
+            
+            # Busca reservas/agendamentos da sala nesse horário
             cur.execute("""
                 SELECT inicio, fim 
                 FROM agendamento 
@@ -279,7 +299,7 @@ class SalaServico(Conexao):
             
             reservas = cur.fetchall()
         
-        return sala.statusEm(dataHora, reservas)
+        return self._criar_sala_from_row(row).statusEm(dataHora, reservas)
     
     def listar_salas_disponiveis(self, dataHora: datetime) -> list[Sala]:
         """
@@ -290,13 +310,102 @@ class SalaServico(Conexao):
             
         Returns:
             Lista de salas livres
+            
+        Notes:
+            Uma única consulta (NOT EXISTS) em vez de consultar cada sala;
+            mesmo critério de consultar_disponibilidade (inicio <= dataHora <= fim).
+        """
+        with self._get_conn() as conn, conn.cursor() as cur:
+            cur.execute("""
+                SELECT s.uuid, s.nome, s.tipo, s.ativa
+                FROM sala s
+                WHERE s.ativa = TRUE
+                  AND NOT EXISTS (
+                      SELECT 1
+                      FROM agendamento a
+                      WHERE a.fk_sala_uuid = s.uuid
+                        AND a.status != 'CANCELADO'
+                        AND a.inicio <= %(data_hora)s
+                        AND a.fim >= %(data_hora)s
+                  )
+                ORDER BY s.nome;
+            """, {"data_hora": dataHora})
+            
+            return [self._criar_sala_from_row(row) for row in cur.fetchall()]
+    
+    def listar_salas_disponiveis_periodo(self, inicio: datetime, fim: datetime,
+                                         tipo: str = None) -> list[Sala]:
+        """
+        Lista salas ativas sem nenhum agendamento no período [inicio, fim).
+        
+        Usado para preencher o seletor de salas da tela de agendamento
+        em uma única consulta.
+        
+        Args:
+            inicio: Início do período desejado
+            fim: Fim do período desejado (exclusivo)
+            tipo: Filtra pelo tipo de sala (None para todos)
+            
+        Returns:
+            Lista de salas livres durante todo o período
+            
+        Raises:
+            ValueError: Se inicio não for anterior a fim
+        """
+        if inicio >= fim:
+            raise ValueError("O início do período deve ser anterior ao fim")
+        
+        filtro_tipo = "AND s.tipo = %(tipo)s" if tipo is not None else ""
+        
+        with self._get_conn() as conn, conn.cursor() as cur:
+            # Sobreposição de intervalos: a.inicio < fim AND a.fim > inicio
+            cur.execute(f"""
+                SELECT s.uuid, s.nome, s.tipo, s.ativa
+                FROM sala s
+                WHERE s.ativa = TRUE
+                  {filtro_tipo}
+                  AND NOT EXISTS (
+                      SELECT 1
+                      FROM agendamento a
+                      WHERE a.fk_sala_uuid = s.uuid
+                        AND a.status != 'CANCELADO'
+                        AND a.inicio < %(fim)s
+                        AND a.fim > %(inicio)s
+                  )
+                ORDER BY s.nome;
+            """, {"inicio": inicio, "fim": fim, "tipo": tipo})
+            
+            return [self._criar_sala_from_row(row) for row in cur.fetchall()]
+    
+    def carregar_indice_ocupacao(self, inicio: datetime, fim: datetime,
+                                 indice: IndiceOcupacao = None) -> IndiceOcupacao:
+        """
+        Carrega em lote os agendamentos de um período em um índice de ocupação.
+        
+        Uma única consulta alimenta o índice; depois disso, perguntas como
+        "a sala está ocupada às 10h?" ou "quais salas estão livres das 14h
+        às 15h?" são respondidas em memória (busca binária por sala).
+        
+        Args:
+            inicio: Início do período a carregar
+            fim: Fim do período a carregar (exclusivo)
+            indice: Índice existente a complementar (None para criar um novo)
+            
+        Returns:
+            Índice com os agendamentos não cancelados que tocam o período
         """
-        salas_ativas = self.listar_salas(apenas_ativas=True)
-        salas_livres = []
+        if indice is None:
+            indice = IndiceOcupacao()
         
-        for sala in salas_ativas:
-            status = self.consultar_disponibilidade(sala.uuid, dataHora)
-            if status == "livre":
-                salas_livres.append(sala)
+        with self._get_conn() as conn, conn.cursor() as cur:
+            cur.execute("""
+                SELECT uuid, fk_sala_uuid, inicio, fim, status
+                FROM agendamento
+                WHERE status != 'CANCELADO'
+                  AND inicio <= %s
+                  AND fim >= %s;
+            """, (fim, inicio))
+            
+            indice.carregar(cur.fetchall())
         
-        return salas_livres
+        return indice
@@ -0,0 +1,421 @@
+import hashlib
+import os
+import secrets
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from backend.DB.conexao import Conexao
+from backend.models.usuario import Usuario
+from backend.services.tarefa_periodica import TarefaPeriodica
+
+
+def _digest(token: str) -> str:
+    """SHA-256 do token: o backend persistente nunca guarda o token em si."""
+    return hashlib.sha256(token.encode("utf-8")).hexdigest()
+
+
+class Sessao:
+    """
+    Sessão autenticada no servidor.
+
+    Attributes:
+        token: Token opaco entregue ao navegador (cookie)
+        usuario_id: Identificador do usuário (texto)
+        perfil: Perfil do usuário no momento do login
+        criada_em: Instante de criação (epoch, segundos)
+        expira_em: Instante de expiração (epoch, renovado a cada uso)
+        mascara: Máscara de permissões do perfil (Usuario.mascara_perfil)
+    """
+
+    __slots__ = ("token", "usuario_id", "perfil", "criada_em", "expira_em",
+                 "mascara", "persistida_ate", "verificada_em")
+
+    def __init__(self, token: str, usuario_id, perfil: str, criada_em: float, expira_em: float):
+        self.token = token
+        self.usuario_id = str(usuario_id)
+        self.perfil = perfil
+        self.criada_em = criada_em
+        self.expira_em = expira_em
+        self.mascara = Usuario.mascara_perfil(perfil)
+        # Controle do cache: expiração já gravada no backend e última checagem nele
+        self.persistida_ate = expira_em
+        self.verificada_em = criada_em
+
+    def __repr__(self) -> str:
+        return f"Sessao(usuario_id={self.usuario_id!r}, perfil={self.perfil!r}, expira_em={self.expira_em})"
+
+
+# ============================================================================
+# BACKENDS PERSISTENTES
+# ============================================================================
+
+class BackendSessaoSQLite:
+    """
+    Sessões em um arquivo SQLite (instalação em um único servidor).
+
+    Attributes:
+        caminho: Caminho do arquivo (":memory:" para testes)
+    """
+
+    def __init__(self, caminho: str):
+        self.caminho = caminho
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(caminho, check_same_thread=False, isolation_level=None)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("""
+            CREATE TABLE IF NOT EXISTS sessao (
+                token_hash TEXT PRIMARY KEY,
+                usuario_id TEXT NOT NULL,
+                perfil     TEXT NOT NULL,
+                criada_em  REAL NOT NULL,
+                expira_em  REAL NOT NULL
+            )
+        """)
+        self._conn.execute("CREATE INDEX IF NOT EXISTS idx_sessao_usuario ON sessao (usuario_id)")
+        self._conn.execute("CREATE INDEX IF NOT EXISTS idx_sessao_expira ON sessao (expira_em)")
+
+    def _executar(self, sql: str, parametros=()) -> sqlite3.Cursor:
+        with self._lock:
+            return self._conn.execute(sql, parametros)
+
+    def salvar(self, sessao: Sessao) -> None:
+        self._executar(
+            "INSERT OR REPLACE INTO sessao VALUES (?, ?, ?, ?, ?)",
+            (_digest(sessao.token), sessao.usuario_id, sessao.perfil,
+             sessao.criada_em, sessao.expira_em)
+        )
+
+    def buscar(self, token: str) -> Sessao | None:
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT usuario_id, perfil, criada_em, expira_em FROM sessao WHERE token_hash = ?",
+                (_digest(token),)
+            ).fetchone()
+        if row is None:
+            return None
+        return Sessao(token, row[0], row[1], row[2], row[3])
+
+    def renovar(self, token: str, expira_em: float) -> bool:
+        return self._executar(
+            "UPDATE sessao SET expira_em = ? WHERE token_hash = ?", (expira_em, _digest(token))
+        ).rowcount > 0
+
+    def excluir(self, token: str) -> None:
+        self._executar("DELETE FROM sessao WHERE token_hash = ?", (_digest(token),))
+
+    def excluir_usuario(self, usuario_id) -> int:
+        return self._executar("DELETE FROM sessao WHERE usuario_id = ?", (str(usuario_id),)).rowcount
+
+    def excluir_expiradas(self, agora: float) -> int:
+        return self._executar("DELETE FROM sessao WHERE expira_em <= ?", (agora,)).rowcount
+
+    def fechar(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+
+class BackendSessaoPostgres(Conexao):
+    """Sessões na tabela sessao do Postgres (vários processos/servidores)."""
+
+    def salvar(self, sessao: Sessao) -> None:
+        with self._get_conn() as conn, conn.cursor() as cur:
+            cur.execute("""
+                INSERT INTO sessao (token_hash, usuario_id, perfil, criada_em, expira_em)
+                VALUES (%s, %s, %s, to_timestamp(%s), to_timestamp(%s))
+                ON CONFLICT (token_hash) DO UPDATE SET expira_em = EXCLUDED.expira_em;
+            """, (_digest(sessao.token), sessao.usuario_id, sessao.perfil,
+                  sessao.criada_em, sessao.expira_em))
+            conn.commit()
+
+    def buscar(self, token: str) -> Sessao | None:
+        with self._get_conn() as conn, conn.cursor() as cur:
+            cur.execute("""
+                SELECT usuario_id, perfil,
+                       EXTRACT(EPOCH FROM criada_em) AS criada_em,
+                       EXTRACT(EPOCH FROM expira_em) AS expira_em
+                FROM sessao
+                WHERE token_hash = %s;
+            """, (_digest(token),))
+            row = cur.fetchone()
+        if row is None:
+            return None
+        return Sessao(token, row["usuario_id"], row["perfil"],
+                      float(row["criada_em"]), float(row["expira_em"]))
+
+    def renovar(self, token: str, expira_em: float) -> bool:
+        with self._get_conn() as conn, conn.cursor() as cur:
+            cur.execute(
+                "UPDATE sessao SET expira_em = to_timestamp(%s) WHERE token_hash = %s;",
+                (expira_em, _digest(token))
+            )
+            conn.commit()
+            return cur.rowcount > 0
+
+    def excluir(self, token: str) -> None:
+        with self._get_conn() as conn, conn.cursor() as cur:
+            cur.execute("DELETE FROM sessao WHERE token_hash = %s;", (_digest(token),))
+            conn.commit()
+
+    def excluir_usuario(self, usuario_id) -> int:
+        with self._get_conn() as conn, conn.cursor() as cur:
+            cur.execute("DELETE FROM sessao WHERE usuario_id = %s;", (str(usuario_id),))
+            conn.commit()
+            return cur.rowcount
+
+    def excluir_expiradas(self, agora: float) -> int:
+        with self._get_conn() as conn, conn.cursor() as cur:
+            cur.execute("DELETE FROM sessao WHERE expira_em <= to_timestamp(%s);", (agora,))
+            conn.commit()
+            return cur.rowcount
+
+
+# ============================================================================
+# GERENCIADOR
+# ============================================================================
+
+class GerenciadorSessoes:
+    """
+    Sessões no servidor com cache LRU em memória e backend persistente opcional.
+
+    O navegador guarda só um token opaco; validar uma sessão é uma busca
+    no dict do cache (O(1)), sem ida ao banco. A expiração é deslizante:
+    cada uso empurra expira_em para agora + ttl. O backend (SQLite ou
+    Postgres) só é tocado no login/logout, em cache miss (ex.: após
+    reinício), quando a renovação acumulada passa de `renovar_apos`
+    segundos e, com vários processos, a cada `revalidar_apos` segundos
+    para enxergar revogações feitas em outro processo.
+
+    Attributes:
+        ttl: Segundos de inatividade até a sessão expirar
+        max_em_cache: Máximo de sessões no cache (as menos usadas saem primeiro)
+        backend: BackendSessaoSQLite, BackendSessaoPostgres ou None (só memória)
+    """
+
+    def __init__(self, backend=None, ttl: float = 1800.0, max_em_cache: int = 10_000,
+                 renovar_apos: float | None = None, revalidar_apos: float = 60.0,
+                 relogio=time.time):
+        """
+        Inicializa o gerenciador.
+
+        Args:
+            backend: Backend persistente (None mantém tudo em memória)
+            ttl: Tempo de inatividade até expirar
+            max_em_cache: Capacidade do LRU
+            renovar_apos: Folga antes de regravar expira_em no backend (padrão: ttl/10)
+            revalidar_apos: Idade máxima de uma entrada do cache sem checar o backend
+            relogio: Função de tempo (epoch), substituível em testes
+
+        Raises:
+            ValueError: Se ttl ou capacidade forem inválidos
+        """
+        if ttl <= 0:
+            raise ValueError("ttl deve ser positivo")
+        if max_em_cache < 1:
+            raise ValueError("max_em_cache deve ser >= 1")
+
+        self.backend = backend
+        self.ttl = ttl
+        self.max_em_cache = max_em_cache
+        self.renovar_apos = ttl / 10 if renovar_apos is None else renovar_apos
+        self.revalidar_apos = revalidar_apos
+        self._relogio = relogio
+
+        self._cache = OrderedDict()   # token -> Sessao
+        self._por_usuario = {}        # usuario_id -> set(tokens)
+        self._lock = threading.RLock()
+
+        self._varredor = None
+
+    # ------------------------------------------------------------------
+    # Cache
+    # ------------------------------------------------------------------
+
+    def _guardar(self, sessao: Sessao) -> None:
+        with self._lock:
+            self._cache[sessao.token] = sessao
+            self._cache.move_to_end(sessao.token)
+            self._por_usuario.setdefault(sessao.usuario_id, set()).add(sessao.token)
+            while len(self._cache) > self.max_em_cache:
+                _, antiga = self._cache.popitem(last=False)
+                self._desindexar(antiga)
+
+    def _desindexar(self, sessao: Sessao) -> None:
+        tokens = self._por_usuario.get(sessao.usuario_id)
+        if tokens is not None:
+            tokens.discard(sessao.token)
+            if not tokens:
+                del self._por_usuario[sessao.usuario_id]
+
+    def _descartar(self, token: str) -> None:
+        with self._lock:
+            sessao = self._cache.pop(token, None)
+            if sessao is not None:
+                self._desindexar(sessao)
+
+    # ------------------------------------------------------------------
+    # API
+    # ------------------------------------------------------------------
+
+    def criar(self, usuario_id, perfil: str) -> str:
+        """
+        Cria uma sessão para o usuário.
+
+        Args:
+            usuario_id: Identificador do usuário
+            perfil: Perfil (ex.: PerfilUsuario.value)
+
+        Returns:
+            Token opaco (256 bits aleatórios, base64 url-safe)
+        """
+        agora = self._relogio()
+        sessao = Sessao(secrets.token_urlsafe(32), usuario_id, perfil, agora, agora + self.ttl)
+
+        if self.backend is not None:
+            self.backend.salvar(sessao)
+        self._guardar(sessao)
+        return sessao.token
+
+    def validar(self, token: str | None) -> Sessao | None:
+        """
+        Valida o token e renova a expiração (deslizante).
+
+        Args:
+            token: Token vindo do cookie
+
+        Returns:
+            Sessao se válida, None se inexistente, expirada ou revogada
+        """
+        if not token:
+            return None
+
+        agora = self._relogio()
+        with self._lock:
+            sessao = self._cache.get(token)
+            if sessao is not None:
+                self._cache.move_to_end(token)
+
+        if sessao is not None and self.backend is not None \
+                and agora - sessao.verificada_em > self.revalidar_apos:
+            # Entrada antiga: confere no backend se não foi revogada em outro processo
+            self._descartar(token)
+            sessao = None
+
+        if sessao is None:
+            if self.backend is None:
+                return None
+            sessao = self.backend.buscar(token)
+            if sessao is None:
+                return None
+            sessao.verificada_em = agora
+            self._guardar(sessao)
+
+        if sessao.expira_em <= agora:
+            self.revogar(token)
+            return None
+
+        sessao.expira_em = agora + self.ttl
+        if self.backend is not None and sessao.expira_em - sessao.persistida_ate > self.renovar_apos:
+            try:
+                self.backend.renovar(token, sessao.expira_em)
+                sessao.persistida_ate = sessao.expira_em
+            except Exception as e:
+                print(f"Aviso: não foi possível renovar a sessão no backend: {e}")
+
+        return sessao
+
+    def revogar(self, token: str) -> None:
+        """Encerra uma sessão (logout)."""
+        self._descartar(token)
+        if self.backend is not None:
+            self.backend.excluir(token)
+
+    def revogar_usuario(self, usuario_id) -> int:
+        """
+        Encerra todas as sessões de um usuário (ex.: ao desativá-lo).
+
+        Args:
+            usuario_id: Identificador do usuário
+
+        Returns:
+            Número de sessões revogadas
+        """
+        usuario_id = str(usuario_id)
+        with self._lock:
+            tokens = self._por_usuario.pop(usuario_id, set())
+            for token in tokens:
+                self._cache.pop(token, None)
+
+        if self.backend is not None:
+            return max(len(tokens), self.backend.excluir_usuario(usuario_id))
+        return len(tokens)
+
+    def varrer(self) -> int:
+        """
+        Remove sessões expiradas do cache e do backend.
+
+        Returns:
+            Número de sessões removidas
+        """
+        agora = self._relogio()
+        with self._lock:
+            expiradas = [s for s in self._cache.values() if s.expira_em <= agora]
+            for sessao in expiradas:
+                self._cache.pop(sessao.token, None)
+                self._desindexar(sessao)
+
+        removidas = len(expiradas)
+        if self.backend is not None:
+            removidas = max(removidas, self.backend.excluir_expiradas(agora))
+        return removidas
+
+    def iniciar_varredura(self, intervalo: float = 300.0) -> None:
+        """Inicia a thread (daemon) que chama varrer() a cada `intervalo` segundos."""
+        if self._varredor is None:
+            self._varredor = TarefaPeriodica("varredor-sessoes", self.varrer, intervalo)
+        self._varredor.iniciar()
+
+    def parar_varredura(self) -> None:
+        """Interrompe a thread de varredura."""
+        if self._varredor is not None:
+            self._varredor.parar()
+            self._varredor = None
+
+    def __len__(self) -> int:
+        return len(self._cache)
+
+
+# ============================================================================
+# GERENCIADOR DO PROCESSO
+# ============================================================================
+
+_gerenciador = None
+_gerenciador_lock = threading.Lock()
+
+
+def obter_gerenciador() -> GerenciadorSessoes:
+    """
+    Retorna o gerenciador de sessões compartilhado pelo processo.
+
+    Configurável por SESSAO_BACKEND ('memoria', 'sqlite' ou 'postgres'),
+    SESSAO_SQLITE_CAMINHO, SESSAO_TTL e SESSAO_VARREDURA (segundos).
+    """
+    global _gerenciador
+    with _gerenciador_lock:
+        if _gerenciador is None:
+            tipo = os.getenv("SESSAO_BACKEND", "memoria").lower()
+            if tipo == "sqlite":
+                backend = BackendSessaoSQLite(os.getenv("SESSAO_SQLITE_CAMINHO", "sessoes.db"))
+            elif tipo == "postgres":
+                backend = BackendSessaoPostgres()
+            elif tipo == "memoria":
+                backend = None
+            else:
+                raise ValueError(f"SESSAO_BACKEND inválido: {tipo}")
+
+            _gerenciador = GerenciadorSessoes(
+                backend=backend,
+                ttl=float(os.getenv("SESSAO_TTL", "1800")),
+            )
+            _gerenciador.iniciar_varredura(float(os.getenv("SESSAO_VARREDURA", "300")))
+        return _gerenciador
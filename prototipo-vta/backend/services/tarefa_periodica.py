@@ -0,0 +1,65 @@
+import threading
+
+
+class TarefaPeriodica:
+    """
+    Executa uma função de manutenção em uma thread daemon a cada `intervalo` segundos.
+
+    Usada para limpezas em segundo plano (sessões expiradas, tokens de
+    recuperação vencidos). Exceções da função são registradas e a tarefa
+    continua na próxima rodada.
+
+    Attributes:
+        nome: Nome da thread (aparece em logs e depuração)
+        intervalo: Segundos entre execuções
+        imediata: Executa a primeira rodada logo ao iniciar (senão, após um intervalo)
+    """
+
+    def __init__(self, nome: str, funcao, intervalo: float, imediata: bool = False):
+        """
+        Inicializa a tarefa (não inicia a thread).
+
+        Raises:
+            ValueError: Se o intervalo não for positivo
+        """
+        if intervalo <= 0:
+            raise ValueError("intervalo deve ser positivo")
+
+        self.nome = nome
+        self.intervalo = intervalo
+        self.imediata = imediata
+        self._funcao = funcao
+        self._parar = threading.Event()
+        self._thread = None
+
+    @property
+    def ativa(self) -> bool:
+        return self._thread is not None and self._thread.is_alive()
+
+    def iniciar(self) -> None:
+        """Inicia a thread (sem efeito se já estiver rodando)."""
+        if self.ativa:
+            return
+
+        self._parar.clear()
+        self._thread = threading.Thread(target=self._laco, name=self.nome, daemon=True)
+        self._thread.start()
+
+    def parar(self) -> None:
+        """Interrompe a thread e aguarda a rodada em andamento terminar."""
+        self._parar.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+
+    def _laco(self) -> None:
+        if self.imediata:
+            self._rodar()
+        while not self._parar.wait(self.intervalo):
+            self._rodar()
+
+    def _rodar(self) -> None:
+        try:
+            self._funcao()
+        except Exception as e:
+            print(f"Aviso: falha na tarefa {self.nome}: {e}")
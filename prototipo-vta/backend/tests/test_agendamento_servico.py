@@ -0,0 +1,278 @@
+import pytest
+from datetime import datetime, timedelta, timezone
+from unittest.mock import Mock, MagicMock, patch
+import psycopg2.errors
+
+# Importações
+from backend.services.agendamento_servico import AgendamentoServico
+from backend.services.indice_ocupacao import IndiceOcupacao
+
+
+# ============================================================================
+# FIXTURES
+# ============================================================================
+
+INICIO = datetime(2025, 11, 20, 9, 0, tzinfo=timezone.utc)
+FIM = INICIO + timedelta(minutes=30)
+
+
+@pytest.fixture
+def indice():
+    """Índice de ocupação vazio."""
+    return IndiceOcupacao()
+
+
+@pytest.fixture
+def servico(indice):
+    """Cria instância do serviço para testes."""
+    return AgendamentoServico(indice=indice)
+
+
+@pytest.fixture
+def mock_conn():
+    """Cria mock de conexão do banco."""
+    conn = MagicMock()
+    cursor = MagicMock()
+
+    conn.__enter__ = Mock(return_value=conn)
+    conn.__exit__ = Mock(return_value=False)
+    cursor.__enter__ = Mock(return_value=cursor)
+    cursor.__exit__ = Mock(return_value=False)
+
+    conn.cursor.return_value = cursor
+
+    return conn, cursor
+
+
+def criar(servico, **extra):
+    dados = dict(
+        sala_id="sala-1",
+        profissional_id="vet-1",
+        cliente_id="cliente-1",
+        pet_id="pet-1",
+        inicio=INICIO,
+        fim=FIM,
+        tipo_atendimento="Consulta",
+    )
+    dados.update(extra)
+    return servico.criar_agendamento(**dados)
+
+
+# ============================================================================
+# TESTES DE CRIAÇÃO
+# ============================================================================
+
+class TestCriarAgendamento:
+    """Testes do método criar_agendamento."""
+
+    def test_criar_sucesso(self, servico, mock_conn, indice):
+        """Deve inserir o agendamento e atualizar o índice."""
+        conn, cursor = mock_conn
+
+        with patch.object(servico, '_get_conn', return_value=conn):
+            agendamento = criar(servico)
+
+        assert agendamento is not None
+        assert agendamento.status == "AGENDADO"
+        sql = cursor.execute.call_args[0][0]
+        assert "INSERT INTO agendamento" in sql
+        # Nenhuma consulta prévia de conflito: o banco decide
+        assert cursor.execute.call_count == 1
+        assert indice.ocupada_em("sala-1", INICIO)
+
+    def test_conflito_retorna_none(self, servico, mock_conn, indice):
+        """Violação da restrição de exclusão deve virar None, sem exceção."""
+        conn, cursor = mock_conn
+        cursor.execute.side_effect = psycopg2.errors.ExclusionViolation()
+
+        with patch.object(servico, '_get_conn', return_value=conn):
+            agendamento = criar(servico)
+
+        assert agendamento is None
+        assert len(indice) == 0
+
+    def test_periodo_invalido(self, servico):
+        """Fim antes do início não deve chegar ao banco."""
+        with patch.object(servico, '_get_conn') as get_conn:
+            agendamento = criar(servico, fim=INICIO - timedelta(minutes=1))
+
+        assert agendamento is None
+        get_conn.assert_not_called()
+
+
+# ============================================================================
+# TESTES DE CANCELAMENTO E REMARCAÇÃO
+# ============================================================================
+
+class TestCancelarRemarcar:
+    """Testes de cancelar_agendamento e remarcar_agendamento."""
+
+    def test_cancelar_libera_indice(self, servico, mock_conn, indice):
+        """Cancelar deve remover o agendamento do índice."""
+        conn, cursor = mock_conn
+        with patch.object(servico, '_get_conn', return_value=conn):
+            agendamento = criar(servico)
+
+            cursor.rowcount = 1
+            assert servico.cancelar_agendamento(agendamento.id)
+
+        assert not indice.ocupada_em("sala-1", INICIO)
+
+    def test_cancelar_inexistente(self, servico, mock_conn):
+        """Deve retornar False se nada foi atualizado."""
+        conn, cursor = mock_conn
+        cursor.rowcount = 0
+
+        with patch.object(servico, '_get_conn', return_value=conn):
+            assert not servico.cancelar_agendamento("nao-existe")
+
+    def test_remarcar_conflito(self, servico, mock_conn):
+        """Conflito na remarcação deve retornar False."""
+        conn, cursor = mock_conn
+        cursor.execute.side_effect = psycopg2.errors.ExclusionViolation()
+
+        with patch.object(servico, '_get_conn', return_value=conn):
+            assert not servico.remarcar_agendamento("ag-1", INICIO, FIM)
+
+
+# ============================================================================
+# TESTES DA LEITURA POR PERÍODO (AGENDA)
+# ============================================================================
+
+def linha_agenda(uuid, minutos):
+    """Simula linha retornada pela consulta da agenda."""
+    inicio = INICIO + timedelta(minutes=minutos)
+    return {
+        "uuid": uuid,
+        "fk_sala_uuid": "sala-1",
+        "profissional": "vet-1",
+        "cliente": "cliente-1",
+        "pet": "pet-1",
+        "inicio": inicio,
+        "fim": inicio + timedelta(minutes=30),
+        "tipo_atendimento": "Consulta",
+        "status": "AGENDADO",
+    }
+
+
+class TestListarPeriodo:
+    """Testes do método listar_periodo."""
+
+    def test_pagina_com_cursor(self, servico, mock_conn):
+        """Deve buscar limite+1 linhas e devolver cursor da próxima página."""
+        conn, cursor = mock_conn
+        cursor.fetchall.return_value = [linha_agenda(f"ag-{i}", 30 * i) for i in range(3)]
+
+        with patch.object(servico, '_get_conn', return_value=conn):
+            itens, proximo = servico.listar_periodo(INICIO, INICIO + timedelta(days=7), limite=2)
+
+        assert [i["id"] for i in itens] == ["ag-0", "ag-1"]
+        assert proximo == f"{itens[-1]['inicio']}|ag-1"
+        assert cursor.execute.call_args[0][1]["limite"] == 3
+
+    def test_ultima_pagina_sem_cursor(self, servico, mock_conn):
+        """Sem linhas excedentes não há próxima página."""
+        conn, cursor = mock_conn
+        cursor.fetchall.return_value = [linha_agenda("ag-0", 0)]
+
+        with patch.object(servico, '_get_conn', return_value=conn):
+            itens, proximo = servico.listar_periodo(INICIO, INICIO + timedelta(days=1))
+
+        assert len(itens) == 1
+        assert proximo is None
+
+    def test_filtros_e_cursor_na_consulta(self, servico, mock_conn):
+        """Filtros e cursor devem virar condições da consulta indexada."""
+        conn, cursor = mock_conn
+        cursor.fetchall.return_value = []
+        cursor_anterior = f"{INICIO.isoformat()}|ag-9"
+
+        with patch.object(servico, '_get_conn', return_value=conn):
+            servico.listar_periodo(
+                INICIO, INICIO + timedelta(days=1),
+                sala_id="sala-1", status="agendado", cursor=cursor_anterior
+            )
+
+        sql, parametros = cursor.execute.call_args[0]
+        assert "fk_sala_uuid = %(sala)s" in sql
+        assert "(inicio, uuid) >" in sql
+        assert "ORDER BY inicio, uuid" in sql
+        # Sobreposição com a janela, não só início dentro dela
+        assert "tstzrange(inicio, fim, '[)') && tstzrange(%(inicio)s, %(fim)s, '[)')" in sql
+        assert parametros["status"] == "AGENDADO"
+        assert parametros["apos_uuid"] == "ag-9"
+
+    def test_cursor_invalido(self, servico):
+        """Cursor malformado deve gerar ValueError."""
+        with pytest.raises(ValueError, match="Cursor"):
+            servico.listar_periodo(INICIO, INICIO + timedelta(days=1), cursor="lixo")
+
+    def test_periodo_invalido(self, servico):
+        """Período invertido deve gerar ValueError."""
+        with pytest.raises(ValueError):
+            servico.listar_periodo(INICIO, INICIO)
+
+
+# ============================================================================
+# TESTES DE AGENDAMENTOS RECORRENTES
+# ============================================================================
+
+class TestCriarRecorrentes:
+    """Testes do método criar_recorrentes."""
+
+    def criar_serie(self, servico, tudo_ou_nada):
+        from backend.models.recorrencia import Recorrencia
+        return servico.criar_recorrentes(
+            sala_id="sala-1", profissional_id="vet-1", cliente_id="cliente-1",
+            pet_id="pet-1", inicio=INICIO, fim=FIM, tipo_atendimento="Fisioterapia",
+            recorrencia=Recorrencia("semanal", contagem=3),
+            tudo_ou_nada=tudo_ou_nada
+        )
+
+    def test_serie_livre_um_insert(self, servico, mock_conn, indice):
+        """Sem conflitos: uma consulta de verificação e um INSERT multi-linhas."""
+        conn, _ = mock_conn
+
+        def execute_values(cur, sql, linhas, **kwargs):
+            if "INSERT" in sql:
+                return [{"uuid": linha[0]} for linha in linhas]
+            return []
+
+        with patch.object(servico, '_get_conn', return_value=conn), \
+             patch("psycopg2.extras.execute_values", side_effect=execute_values) as ev:
+            resultado = self.criar_serie(servico, tudo_ou_nada=True)
+
+        assert len(resultado["criados"]) == 3
+        assert resultado["conflitos"] == []
+        assert ev.call_count == 2
+        assert len(indice) == 3
+
+    def test_tudo_ou_nada_com_conflito(self, servico, mock_conn):
+        """Um conflito impede a criação de toda a série."""
+        conn, _ = mock_conn
+
+        with patch.object(servico, '_get_conn', return_value=conn), \
+             patch("psycopg2.extras.execute_values",
+                   return_value=[{"idx": 1, "motivo": "sala"}]) as ev:
+            resultado = self.criar_serie(servico, tudo_ou_nada=True)
+
+        assert resultado["criados"] == []
+        assert resultado["conflitos"][0]["motivo"] == "sala"
+        assert ev.call_count == 1
+
+    def test_parcial_cria_ocorrencias_livres(self, servico, mock_conn):
+        """Modo por ocorrência: cria as livres e reporta as em conflito."""
+        conn, _ = mock_conn
+
+        def execute_values(cur, sql, linhas, **kwargs):
+            if "INSERT" in sql:
+                assert "ON CONFLICT DO NOTHING" in sql
+                return [{"uuid": linha[0]} for linha in linhas]
+            return [{"idx": 0, "motivo": "profissional"}]
+
+        with patch.object(servico, '_get_conn', return_value=conn), \
+             patch("psycopg2.extras.execute_values", side_effect=execute_values):
+            resultado = self.criar_serie(servico, tudo_ou_nada=False)
+
+        assert len(resultado["criados"]) == 2
+        assert [c["motivo"] for c in resultado["conflitos"]] == ["profissional"]
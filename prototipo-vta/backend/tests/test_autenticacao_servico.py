@@ -1,10 +1,13 @@
 import pytest
 from datetime import datetime, timezone, timedelta
 from uuid import uuid4
-from unittest.mock import Mock, MagicMock, patch
+from unittest.mock import Mock, MagicMock, PropertyMock, patch
 
 # Importações
 from backend.services.autenticacao_servico import AutenticacaoServico
+from backend.services.limitador_login import LimitadorLogin, LoginBloqueadoErro
+from backend.services.cache_usuarios import CacheUsuarios
+from backend.services.sessao import GerenciadorSessoes
 from backend.models.usuario import Usuario
 from backend.enums.perfil_usuario import PerfilUsuario
 from backend.enums.status_usuario import StatusUsuario
@@ -16,8 +19,12 @@ from backend.enums.status_usuario import StatusUsuario
 
 @pytest.fixture
 def servico():
-    """Cria instância do serviço para testes."""
-    return AutenticacaoServico()
+    """Cria instância do serviço para testes (limitador, sessões e cache próprios, não os do processo)."""
+    return AutenticacaoServico(
+        limitador=LimitadorLogin(),
+        sessoes=GerenciadorSessoes(),
+        cache_usuarios=CacheUsuarios()
+    )
 
 
 @pytest.fixture
@@ -118,6 +125,19 @@ class TestSessaoLogin:
         update_call = execute_calls[1][0][0]
         assert "UPDATE" in update_call.upper()
     
+    def test_login_bloqueado_nao_acessa_banco(self, mock_conn):
+        """Acima do limite deve recusar antes de consultar o banco."""
+        conn, cursor = mock_conn
+        cursor.fetchone.return_value = None
+        servico = AutenticacaoServico(limitador=LimitadorLogin(max_por_email=1))
+
+        with patch.object(servico, '_get_conn', return_value=conn) as get_conn:
+            servico.sessao_login("joao@example.com", "senha123", ip="10.0.0.1")
+            with pytest.raises(LoginBloqueadoErro):
+                servico.sessao_login("joao@example.com", "senha123", ip="10.0.0.1")
+
+        assert get_conn.call_count == 1
+
     def test_login_email_vazio(self, servico):
         """Deve retornar None para email vazio."""
         usuario = servico.sessao_login("", "senha123")
@@ -159,7 +179,7 @@ class TestCriarUsuario:
         execute_calls = cursor.execute.call_args_list
         insert_call = [c for c in execute_calls if "INSERT" in c[0][0].upper()]
         assert len(insert_call) == 1
-    
+
     def test_criar_usuario_email_duplicado(self, servico, mock_conn):
         """Deve retornar None se email já existe."""
         conn, cursor = mock_conn
@@ -308,6 +328,46 @@ class TestRecuperacaoSenha:
         execute_calls = cursor.execute.call_args_list
         insert_call = [c for c in execute_calls if "INSERT" in c[0][0].upper()]
         assert len(insert_call) == 1
+
+    def test_token_gravado_como_digest(self, servico, mock_conn):
+        """O banco deve receber só o SHA-256 do token, e a busca ser pelo digest."""
+        import hashlib
+        conn, cursor = mock_conn
+        cursor.fetchone.return_value = {"idusuario": 1}
+
+        with patch.object(servico, '_get_conn', return_value=conn):
+            token = servico.solicitar_recuperacao_senha("joao@example.com")
+
+        digest = hashlib.sha256(token.encode()).hexdigest()
+        insert_params = cursor.execute.call_args_list[-1][0][1]
+        assert token not in insert_params
+        assert digest in insert_params
+
+        cursor.fetchone.return_value = None
+        with patch.object(servico, '_get_conn', return_value=conn):
+            servico.redefinir_senha(token, "nova_senha_segura_123")
+
+        select_sql, select_params = cursor.execute.call_args[0]
+        assert "token_hash = %s" in select_sql
+        assert "JOIN" not in select_sql.upper()
+        assert select_params == (digest,)
+
+    def test_redefinir_senha_token_usado_em_paralelo(self, servico, mock_conn):
+        """Se outro pedido consumiu o token durante o hashing, deve falhar."""
+        conn, cursor = mock_conn
+        cursor.fetchone.return_value = {
+            "idtoken": 1,
+            "expiraem": datetime.now(timezone.utc) + timedelta(minutes=10),
+            "utilizado": False,
+            "idusuario": 1
+        }
+        cursor.rowcount = 0
+
+        with patch.object(servico, '_get_conn', return_value=conn):
+            sucesso = servico.redefinir_senha("token_valido", "nova_senha_segura_123")
+
+        assert sucesso is False
+        assert not any("UPDATE usuario" in c[0][0] for c in cursor.execute.call_args_list)
     
     def test_solicitar_recuperacao_email_nao_encontrado(self, servico, mock_conn):
         """Deve retornar None para email não encontrado."""
@@ -485,6 +545,71 @@ class TestGerenciamentoUsuarios:
         assert all(isinstance(u, Usuario) for u in usuarios)
         assert all(u.status == StatusUsuario.ATIVO for u in usuarios)
     
+    def test_listar_usuarios_ativos_usa_cache(self, servico, mock_conn):
+        """Segunda listagem não deve ir ao banco nem carregar hashes."""
+        conn, cursor = mock_conn
+        cursor.fetchall.return_value = [{
+            "idusuario": 1,
+            "uuid": str(uuid4()),
+            "nome": "Usuario 1",
+            "email": "u1@example.com",
+            "perfil": PerfilUsuario.ADMIN.value,
+            "status": StatusUsuario.ATIVO.value,
+            "ultimo_login": None
+        }]
+
+        with patch.object(servico, '_get_conn', return_value=conn):
+            servico.listar_usuarios_ativos()
+            servico.listar_usuarios_ativos()
+
+        assert cursor.execute.call_count == 1
+        sql = cursor.execute.call_args[0][0]
+        assert "senhahash" not in sql
+        assert "*" not in sql
+
+    def test_buscar_usuario_por_email_monta_usuario(self, servico, mock_conn):
+        """Registro do diretório (sem hash) deve virar um Usuario com o UUID da linha."""
+        conn, cursor = mock_conn
+        usuario_uuid = uuid4()
+        cursor.fetchone.return_value = {
+            "idusuario": 1,
+            "uuid": str(usuario_uuid),
+            "nome": "Maria Souza",
+            "email": "maria@example.com",
+            "perfil": PerfilUsuario.VETERINARIO.value,
+            "status": StatusUsuario.ATIVO.value,
+            "ultimo_login": None
+        }
+
+        with patch.object(servico, '_get_conn', return_value=conn):
+            usuario = servico.buscar_usuario_por_email("Maria@Example.com")
+            por_uuid = servico.buscar_usuario_por_uuid(usuario_uuid)
+
+        assert isinstance(usuario, Usuario)
+        assert usuario.usuario_id == str(usuario_uuid)
+        assert usuario.perfil == PerfilUsuario.VETERINARIO
+        assert usuario.senha_hash == Usuario.HASH_NAO_CARREGADO
+        assert por_uuid.email == "maria@example.com"
+        assert cursor.execute.call_count == 1  # segunda busca vem do cache
+
+    def test_escrita_invalida_cache(self, servico, mock_conn):
+        """Atualizar perfil deve invalidar o usuário e a listagem em cache."""
+        conn, cursor = mock_conn
+        cursor.rowcount = 1
+        servico.cache_usuarios.guardar_ativos([{
+            "idusuario": 1, "uuid": "u1", "nome": "João", "email": "joao@example.com",
+            "perfil": "veterinario", "status": "Ativo", "ultimo_login": None
+        }])
+
+        with patch.object(servico, '_get_conn', return_value=conn):
+            assert servico.verificar_email_disponivel("joao@example.com") is False
+            assert cursor.execute.call_count == 0
+
+            servico.atualizar_perfil_usuario("joao@example.com", PerfilUsuario.ADMIN)
+
+        assert servico.cache_usuarios.por_email("joao@example.com") is None
+        assert servico.cache_usuarios.ativos() is None
+
     def test_atualizar_perfil_sucesso(self, servico, mock_conn):
         """Deve atualizar perfil do usuário."""
         conn, cursor = mock_conn
@@ -521,6 +646,23 @@ class TestGerenciamentoUsuarios:
         
         assert sucesso is True
     
+    def test_desativar_usuario_revoga_sessoes(self, servico, mock_conn):
+        """Deve encerrar todas as sessões do usuário desativado."""
+        conn, cursor = mock_conn
+        cursor.rowcount = 1
+        usuario_uuid = str(uuid4())
+        cursor.fetchall.return_value = [{"uuid": usuario_uuid}]
+        servico.sessoes.criar(usuario_uuid, PerfilUsuario.VETERINARIO.value)
+        servico.sessoes.criar(usuario_uuid, PerfilUsuario.VETERINARIO.value)
+        outra = servico.sessoes.criar(str(uuid4()), PerfilUsuario.ADMIN.value)
+
+        with patch.object(servico, '_get_conn', return_value=conn):
+            assert servico.desativar_usuario("joao@example.com") is True
+
+        assert "RETURNING uuid" in cursor.execute.call_args[0][0]
+        assert len(servico.sessoes) == 1
+        assert servico.sessoes.validar(outra) is not None
+
     def test_reativar_usuario_sucesso(self, servico, mock_conn):
         """Deve reativar usuário."""
         conn, cursor = mock_conn
@@ -559,6 +701,19 @@ class TestInvalidarTokens:
         
         assert tokens_removidos == 5
 
+    def test_limpar_tokens_expirados_em_lotes(self, servico, mock_conn):
+        """Deve repetir DELETEs limitados até um lote vir incompleto."""
+        conn, cursor = mock_conn
+        type(cursor).rowcount = PropertyMock(side_effect=[2, 2, 1])
+
+        with patch.object(servico, '_get_conn', return_value=conn):
+            tokens_removidos = servico.limpar_tokens_expirados(lote=2, pausa=0)
+
+        assert tokens_removidos == 5
+        assert cursor.execute.call_count == 3
+        assert "LIMIT" in cursor.execute.call_args[0][0]
+        assert conn.commit.call_count == 3
+
 
 if __name__ == "__main__":
     pytest.main([__file__, "-v", "--tb=short"])
\ No newline at end of file
@@ -0,0 +1,139 @@
+"""
+Testes para o barramento (pub/sub) de notificações
+pytest test_barramento_notificacoes.py -v
+"""
+
+import json
+import pytest
+from unittest.mock import Mock, MagicMock, patch
+
+from backend.models.usuario import Usuario
+from backend.services.barramento_notificacoes import BarramentoNotificacoes, BarramentoPostgres
+from backend.services.notificacao_servico import NotificacaoServico
+
+
+# ============================================================================
+# FIXTURES
+# ============================================================================
+
+@pytest.fixture
+def barramento():
+    return BarramentoNotificacoes(max_fila=2)
+
+
+@pytest.fixture
+def usuario():
+    return Usuario(nome="Ana", email="ana@vta.com", senha_hash="x")
+
+
+@pytest.fixture
+def mock_conn():
+    """Cria mock de conexão do banco."""
+    conn = MagicMock()
+    cursor = MagicMock()
+
+    conn.__enter__ = Mock(return_value=conn)
+    conn.__exit__ = Mock(return_value=False)
+    cursor.__enter__ = Mock(return_value=cursor)
+    cursor.__exit__ = Mock(return_value=False)
+
+    conn.cursor.return_value = cursor
+
+    return conn, cursor
+
+
+# ============================================================================
+# TESTES
+# ============================================================================
+
+class TestBarramentoMemoria:
+
+    def test_entrega_so_ao_usuario(self, barramento):
+        ana = barramento.assinar("ana")
+        beto = barramento.assinar("beto")
+
+        assert barramento.publicar("ana", {"evento": "contador"}) == 1
+        assert ana.proximo(timeout=0) == {"evento": "contador"}
+        assert beto.proximo(timeout=0) is None
+
+    def test_varias_abas_recebem(self, barramento):
+        abas = [barramento.assinar("ana") for _ in range(3)]
+        assert barramento.publicar("ana", {"evento": "contador"}) == 3
+        assert all(aba.proximo(timeout=0) for aba in abas)
+
+    def test_fila_cheia_descarta_sem_bloquear(self, barramento):
+        lenta = barramento.assinar("ana")
+        for i in range(3):
+            barramento.publicar("ana", {"i": i})
+
+        assert [lenta.proximo(timeout=0) for _ in range(3)] == [{"i": 0}, {"i": 1}, None]
+
+    def test_cancelar_remove(self, barramento):
+        assinatura = barramento.assinar("ana")
+        barramento.cancelar(assinatura)
+
+        assert barramento.publicar("ana", {}) == 0
+        assert barramento.total_assinaturas() == 0
+
+
+class TestBarramentoPostgres:
+
+    def test_publicar_lote_um_comando(self, mock_conn):
+        conn, cursor = mock_conn
+        barramento = BarramentoPostgres()
+
+        with patch.object(barramento, '_get_conn', return_value=conn):
+            barramento.publicar_lote([("u1", {"evento": "a"}), ("u2", {"evento": "b"})])
+
+        cursor.execute.assert_called_once()
+        sql, (canal, payloads) = cursor.execute.call_args[0]
+        assert "unnest" in sql
+        assert canal == BarramentoPostgres.CANAL
+        assert [json.loads(p)["usuario_id"] for p in payloads] == ["u1", "u2"]
+
+    def test_repassa_notify_ao_barramento_local(self):
+        barramento = BarramentoPostgres()
+        assinatura = barramento.assinar("u1")
+
+        barramento._repassar(json.dumps({"usuario_id": "u1", "evento": {"evento": "contador"}}))
+        barramento._repassar("não é json")
+
+        assert assinatura.proximo(timeout=0) == {"evento": "contador"}
+        assert assinatura.proximo(timeout=0) is None
+
+
+class TestServicoPublica:
+
+    def test_enviar_publica_com_contagem(self, barramento, usuario):
+        servico = NotificacaoServico(barramento=barramento)
+        servico.contar_nao_lidas(usuario)
+        assinatura = barramento.assinar(usuario.usuario_id)
+
+        notificacao = servico.enviar(usuario, "Consulta confirmada")
+        evento = assinatura.proximo(timeout=0)
+
+        assert evento["evento"] == "notificacao"
+        assert evento["notificacao"]["notificacao_id"] == notificacao.notificacao_id
+        assert evento["nao_lidas"] == 1
+
+        servico.marcarComoLida(notificacao.notificacao_id)
+        assert assinatura.proximo(timeout=0) == {"evento": "contador", "nao_lidas": 0}
+
+    def test_enviar_em_lote_publica_uma_vez(self, usuario):
+        barramento = Mock()
+        outro = Usuario(nome="Beto", email="beto@vta.com", senha_hash="x")
+        servico = NotificacaoServico(barramento=barramento)
+
+        servico.enviar_em_lote([usuario, outro], "Clínica fecha às 16h", "aviso")
+
+        barramento.publicar_lote.assert_called_once()
+        eventos = barramento.publicar_lote.call_args[0][0]
+        assert [u for u, _ in eventos] == [usuario.usuario_id, outro.usuario_id]
+
+    def test_falha_no_barramento_nao_impede_envio(self, usuario):
+        barramento = Mock()
+        barramento.publicar.side_effect = RuntimeError("sem conexão")
+        servico = NotificacaoServico(barramento=barramento)
+
+        assert servico.enviar(usuario, "Mensagem") is not None
+        assert servico.contar_nao_lidas(usuario) == 1
@@ -0,0 +1,78 @@
+"""
+Testes para o cache do diretório de usuários
+pytest test_cache_usuarios.py -v
+"""
+
+import pytest
+
+from backend.services.cache_usuarios import CacheUsuarios
+
+
+# ============================================================================
+# FIXTURES
+# ============================================================================
+
+@pytest.fixture
+def cache(relogio):
+    return CacheUsuarios(ttl=60, relogio=relogio)
+
+
+def linha(uuid, email, nome="Fulano"):
+    """Simula uma linha do banco (com hash, que deve ser descartado)."""
+    return {
+        "idusuario": 1, "uuid": uuid, "nome": nome, "email": email,
+        "perfil": "admin", "status": "Ativo", "ultimo_login": None,
+        "senhahash": "600000$abc$def",
+    }
+
+
+# ============================================================================
+# TESTES
+# ============================================================================
+
+class TestCacheUsuarios:
+    """Testes do CacheUsuarios."""
+
+    def test_nunca_guarda_hash(self, cache):
+        registro = cache.guardar(linha("u1", "a@x.com"))
+
+        assert "senhahash" not in registro
+        assert "senhahash" not in cache.por_uuid("u1")
+
+    def test_busca_por_uuid_e_email_normalizado(self, cache):
+        cache.guardar(linha("u1", "a@x.com"))
+
+        assert cache.por_email("  A@X.com ")["uuid"] == "u1"
+        assert cache.por_uuid("u1")["email"] == "a@x.com"
+        assert cache.por_email("b@x.com") is None
+
+    def test_expira_apos_ttl(self, cache, relogio):
+        cache.guardar(linha("u1", "a@x.com"))
+        relogio.agora += 61
+
+        assert cache.por_uuid("u1") is None
+        assert cache.por_email("a@x.com") is None
+
+    def test_listagem_de_ativos(self, cache):
+        assert cache.ativos() is None
+
+        cache.guardar_ativos([linha("u2", "b@x.com", "Ana"), linha("u1", "a@x.com", "Bia")])
+
+        assert [r["nome"] for r in cache.ativos()] == ["Ana", "Bia"]
+        assert cache.por_email("a@x.com")["uuid"] == "u1"
+
+    def test_invalidar_remove_usuario_e_listagem(self, cache):
+        cache.guardar_ativos([linha("u1", "a@x.com"), linha("u2", "b@x.com")])
+
+        cache.invalidar(email="A@x.com")
+
+        assert cache.por_uuid("u1") is None
+        assert cache.por_uuid("u2") is not None
+        assert cache.ativos() is None
+
+    def test_troca_de_email_atualiza_indice(self, cache):
+        cache.guardar(linha("u1", "a@x.com"))
+        cache.guardar(linha("u1", "novo@x.com"))
+
+        assert cache.por_email("a@x.com") is None
+        assert cache.por_email("novo@x.com")["uuid"] == "u1"
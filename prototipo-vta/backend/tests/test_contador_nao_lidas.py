@@ -0,0 +1,105 @@
+"""
+Testes para o contador de notificações não lidas
+pytest test_contador_nao_lidas.py -v
+"""
+
+import pytest
+from unittest.mock import Mock
+
+from backend.models.notificacao import Notificacao
+from backend.models.usuario import Usuario
+from backend.services.contador_nao_lidas import ContadorNaoLidas
+from backend.services.notificacao_servico import NotificacaoServico
+
+
+# ============================================================================
+# FIXTURES
+# ============================================================================
+
+@pytest.fixture
+def usuario():
+    return Usuario(nome="Ana", email="ana@vta.com", senha_hash="x")
+
+
+# ============================================================================
+# TESTES
+# ============================================================================
+
+class TestContadorNaoLidas:
+
+    def test_ajuste_so_em_usuario_carregado(self, relogio):
+        contador = ContadorNaoLidas(ttl=30, relogio=relogio)
+        contador.ajustar("u1", 1)
+        assert contador.obter("u1") is None
+
+        contador.definir("u1", 2)
+        contador.ajustar("u1", 1)
+        assert contador.obter("u1") == 3
+
+    def test_nunca_fica_negativo(self, relogio):
+        contador = ContadorNaoLidas(relogio=relogio)
+        contador.definir("u1", 0)
+        contador.ajustar("u1", -1)
+        assert contador.obter("u1") == 0
+
+    def test_expira_pelo_ttl(self, relogio):
+        contador = ContadorNaoLidas(ttl=30, relogio=relogio)
+        contador.definir("u1", 5)
+        relogio.agora += 30
+        assert contador.obter("u1") is None
+
+    def test_ttl_invalido(self):
+        with pytest.raises(ValueError):
+            ContadorNaoLidas(ttl=0)
+
+
+class TestServicoComContador:
+
+    def test_write_through_em_memoria(self, usuario):
+        servico = NotificacaoServico()
+        assert servico.contar_nao_lidas(usuario) == 0
+
+        primeira = servico.enviar(usuario, "Primeira")
+        segunda = servico.enviar(usuario, "Segunda")
+        assert servico.contador.obter(usuario.usuario_id) == 2
+
+        servico.marcarComoLida(primeira.notificacao_id)
+        servico.marcarComoLida(primeira.notificacao_id)  # repetida não decrementa
+        assert servico.contar_nao_lidas(usuario) == 1
+
+        servico.excluir(segunda.notificacao_id)
+        assert servico.contar_nao_lidas(usuario) == 0
+        assert servico.contar_nao_lidas(usuario) == len(servico.listarNaoLidas(usuario))
+
+    def test_repositorio_consultado_uma_vez(self, usuario):
+        repositorio = Mock()
+        repositorio.contar_nao_lidas.return_value = 4
+        servico = NotificacaoServico(repositorio)
+
+        assert servico.contar_nao_lidas_por_id(usuario.usuario_id) == 4
+        servico.enviar(usuario, "Nova")
+        assert servico.contar_nao_lidas_por_id(usuario.usuario_id) == 5
+
+        repositorio.contar_nao_lidas.assert_called_once_with(usuario.usuario_id)
+        repositorio.buscar_por_usuario.assert_not_called()
+
+    def test_marcar_todas_zera_contador(self, usuario):
+        repositorio = Mock()
+        repositorio.marcar_todas_como_lidas.return_value = 3
+        servico = NotificacaoServico(repositorio)
+
+        servico.marcarTodasComoLidas(usuario)
+
+        assert servico.contar_nao_lidas(usuario) == 0
+        repositorio.contar_nao_lidas.assert_not_called()
+
+    def test_excluir_lida_nao_altera_contador(self, usuario):
+        lida = Notificacao(usuario_id=usuario.usuario_id, tipo="info", titulo="T", mensagem="M", lida=True)
+        repositorio = Mock()
+        repositorio.buscar_por_id.return_value = lida
+        repositorio.excluir.return_value = True
+        servico = NotificacaoServico(repositorio)
+        servico.contador.definir(usuario.usuario_id, 2)
+
+        assert servico.excluir(lida.notificacao_id) is True
+        assert servico.contar_nao_lidas(usuario) == 2
@@ -0,0 +1,81 @@
+"""
+Testes para o executor de hashing de senhas
+pytest test_executor_hash.py -v
+"""
+
+import time
+import pytest
+
+from backend.services.executor_hash import ExecutorHashSenha, HashSobrecarregadoErro
+from backend.models.usuario import Usuario
+
+
+# ============================================================================
+# FIXTURES
+# ============================================================================
+
+@pytest.fixture
+def executor():
+    """Executor com um processo e fila curta."""
+    ex = ExecutorHashSenha(max_processos=1, max_fila=1)
+    yield ex
+    ex.encerrar()
+
+
+# ============================================================================
+# TESTES
+# ============================================================================
+
+class TestExecutorHashSenha:
+    """Testes do ExecutorHashSenha."""
+
+    def test_gerar_e_validar_em_processo(self, executor):
+        """Hash gerado no pool deve ser validado pelo Usuario (e vice-versa)."""
+        senha_hash = executor.gerar_hash("senha_segura_123")
+
+        assert Usuario.validar_senha(senha_hash, "senha_segura_123")
+        assert executor.validar_senha(senha_hash, "senha_segura_123")
+        assert not executor.validar_senha(senha_hash, "errada")
+
+    def test_fila_cheia_falha_rapido(self, executor):
+        """Com a fila cheia deve recusar na hora, sem esperar."""
+        pendente = executor.submeter(time.sleep, 0.5)
+
+        inicio = time.monotonic()
+        with pytest.raises(HashSobrecarregadoErro):
+            executor.submeter(time.sleep, 0)
+        assert time.monotonic() - inicio < 0.1
+
+        pendente.result()
+        # Vaga liberada após a conclusão
+        executor.executar(time.sleep, 0)
+
+    def test_timeout_vira_sobrecarga(self):
+        """Resultado que não chega no timeout deve virar HashSobrecarregadoErro (503)."""
+        ex = ExecutorHashSenha(max_processos=1, max_fila=2, timeout=0.1)
+        try:
+            with pytest.raises(HashSobrecarregadoErro):
+                ex.executar(time.sleep, 1)
+        finally:
+            ex.encerrar()
+
+    def test_modo_sem_processos(self):
+        """max_processos=0 executa na própria thread (desenvolvimento/testes)."""
+        ex = ExecutorHashSenha(max_processos=0)
+        senha_hash = ex.gerar_hash("senha_segura_123")
+
+        assert ex.validar_senha(senha_hash, "senha_segura_123")
+
+    def test_erro_da_funcao_propagado_e_vaga_liberada(self):
+        """Exceção do hashing deve chegar ao chamador sem vazar vagas da fila."""
+        ex = ExecutorHashSenha(max_processos=0, max_fila=1)
+
+        for _ in range(3):
+            with pytest.raises(ValueError):
+                ex.gerar_hash("")
+
+    def test_limites_invalidos(self):
+        with pytest.raises(ValueError):
+            ExecutorHashSenha(max_processos=-1)
+        with pytest.raises(ValueError):
+            ExecutorHashSenha(max_fila=0)
@@ -0,0 +1,121 @@
+"""
+Testes para o heap de notificações urgentes
+pytest test_fila_urgentes.py -v
+"""
+
+import pytest
+from datetime import datetime, timedelta, timezone
+from unittest.mock import Mock
+
+from backend.models.notificacao import Notificacao
+from backend.models.usuario import Usuario
+from backend.services.barramento_notificacoes import BarramentoNotificacoes
+from backend.services.fila_urgentes import FilaUrgentes
+from backend.services.notificacao_servico import NotificacaoServico
+
+
+# ============================================================================
+# FIXTURES
+# ============================================================================
+
+@pytest.fixture
+def usuario():
+    return Usuario(nome="Ana", email="ana@vta.com", senha_hash="x")
+
+
+BASE = datetime(2025, 1, 10, 12, 0, tzinfo=timezone.utc)
+
+
+def notificacao(tipo, minutos=0, usuario_id="u1", lida=False):
+    """Notificação criada `minutos` antes de BASE."""
+    return Notificacao(usuario_id=usuario_id, tipo=tipo, titulo="T", mensagem=f"{tipo} {minutos}",
+                       criada_em=BASE - timedelta(minutes=minutos), lida=lida)
+
+
+# ============================================================================
+# TESTES
+# ============================================================================
+
+class TestFilaUrgentes:
+
+    def test_erro_antes_de_alerta_e_recente_primeiro(self, relogio):
+        fila = FilaUrgentes(relogio=relogio)
+        alerta = notificacao("alerta", 0)
+        erro_antigo = notificacao("erro", 10)
+        erro_novo = notificacao("erro", 1)
+        fila.carregar("u1", [alerta, erro_antigo, notificacao("info"), notificacao("erro", lida=True), erro_novo])
+
+        assert fila.listar("u1") == [erro_novo, erro_antigo, alerta]
+        assert fila.proxima("u1") is erro_novo
+
+    def test_remocao_preguicosa(self, relogio):
+        fila = FilaUrgentes(relogio=relogio)
+        itens = [notificacao("erro", i) for i in range(4)]
+        fila.carregar("u1", itens)
+
+        fila.remover("u1", itens[0].notificacao_id)
+        assert fila.proxima("u1") is itens[1]
+        assert itens[0] not in fila.listar("u1")
+
+    def test_adicionar_so_em_usuario_carregado(self, relogio):
+        fila = FilaUrgentes(relogio=relogio)
+        fila.adicionar(notificacao("erro"))
+        assert fila.listar("u1") is None
+
+        fila.carregar("u1", [])
+        nova = notificacao("alerta")
+        fila.adicionar(nova)
+        fila.adicionar(notificacao("info"))
+        assert fila.listar("u1") == [nova]
+
+    def test_expira_pelo_ttl(self, relogio):
+        fila = FilaUrgentes(ttl=30, relogio=relogio)
+        fila.carregar("u1", [notificacao("erro")])
+        relogio.agora += 30
+        assert fila.listar("u1") is None
+
+
+class TestServicoUrgentes:
+
+    def test_busca_urgentes_carrega_uma_vez_pelo_indice(self, usuario):
+        erro = notificacao("erro", usuario_id=usuario.usuario_id)
+        repositorio = Mock()
+        repositorio.buscar_por_tipo.return_value = [erro]
+        servico = NotificacaoServico(repositorio, barramento=BarramentoNotificacoes())
+
+        assert servico.buscar_urgentes(usuario) == [erro]
+        nova = servico.enviar(usuario, "Falha no envio do lembrete", tipo="alerta")
+        assert servico.buscar_urgentes(usuario) == [erro, nova]
+
+        repositorio.buscar_por_tipo.assert_called_once_with(usuario.usuario_id, ["erro", "alerta"], lida=False)
+        repositorio.buscar_por_usuario.assert_not_called()
+
+    def test_lida_sai_dos_urgentes(self, usuario):
+        servico = NotificacaoServico(barramento=BarramentoNotificacoes())
+        urgente = servico.enviar(usuario, "Sala indisponível", tipo="erro")
+        servico.enviar(usuario, "Bom dia", tipo="info")
+        assert servico.buscar_urgentes(usuario) == [urgente]
+
+        servico.marcarComoLida(urgente.notificacao_id)
+        assert servico.buscar_urgentes(usuario) == []
+
+    def test_buscar_por_tipo_usa_repositorio(self, usuario):
+        repositorio = Mock()
+        repositorio.buscar_por_tipo.return_value = []
+        servico = NotificacaoServico(repositorio, barramento=BarramentoNotificacoes())
+
+        servico.buscar_por_tipo(usuario, " Lembrete ")
+        assert servico.buscar_por_tipo(usuario, "inexistente") == []
+
+        repositorio.buscar_por_tipo.assert_called_once_with(usuario.usuario_id, ["lembrete"], limite=1000)
+
+    def test_stream_recebe_urgente_antes(self, usuario):
+        barramento = BarramentoNotificacoes()
+        servico = NotificacaoServico(barramento=barramento)
+        assinatura = barramento.assinar(usuario.usuario_id)
+
+        servico.enviar(usuario, "Lembrete", tipo="lembrete")
+        servico.enviar(usuario, "Erro na agenda", tipo="erro")
+
+        assert assinatura.proximo(timeout=0)["notificacao"]["tipo"] == "erro"
+        assert assinatura.proximo(timeout=0)["notificacao"]["tipo"] == "lembrete"
@@ -0,0 +1,154 @@
+import pytest
+from datetime import datetime, time, timedelta, timezone
+from unittest.mock import Mock, MagicMock, patch
+from zoneinfo import ZoneInfo
+
+# Importações
+from backend.services.horario_livre_servico import (
+    HorarioLivreServico,
+    janelas_livres,
+    mesclar_intervalos,
+)
+
+
+# ============================================================================
+# FIXTURES
+# ============================================================================
+
+FUSO = ZoneInfo("America/Sao_Paulo")
+SEGUNDA = datetime(2025, 11, 3, tzinfo=FUSO)  # segunda-feira, 00:00 (hora da clínica)
+
+
+def h(hora, minuto=0, dias=0):
+    """Atalho para horários a partir da segunda-feira de referência."""
+    return SEGUNDA + timedelta(days=dias, hours=hora, minutes=minuto)
+
+
+@pytest.fixture
+def servico():
+    """Cria instância do serviço para testes."""
+    return HorarioLivreServico(fuso="America/Sao_Paulo")
+
+
+@pytest.fixture
+def mock_conn():
+    """Cria mock de conexão do banco."""
+    conn = MagicMock()
+    cursor = MagicMock()
+
+    conn.__enter__ = Mock(return_value=conn)
+    conn.__exit__ = Mock(return_value=False)
+    cursor.__enter__ = Mock(return_value=cursor)
+    cursor.__exit__ = Mock(return_value=False)
+
+    conn.cursor.return_value = cursor
+
+    return conn, cursor
+
+
+# ============================================================================
+# TESTES DO ALGORITMO
+# ============================================================================
+
+class TestVarredura:
+    """Testes de mesclar_intervalos e janelas_livres."""
+
+    def test_mesclar_sobrepostos_e_encostados(self):
+        intervalos = [(h(10), h(11)), (h(8), h(9)), (h(9), h(9, 30)), (h(10, 30), h(12))]
+
+        assert mesclar_intervalos(intervalos) == [(h(8), h(9, 30)), (h(10), h(12))]
+
+    def test_janelas_livres(self):
+        ocupados = [(h(7), h(8, 30)), (h(10), h(11))]
+        expediente = [(h(8), h(12)), (h(8, dias=1), h(12, dias=1))]
+
+        assert janelas_livres(ocupados, expediente) == [
+            (h(8, 30), h(10)),
+            (h(11), h(12)),
+            (h(8, dias=1), h(12, dias=1)),
+        ]
+
+    def test_ocupacao_cobre_janela_inteira(self):
+        assert janelas_livres([(h(7), h(13))], [(h(8), h(12))]) == []
+
+
+# ============================================================================
+# TESTES DA BUSCA
+# ============================================================================
+
+class TestBuscarHorarios:
+    """Testes do método buscar_horarios."""
+
+    def test_primeiros_horarios_entre_salas_e_profissional(self, servico, mock_conn):
+        """Deve combinar ocupação das salas e do profissional e ordenar por horário."""
+        conn, cursor = mock_conn
+        cursor.fetchall.side_effect = [
+            [
+                {"sala_id": "s1", "nome": "Cirurgia 1", "inicio": h(8), "fim": h(10)},
+                {"sala_id": "s2", "nome": "Cirurgia 2", "inicio": None, "fim": None},
+            ],
+            # Profissional ocupado das 08:00 às 09:00 (em outra sala)
+            [{"inicio": h(8), "fim": h(9)}],
+        ]
+
+        with patch.object(servico, '_get_conn', return_value=conn):
+            horarios = servico.buscar_horarios(
+                duracao=timedelta(minutes=30),
+                inicio=h(7), fim=h(18, dias=4),
+                tipo_sala="Cirurgia", profissional_id="vet-1",
+                passo=timedelta(minutes=30), quantidade=3
+            )
+
+        assert [(x["sala"], x["inicio"]) for x in horarios] == [
+            ("Cirurgia 2", h(9)),
+            ("Cirurgia 2", h(9, 30)),
+            ("Cirurgia 1", h(10)),
+        ]
+        assert cursor.execute.call_count == 2
+
+    def test_respeita_expediente_e_alinhamento(self, servico, mock_conn):
+        """Horários alinhados ao passo e dentro do expediente (sábado/domingo fora)."""
+        conn, cursor = mock_conn
+        cursor.fetchall.return_value = [
+            {"sala_id": "s1", "nome": "Consultório", "inicio": None, "fim": None},
+        ]
+        sabado = h(9, 7, dias=5)
+
+        with patch.object(servico, '_get_conn', return_value=conn):
+            horarios = servico.buscar_horarios(
+                duracao=timedelta(minutes=45),
+                inicio=sabado, fim=sabado + timedelta(days=3),
+                abertura=time(9), fechamento=time(17),
+                dias_semana=frozenset(range(5)), quantidade=1
+            )
+
+        assert horarios[0]["inicio"] == h(9, dias=7)
+
+    def test_expediente_no_fuso_da_clinica(self, servico, mock_conn):
+        """Horizonte em UTC: abertura às 08:00 locais (11:00 UTC), não 08:00 UTC."""
+        conn, cursor = mock_conn
+        cursor.fetchall.return_value = [
+            {"sala_id": "s1", "nome": "Consultório", "inicio": None, "fim": None},
+        ]
+        inicio_utc = datetime(2025, 11, 3, 0, 0, tzinfo=timezone.utc)
+
+        with patch.object(servico, '_get_conn', return_value=conn):
+            horarios = servico.buscar_horarios(
+                duracao=timedelta(minutes=30), inicio=inicio_utc, fim=inicio_utc + timedelta(days=1),
+                quantidade=1
+            )
+
+        assert horarios[0]["inicio"] == datetime(2025, 11, 3, 11, 0, tzinfo=timezone.utc)
+        assert horarios[0]["inicio"].tzinfo == FUSO
+        assert horarios[0]["inicio"].hour == 8
+
+    def test_horizonte_sem_fuso(self, servico):
+        """datetime sem fuso não é comparável com as colunas TIMESTAMPTZ."""
+        with pytest.raises(ValueError, match="fuso"):
+            servico.buscar_horarios(timedelta(minutes=30), datetime(2025, 11, 3, 8), datetime(2025, 11, 3, 18))
+
+    def test_parametros_invalidos(self, servico):
+        with pytest.raises(ValueError):
+            servico.buscar_horarios(timedelta(0), h(8), h(9))
+        with pytest.raises(ValueError):
+            servico.buscar_horarios(timedelta(minutes=30), h(9), h(8))
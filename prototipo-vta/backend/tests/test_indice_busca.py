@@ -0,0 +1,222 @@
+"""
+Testes para a busca aproximada de clientes e pets
+pytest test_indice_busca.py -v
+"""
+
+import threading
+import time
+import pytest
+from datetime import date
+from unittest.mock import Mock, MagicMock, patch
+
+from backend.models.pet import Pet
+from backend.services import indice_busca as modulo_indice
+from backend.services.indice_busca import (
+    BuscaPostgres, CarregadorBusca, IndiceBusca, documento_cliente, documento_pet,
+    normalizar_telefone, normalizar_texto, trigramas, trigramas_de_inicio, trigramas_internos
+)
+from backend.services.pet_servico import PetServico
+
+
+# ============================================================================
+# FIXTURES
+# ============================================================================
+
+@pytest.fixture
+def indice():
+    indice = IndiceBusca()
+    indice.adicionar(*documento_cliente("c1", "João da Silva", "(11) 98765-4321", "joao@vta.com"))
+    indice.adicionar(*documento_cliente("c2", "Maria Conceição", "11 3333-2222", "maria@vta.com"))
+    indice.adicionar(*documento_pet(Pet(nome="Bóris", especie="Gato", raca="", nascimento=date(2020, 1, 1),
+                                        pet_id="p1", cliente_id="c1")))
+    return indice
+
+
+def ids(resultados):
+    return [r["id"] for r in resultados]
+
+
+# ============================================================================
+# TESTES
+# ============================================================================
+
+class TestNormalizacao:
+
+    def test_remove_acentos_e_caixa(self):
+        assert normalizar_texto("  JOÃO  da   Conceição ") == "joao da conceicao"
+
+    def test_telefone_so_digitos(self):
+        assert normalizar_telefone("(11) 98765-4321") == "11987654321"
+
+    def test_trigramas_com_preenchimento_do_pg_trgm(self):
+        assert trigramas("cat") == {"  c", " ca", "cat", "at "}
+
+    def test_trigramas_de_inicio(self):
+        assert trigramas_de_inicio("ana souza") == {" an", " so"}
+        assert trigramas_de_inicio("a") == {"  a"}
+
+    def test_trigramas_internos_de_palavra_curta(self):
+        assert trigramas_internos("jo") == {"  j", " jo"}
+        assert trigramas_internos("bor") == {"bor"}
+
+
+class TestBusca:
+
+    def test_sem_acento_encontra_com_acento(self, indice):
+        assert ids(indice.buscar("joao")) == ["c1"]
+        assert ids(indice.buscar("conceicao")) == ["c2"]
+
+    def test_parte_do_nome(self, indice):
+        resultado = indice.buscar("bor")
+        assert ids(resultado) == ["p1"]
+        assert resultado[0]["tipo"] == "pet"
+        assert resultado[0]["dados"]["nome"] == "Bóris"
+
+    def test_telefone_e_email(self, indice):
+        assert indice.buscar("98765-43")[0]["campo"] == "telefone"
+        assert indice.buscar("maria@vta")[0]["id"] == "c2"
+
+    def test_tolera_erro_de_digitacao(self, indice):
+        assert ids(indice.buscar("silvaa")) == ["c1"]
+
+    def test_filtra_por_tipo(self, indice):
+        assert indice.buscar("joao", tipos={"pet"}) == []
+
+    def test_filtro_por_tipo_antes_do_corte_de_candidatos(self):
+        """Muitos clientes parecidos não escondem o pet de nome exato."""
+        indice = IndiceBusca()
+        for i in range(500):
+            indice.adicionar(*documento_cliente(f"c{i}", f"Boris {i}"))
+        indice.adicionar(*documento_pet(Pet(nome="Boris", especie="Cão", raca="", nascimento=date(2020, 1, 1),
+                                            pet_id="p1", cliente_id="c1")))
+
+        assert ids(indice.buscar("boris", tipos={"pet"})) == ["p1"]
+        assert len(indice.buscar("boris", limite=5)) == 5
+
+    def test_exato_indexado_por_ultimo_entre_parciais(self):
+        """Empate na contagem de trigramas não deixa o nome exato fora dos pontuados."""
+        indice = IndiceBusca()
+        for i, nome in enumerate(["Adriana", "Mariana", "Luana"] * 1000):
+            indice.adicionar(*documento_cliente(f"c{i}", f"{nome} Souza"))
+        indice.adicionar(*documento_cliente("ana", "Ana Souza"))
+
+        assert ids(indice.buscar("Ana Souza", 5))[0] == "ana"
+        assert "ana" in ids(indice.buscar("ana", 5))
+
+    def test_ranking_prefere_mais_parecido(self):
+        indice = IndiceBusca()
+        indice.adicionar(*documento_cliente("a", "Mariana Souza"))
+        indice.adicionar(*documento_cliente("b", "Maria Souza"))
+        assert ids(indice.buscar("maria souza"))[0] == "b"
+
+    def test_reindexar_e_remover(self, indice):
+        indice.adicionar(*documento_cliente("c1", "Pedro Alves"))
+        assert indice.buscar("joao") == []
+        assert ids(indice.buscar("pedro")) == ["c1"]
+
+        assert indice.remover("cliente", "c1") is True
+        assert indice.remover("cliente", "c1") is False
+        assert indice.buscar("pedro") == []
+        assert len(indice) == 2
+
+    def test_compactacao_preserva_resultados(self):
+        indice = IndiceBusca()
+        for i in range(3000):
+            indice.adicionar(*documento_cliente(f"c{i}", f"Cliente {i}"))
+        for i in range(2500):
+            indice.remover("cliente", f"c{i}")
+
+        assert indice._removidos < 2500
+        assert ids(indice.buscar("cliente 2999"))[0] == "c2999"
+
+    def test_consulta_vazia(self, indice):
+        assert indice.buscar("  ") == []
+
+
+class TestIntegracoes:
+
+    def test_pet_servico_busca_por_nome(self):
+        servico = PetServico()
+        boris = servico.criar(Pet(nome="Bóris", especie="Gato", raca="", nascimento=date(2020, 1, 1)))
+        servico.criar(Pet(nome="Rex", especie="Cão", raca="", nascimento=date(2020, 1, 1)))
+
+        assert servico.buscar_por_nome("boris") == [boris]
+        servico.deletar(boris.pet_id)
+        assert servico.buscar_por_nome("boris") == []
+
+    def test_carregador_le_clientes_e_pets(self):
+        conn = MagicMock()
+        conn.__enter__ = Mock(return_value=conn)
+        conn.__exit__ = Mock(return_value=False)
+        clientes = MagicMock()
+        clientes.__enter__ = Mock(return_value=clientes)
+        clientes.__iter__ = Mock(return_value=iter([
+            {"uuid": "c1", "nome": "João", "telefone": None, "email": None}
+        ]))
+        pets = MagicMock()
+        pets.__enter__ = Mock(return_value=pets)
+        pets.__iter__ = Mock(return_value=iter([
+            {"uuid": "p1", "cliente_id": "c1", "nome": "Bóris", "especie": "Gato"}
+        ]))
+        conn.cursor.side_effect = [clientes, pets]
+        carregador = CarregadorBusca()
+
+        with patch.object(carregador, '_get_conn', return_value=conn):
+            indice = carregador.carregar()
+
+        assert len(indice) == 2
+        assert ids(indice.buscar("joao")) == ["c1"]
+        assert all("name" in chamada.kwargs for chamada in conn.cursor.call_args_list)
+
+    def test_busca_postgres_inclui_telefone(self):
+        cur = MagicMock()
+        cur.__enter__ = Mock(return_value=cur)
+        cur.fetchall.return_value = [{"tipo": "cliente", "id": "c1", "nome": "João", "pontuacao": 0.8}]
+        conn = MagicMock()
+        conn.__enter__ = Mock(return_value=conn)
+        conn.cursor.return_value = cur
+        busca = BuscaPostgres()
+
+        with patch.object(busca, '_get_conn', return_value=conn):
+            resultado = busca.buscar("(11) 98765")
+
+        sql, parametros = cur.execute.call_args.args
+        assert "<%% regexp_replace(telefone, '\\D', '', 'g')" in sql
+        assert parametros["d"] == "1198765"
+        assert ids(resultado) == ["c1"]
+
+        with patch.object(busca, '_get_conn', return_value=conn):
+            busca.buscar("jo")
+        assert cur.execute.call_args.args[1]["d"] is None
+
+    def test_indice_carregado_em_segundo_plano(self, monkeypatch):
+        """Até a primeira carga terminar não há índice; uma carga com erro é repetida."""
+        monkeypatch.setattr(modulo_indice, "_indice", None)
+        monkeypatch.setattr(modulo_indice, "_recarga", None)
+        monkeypatch.setenv("BUSCA_RECARGA", "0")
+        monkeypatch.setattr(modulo_indice, "INTERVALO_NOVA_TENTATIVA", 0.01)
+        liberar, pronto = threading.Event(), IndiceBusca()
+        tentativas = []
+
+        def carregar(self):
+            tentativas.append(1)
+            liberar.wait(5)
+            if len(tentativas) == 1:
+                raise RuntimeError("banco fora do ar")
+            return pronto
+
+        monkeypatch.setattr(CarregadorBusca, "carregar", carregar)
+        tarefa = modulo_indice.iniciar_indice_busca()
+        try:
+            assert modulo_indice.obter_indice_busca() is None
+            liberar.set()
+            for _ in range(500):
+                if modulo_indice.obter_indice_busca() is not None:
+                    break
+                time.sleep(0.01)
+
+            assert modulo_indice.obter_indice_busca() is pronto
+            assert modulo_indice.iniciar_indice_busca() is tarefa
+        finally:
+            tarefa.parar()
+        assert len(tentativas) == 2
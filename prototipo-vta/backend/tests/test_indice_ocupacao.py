@@ -0,0 +1,144 @@
+"""
+Testes para o índice de ocupação das salas (IndiceOcupacao)
+pytest test_indice_ocupacao.py -v
+"""
+
+import pytest
+from datetime import datetime, timedelta
+
+from backend.services.indice_ocupacao import IndiceOcupacao
+from backend.models.sala import Sala
+
+
+# ============================================================================
+# FIXTURES
+# ============================================================================
+
+BASE = datetime(2025, 11, 20, 8, 0)  # 08:00
+
+
+def linha(uuid, sala, inicio_h, fim_h, status="AGENDADO"):
+    """Simula uma linha do RealDictCursor da tabela agendamento."""
+    return {
+        "uuid": uuid,
+        "fk_sala_uuid": sala,
+        "inicio": BASE + timedelta(hours=inicio_h),
+        "fim": BASE + timedelta(hours=fim_h),
+        "status": status,
+    }
+
+
+@pytest.fixture
+def indice():
+    """Índice com agendamentos em duas salas."""
+    return IndiceOcupacao([
+        linha("a1", "sala-1", 0, 1),      # 08:00-09:00
+        linha("a2", "sala-1", 2, 3),      # 10:00-11:00
+        linha("a3", "sala-2", 1, 4),      # 09:00-12:00
+        linha("a4", "sala-2", 5, 6, status="CANCELADO"),
+    ])
+
+
+# ============================================================================
+# TESTES DE CONSULTA
+# ============================================================================
+
+class TestIndiceOcupacaoConsultas:
+    """Testes de ocupada_em / ocupada_entre / salas_livres."""
+
+    def test_carga_ignora_cancelados(self, indice):
+        """Agendamentos cancelados não devem ser indexados."""
+        assert len(indice) == 3
+        assert "a4" not in indice
+
+    def test_ocupada_em(self, indice):
+        """Deve responder ocupação em um instante."""
+        assert indice.ocupada_em("sala-1", BASE + timedelta(minutes=30))
+        assert not indice.ocupada_em("sala-1", BASE + timedelta(hours=1, minutes=30))
+        assert indice.ocupada_em("sala-2", BASE + timedelta(hours=3))
+        assert not indice.ocupada_em("sala-2", BASE + timedelta(hours=5, minutes=30))
+
+    def test_ocupada_em_limites_inclusivos(self, indice):
+        """Início e fim do agendamento contam como ocupados (igual a statusEm)."""
+        assert indice.ocupada_em("sala-1", BASE)
+        assert indice.ocupada_em("sala-1", BASE + timedelta(hours=1))
+
+    def test_sala_sem_agendamentos(self, indice):
+        """Sala desconhecida está livre."""
+        assert not indice.ocupada_em("sala-x", BASE)
+        assert not indice.ocupada_entre("sala-x", BASE, BASE + timedelta(hours=1))
+
+    def test_ocupada_entre_semiaberto(self, indice):
+        """Período encostado no fim de um agendamento não é conflito."""
+        assert not indice.ocupada_entre("sala-1", BASE + timedelta(hours=1), BASE + timedelta(hours=2))
+        assert indice.ocupada_entre("sala-1", BASE + timedelta(minutes=59), BASE + timedelta(hours=2))
+
+    def test_agendamento_longo_cobre_periodo(self, indice):
+        """Agendamento que começa bem antes do período deve ser encontrado."""
+        assert indice.ocupada_entre("sala-2", BASE + timedelta(hours=2), BASE + timedelta(hours=2, minutes=30))
+
+    def test_salas_livres(self, indice):
+        """Deve filtrar salas livres no período, mantendo a ordem."""
+        livres = indice.salas_livres(
+            ["sala-1", "sala-2", "sala-3"],
+            BASE + timedelta(hours=1),
+            BASE + timedelta(hours=2),
+        )
+        assert livres == ["sala-1", "sala-3"]
+
+
+# ============================================================================
+# TESTES DE ATUALIZAÇÃO INCREMENTAL
+# ============================================================================
+
+class TestIndiceOcupacaoAtualizacao:
+    """Testes de adicionar/remover."""
+
+    def test_adicionar_objeto(self, indice):
+        """Deve aceitar objetos com sala_id/id (modelo Agendamento)."""
+        class Reserva:
+            id = "n1"
+            sala_id = "sala-3"
+            inicio = BASE
+            fim = BASE + timedelta(hours=1)
+            status = "AGENDADO"
+
+        assert indice.adicionar(Reserva())
+        assert indice.ocupada_em("sala-3", BASE + timedelta(minutes=10))
+
+    def test_remover(self, indice):
+        """Cancelamento deve liberar a sala."""
+        assert indice.remover("a1")
+        assert not indice.ocupada_em("sala-1", BASE + timedelta(minutes=30))
+        assert not indice.remover("a1")
+
+    def test_adicionar_cancelado_remove(self, indice):
+        """Reindexar um agendamento como CANCELADO deve removê-lo."""
+        assert not indice.adicionar(linha("a2", "sala-1", 2, 3, status="CANCELADO"))
+        assert not indice.ocupada_em("sala-1", BASE + timedelta(hours=2, minutes=30))
+
+    def test_reindexar_move_horario(self, indice):
+        """Reindexar com o mesmo ID deve substituir o intervalo anterior."""
+        indice.adicionar(linha("a1", "sala-1", 6, 7))
+        assert not indice.ocupada_em("sala-1", BASE + timedelta(minutes=30))
+        assert indice.ocupada_em("sala-1", BASE + timedelta(hours=6, minutes=30))
+        assert len(indice) == 3
+
+
+# ============================================================================
+# TESTES DE INTEGRAÇÃO COM Sala.statusEm
+# ============================================================================
+
+class TestIndiceComSala:
+    """Sala.statusEm deve aceitar o índice no lugar da lista."""
+
+    def test_status_com_indice(self, indice):
+        sala = Sala("Consultório 1", "Consulta", sala_id="sala-1")
+
+        assert sala.statusEm(BASE + timedelta(minutes=30), indice) == "ocupada"
+        assert sala.statusEm(BASE + timedelta(hours=4), indice) == "livre"
+
+    def test_sala_inativa_com_indice(self, indice):
+        sala = Sala("Consultório 1", "Consulta", ativa=False, sala_id="sala-1")
+
+        assert sala.statusEm(BASE + timedelta(minutes=30), indice) == "bloqueada"
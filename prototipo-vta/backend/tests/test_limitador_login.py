@@ -0,0 +1,132 @@
+"""
+Testes para o limitador de tentativas de login
+pytest test_limitador_login.py -v
+"""
+
+import pytest
+from unittest.mock import Mock, MagicMock, patch
+
+from backend.services.limitador_login import (
+    BaldeMemoria,
+    BaldePostgres,
+    LimitadorLogin,
+    LoginBloqueadoErro,
+)
+
+
+# ============================================================================
+# FIXTURES
+# ============================================================================
+
+@pytest.fixture
+def limitador(relogio):
+    """3 tentativas por email, 5 por IP, janela de 60 s."""
+    return LimitadorLogin(
+        max_por_email=3, max_por_ip=5, janela=60.0,
+        memoria=BaldeMemoria(relogio=relogio)
+    )
+
+
+# ============================================================================
+# TESTES DO BALDE
+# ============================================================================
+
+class TestBaldeMemoria:
+    """Testes do token bucket em memória."""
+
+    def test_consome_e_repoe(self, relogio):
+        balde = BaldeMemoria(relogio=relogio)
+
+        assert [balde.consumir("k", 2, 60.0) for _ in range(2)] == [0.0, 0.0]
+        assert balde.consumir("k", 2, 60.0) == pytest.approx(30.0)
+
+        # Uma ficha a cada 30 s
+        relogio.agora += 30
+        assert balde.consumir("k", 2, 60.0) == 0.0
+
+    def test_recusa_nao_consome(self, relogio):
+        balde = BaldeMemoria(relogio=relogio)
+        balde.consumir("k", 1, 60.0)
+
+        for _ in range(10):
+            balde.consumir("k", 1, 60.0)
+
+        relogio.agora += 60
+        assert balde.consumir("k", 1, 60.0) == 0.0
+
+    def test_descarta_chaves_mais_antigas(self, relogio):
+        balde = BaldeMemoria(max_chaves=2, relogio=relogio)
+        for chave in ("a", "b", "c"):
+            balde.consumir(chave, 1, 60.0)
+
+        # "a" foi descartada: volta com capacidade cheia
+        assert balde.consumir("a", 1, 60.0) == 0.0
+        assert len(balde._baldes) == 2
+
+
+# ============================================================================
+# TESTES DO LIMITADOR
+# ============================================================================
+
+class TestLimitadorLogin:
+    """Testes do LimitadorLogin."""
+
+    def test_bloqueia_por_email(self, limitador):
+        for _ in range(3):
+            limitador.verificar("Joao@Example.com", "10.0.0.1")
+
+        with pytest.raises(LoginBloqueadoErro) as exc:
+            limitador.verificar("joao@example.com ", "10.0.0.2")
+        assert exc.value.retry_after == 20
+
+    def test_bloqueia_por_ip(self, limitador):
+        for i in range(5):
+            limitador.verificar(f"user{i}@example.com", "10.0.0.1")
+
+        with pytest.raises(LoginBloqueadoErro):
+            limitador.verificar("outro@example.com", "10.0.0.1")
+        limitador.verificar("outro@example.com", "10.0.0.2")
+
+    def test_sucesso_zera_limite_do_email(self, limitador):
+        for _ in range(3):
+            limitador.verificar("joao@example.com")
+
+        limitador.registrar_sucesso("joao@example.com")
+        limitador.verificar("joao@example.com")
+
+    def test_backend_compartilhado_consultado_apos_memoria(self, limitador):
+        backend = Mock()
+        backend.consumir.return_value = 12.5
+        limitador.backend = backend
+
+        with pytest.raises(LoginBloqueadoErro) as exc:
+            limitador.verificar("joao@example.com", "10.0.0.1")
+        assert exc.value.retry_after == 13
+        assert backend.consumir.call_count == 2
+
+    def test_parametros_invalidos(self):
+        with pytest.raises(ValueError):
+            LimitadorLogin(max_por_email=0)
+        with pytest.raises(ValueError):
+            LimitadorLogin(janela=0)
+
+
+class TestBaldePostgres:
+    """Testes do token bucket compartilhado."""
+
+    def test_saldo_negativo_recusa(self):
+        balde = BaldePostgres()
+        conn = MagicMock()
+        cursor = MagicMock()
+        conn.__enter__ = Mock(return_value=conn)
+        conn.__exit__ = Mock(return_value=False)
+        cursor.__enter__ = Mock(return_value=cursor)
+        cursor.__exit__ = Mock(return_value=False)
+        conn.cursor.return_value = cursor
+        cursor.fetchone.side_effect = [{"fichas": 2.0}, {"fichas": -0.5}]
+
+        with patch.object(balde, '_get_conn', return_value=conn):
+            assert balde.consumir("email:x", 5, 60.0) == 0.0
+            assert balde.consumir("email:x", 5, 60.0) == pytest.approx(6.0)
+
+        assert "ON CONFLICT (chave)" in cursor.execute.call_args[0][0]
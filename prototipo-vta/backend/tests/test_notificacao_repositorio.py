@@ -0,0 +1,305 @@
+"""
+Testes para o repositório de notificações e a paginação do serviço
+pytest test_notificacao_repositorio.py -v
+"""
+
+import pytest
+from datetime import datetime, timedelta, timezone
+from unittest.mock import Mock, MagicMock, PropertyMock, patch
+
+from backend.models.notificacao import Notificacao
+from backend.models.usuario import Usuario
+from backend.services.notificacao_repositorio import NotificacaoRepositorio
+from backend.services.notificacao_servico import NotificacaoServico
+
+
+# ============================================================================
+# FIXTURES
+# ============================================================================
+
+@pytest.fixture
+def repositorio():
+    return NotificacaoRepositorio()
+
+
+@pytest.fixture
+def mock_conn():
+    """Cria mock de conexão do banco."""
+    conn = MagicMock()
+    cursor = MagicMock()
+
+    conn.__enter__ = Mock(return_value=conn)
+    conn.__exit__ = Mock(return_value=False)
+    cursor.__enter__ = Mock(return_value=cursor)
+    cursor.__exit__ = Mock(return_value=False)
+
+    conn.cursor.return_value = cursor
+
+    return conn, cursor
+
+
+@pytest.fixture
+def usuario():
+    return Usuario(nome="Ana", email="ana@vta.com", senha_hash="x")
+
+
+BASE = datetime(2025, 1, 10, 12, 0, tzinfo=timezone.utc)
+
+
+def linha(indice, usuario_id="u1", lida=False):
+    """Linha do banco; índices maiores são mais antigos."""
+    return {
+        "notificacao_id": f"00000000-0000-0000-0000-{indice:012d}",
+        "usuario_id": usuario_id,
+        "tipo": "info",
+        "titulo": "Aviso",
+        "mensagem": f"Mensagem {indice}",
+        "criada_em": BASE - timedelta(minutes=indice),
+        "lida": lida,
+    }
+
+
+# ============================================================================
+# TESTES
+# ============================================================================
+
+class TestRepositorio:
+
+    def test_salvar_insere_colunas(self, repositorio, mock_conn):
+        conn, cursor = mock_conn
+        notificacao = Notificacao(usuario_id="u1", tipo="info", titulo="T", mensagem="M")
+
+        with patch.object(repositorio, '_get_conn', return_value=conn):
+            assert repositorio.salvar(notificacao) is notificacao
+
+        sql, valores = cursor.execute.call_args[0]
+        assert "INSERT INTO notificacao" in sql
+        assert valores[0] == notificacao.notificacao_id
+        conn.commit.assert_called_once()
+
+    def test_listar_pagina_usa_keyset(self, repositorio, mock_conn):
+        conn, cursor = mock_conn
+        cursor.fetchall.return_value = [linha(i) for i in range(3)]
+
+        with patch.object(repositorio, '_get_conn', return_value=conn):
+            itens, proximo = repositorio.listar_pagina("u1", limite=2)
+
+        sql, parametros = cursor.execute.call_args[0]
+        assert "ORDER BY criada_em DESC, notificacao_id DESC" in sql
+        assert "OFFSET" not in sql
+        assert parametros["limite"] == 3  # um a mais para detectar a próxima página
+        assert [n.mensagem for n in itens] == ["Mensagem 0", "Mensagem 1"]
+        assert NotificacaoRepositorio.ler_cursor(proximo) == (
+            itens[-1].criada_em, itens[-1].notificacao_id
+        )
+
+    def test_listar_pagina_com_cursor_filtra_pela_chave(self, repositorio, mock_conn):
+        conn, cursor = mock_conn
+        cursor.fetchall.return_value = [linha(5)]
+        anterior = NotificacaoRepositorio.gerar_cursor(BASE, "abc")
+
+        with patch.object(repositorio, '_get_conn', return_value=conn):
+            itens, proximo = repositorio.listar_pagina("u1", lida=False, limite=2, cursor=anterior)
+
+        sql, parametros = cursor.execute.call_args[0]
+        assert "(criada_em, notificacao_id) < (%(antes_criada)s, %(antes_id)s)" in sql
+        assert parametros["antes_criada"] == BASE
+        assert parametros["antes_id"] == "abc"
+        assert parametros["lida"] is False
+        assert len(itens) == 1
+        assert proximo is None
+
+    def test_buscar_por_usuario_sem_limite(self, repositorio, mock_conn):
+        conn, cursor = mock_conn
+        cursor.fetchall.return_value = [linha(i) for i in range(4)]
+
+        with patch.object(repositorio, '_get_conn', return_value=conn):
+            itens = repositorio.buscar_por_usuario("u1", lida=False)
+
+        sql, parametros = cursor.execute.call_args[0]
+        assert "LIMIT" not in sql
+        assert len(itens) == 4
+
+    @pytest.mark.parametrize("limite", [0, NotificacaoRepositorio.LIMITE_MAXIMO + 1])
+    def test_limite_invalido(self, repositorio, limite):
+        with pytest.raises(ValueError):
+            repositorio.listar_pagina("u1", limite=limite)
+
+    def test_cursor_invalido(self, repositorio):
+        with pytest.raises(ValueError, match="Cursor inválido"):
+            repositorio.listar_pagina("u1", cursor="lixo")
+
+    def test_atualizar_e_excluir_retornam_rowcount(self, repositorio, mock_conn):
+        conn, cursor = mock_conn
+        notificacao = NotificacaoRepositorio._criar_notificacao_from_row(linha(1))
+
+        with patch.object(repositorio, '_get_conn', return_value=conn):
+            cursor.rowcount = 1
+            assert repositorio.atualizar(notificacao) is True
+            cursor.rowcount = 0
+            assert repositorio.excluir(notificacao.notificacao_id) is False
+
+
+class TestOperacoesEmMassa:
+
+    def test_marcar_todas_como_lidas_um_update(self, repositorio, mock_conn):
+        conn, cursor = mock_conn
+        cursor.rowcount = 7
+
+        with patch.object(repositorio, '_get_conn', return_value=conn):
+            assert repositorio.marcar_todas_como_lidas("u1") == 7
+
+        cursor.execute.assert_called_once()
+        sql, parametros = cursor.execute.call_args[0]
+        assert "WHERE usuario_id = %s AND lida = FALSE" in sql
+        assert parametros == ("u1",)
+
+    def test_excluir_lidas_antes_em_lotes(self, repositorio, mock_conn):
+        conn, cursor = mock_conn
+        type(cursor).rowcount = PropertyMock(side_effect=[2, 2, 1])
+
+        with patch.object(repositorio, '_get_conn', return_value=conn):
+            total = repositorio.excluir_lidas_antes(BASE, lote=2, pausa=0)
+
+        assert total == 5
+        assert cursor.execute.call_count == 3
+        sql, parametros = cursor.execute.call_args[0]
+        assert "usuario_id" not in sql
+        assert parametros["lote"] == 2
+
+    def test_excluir_lidas_antes_de_um_usuario(self, repositorio, mock_conn):
+        conn, cursor = mock_conn
+        cursor.rowcount = 0
+
+        with patch.object(repositorio, '_get_conn', return_value=conn):
+            assert repositorio.excluir_lidas_antes(BASE, usuario_id="u1") == 0
+
+        sql, parametros = cursor.execute.call_args[0]
+        assert "usuario_id = %(usuario_id)s" in sql
+        assert parametros["usuario_id"] == "u1"
+
+    def test_servico_usa_operacoes_do_repositorio(self, usuario):
+        repositorio = Mock()
+        repositorio.marcar_todas_como_lidas.return_value = 3
+        repositorio.excluir_lidas_antes.return_value = 4
+        servico = NotificacaoServico(repositorio)
+
+        assert servico.marcarTodasComoLidas(usuario) == 3
+        assert servico.excluirAntigas(usuario, dias=30) == 4
+        assert servico.excluir_antigas_de_todos(dias=30) == 4
+
+        repositorio.atualizar.assert_not_called()
+        repositorio.excluir.assert_not_called()
+        _, kwargs = repositorio.excluir_lidas_antes.call_args
+        assert kwargs["usuario_id"] is None
+
+
+class TestEnvioEmLote:
+
+    def test_salvar_em_lote_um_execute_values(self, repositorio, mock_conn):
+        conn, cursor = mock_conn
+        notificacoes = [
+            Notificacao(usuario_id=f"u{i}", tipo="aviso", titulo="T", mensagem="M") for i in range(3)
+        ]
+
+        with patch.object(repositorio, '_get_conn', return_value=conn), \
+             patch('psycopg2.extras.execute_values') as execute_values:
+            assert repositorio.salvar_em_lote(notificacoes) == 3
+
+        execute_values.assert_called_once()
+        linhas = execute_values.call_args[0][2]
+        assert [l[1] for l in linhas] == ["u0", "u1", "u2"]
+        conn.commit.assert_called_once()
+
+    def test_salvar_em_lote_vazio_nao_abre_conexao(self, repositorio):
+        with patch.object(repositorio, '_get_conn') as get_conn:
+            assert repositorio.salvar_em_lote([]) == 0
+        get_conn.assert_not_called()
+
+    def test_enviar_em_lote_separa_inativos(self):
+        ativos = [Usuario(nome=f"U{i}", email=f"u{i}@vta.com", senha_hash="x") for i in range(3)]
+        inativo = Usuario(nome="Inativo", email="inativo@vta.com", senha_hash="x")
+        inativo.desativar()
+        repositorio = Mock()
+        servico = NotificacaoServico(repositorio)
+
+        criadas, ignorados = servico.enviar_em_lote(ativos + [inativo, ativos[0]], "Clínica fecha às 16h", "aviso")
+
+        assert [n.usuario_id for n in criadas] == [u.usuario_id for u in ativos]
+        assert ignorados == [inativo]
+        assert len({n.criada_em for n in criadas}) == 1
+        repositorio.salvar_em_lote.assert_called_once_with(criadas)
+        repositorio.salvar.assert_not_called()
+
+    def test_enviar_em_lote_valida_antes_de_gravar(self, usuario):
+        repositorio = Mock()
+        servico = NotificacaoServico(repositorio)
+
+        with pytest.raises(ValueError):
+            servico.enviar_em_lote([usuario], "Mensagem", tipo="inexistente")
+        with pytest.raises(ValueError):
+            servico.enviar_em_lote([usuario, "não é usuário"], "Mensagem")
+        repositorio.salvar_em_lote.assert_not_called()
+
+
+class TestServicoEmMemoria:
+
+    def test_enviar_e_listar_nao_lidas(self, usuario):
+        servico = NotificacaoServico()
+        primeira = servico.enviar(usuario, "Primeira")
+        segunda = servico.enviar(usuario, "Segunda")
+        servico.marcarComoLida(primeira.notificacao_id)
+
+        assert primeira.usuario_id == usuario.usuario_id
+        assert servico.listarNaoLidas(usuario) == [segunda]
+
+    def test_paginas_cobrem_todas_sem_repetir(self, usuario):
+        servico = NotificacaoServico()
+        for i in range(5):
+            servico._notificacoes_cache.append(
+                NotificacaoRepositorio._criar_notificacao_from_row(linha(i, usuario.usuario_id))
+            )
+
+        vistas = []
+        pagina, cursor = servico.listarPagina(usuario, limite=2)
+        vistas += pagina
+        while cursor:
+            pagina, cursor = servico.listarPagina(usuario, limite=2, cursor=cursor)
+            vistas += pagina
+
+        assert [n.mensagem for n in vistas] == [f"Mensagem {i}" for i in range(5)]
+
+    def test_listar_todas_delega_ao_repositorio(self, usuario):
+        repositorio = Mock()
+        repositorio.listar_pagina.return_value = ([], None)
+        servico = NotificacaoServico(repositorio)
+
+        assert servico.listarTodas(usuario, limite=10) == []
+        repositorio.listar_pagina.assert_called_once_with(usuario.usuario_id, limite=10, cursor=None)
+
+    def test_excluir_antigas_so_remove_lidas_velhas(self, usuario):
+        servico = NotificacaoServico()
+        velha_lida = Notificacao(usuario_id=usuario.usuario_id, tipo="info", titulo="T", mensagem="velha",
+                                 criada_em=datetime.now(timezone.utc) - timedelta(days=40), lida=True)
+        velha_nao_lida = Notificacao(usuario_id=usuario.usuario_id, tipo="info", titulo="T", mensagem="pendente",
+                                     criada_em=datetime.now(timezone.utc) - timedelta(days=40))
+        de_outro = Notificacao(usuario_id="outro", tipo="info", titulo="T", mensagem="outro",
+                               criada_em=datetime.now(timezone.utc) - timedelta(days=40), lida=True)
+        servico._notificacoes_cache += [velha_lida, velha_nao_lida, de_outro]
+
+        assert servico.excluirAntigas(usuario, dias=30) == 1
+        assert servico.excluir_antigas_de_todos(dias=30) == 1
+        assert servico._notificacoes_cache == [velha_nao_lida]
+
+    def test_excluir_antigas_conta_dias_completos(self, usuario):
+        """Como antes: só sai com mais de `dias` dias completos de idade."""
+        servico = NotificacaoServico()
+        agora = datetime.now(timezone.utc)
+        meio_dia_a_mais = Notificacao(usuario_id=usuario.usuario_id, tipo="info", titulo="T", mensagem="30,5",
+                                      criada_em=agora - timedelta(days=30, hours=12), lida=True)
+        dia_a_mais = Notificacao(usuario_id=usuario.usuario_id, tipo="info", titulo="T", mensagem="31,5",
+                                 criada_em=agora - timedelta(days=31, hours=12), lida=True)
+        servico._notificacoes_cache += [meio_dia_a_mais, dia_a_mais]
+
+        assert servico.excluirAntigas(usuario, dias=30) == 1
+        assert servico._notificacoes_cache == [meio_dia_a_mais]
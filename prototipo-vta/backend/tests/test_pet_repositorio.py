@@ -0,0 +1,145 @@
+"""
+Testes para o repositório de pets (Postgres)
+pytest test_pet_repositorio.py -v
+"""
+
+import pytest
+from datetime import date
+from unittest.mock import Mock, MagicMock, patch
+
+from backend.models.pet import Pet
+from backend.services.pet_repositorio import PetRepositorio
+
+
+# ============================================================================
+# FIXTURES
+# ============================================================================
+
+@pytest.fixture
+def repositorio():
+    return PetRepositorio()
+
+
+@pytest.fixture
+def mock_conn():
+    """Cria mock de conexão do banco."""
+    conn = MagicMock()
+    cursor = MagicMock()
+
+    conn.__enter__ = Mock(return_value=conn)
+    conn.__exit__ = Mock(return_value=False)
+    cursor.__enter__ = Mock(return_value=cursor)
+    cursor.__exit__ = Mock(return_value=False)
+
+    conn.cursor.return_value = cursor
+
+    return conn, cursor
+
+
+def linha(nome, cliente_id="c1", uuid=None):
+    return {
+        "uuid": uuid or f"pet-{nome.lower()}",
+        "cliente_id": cliente_id,
+        "nome": nome,
+        "especie": "Cachorro",
+        "raca": "SRD",
+        "nascimento": date(2020, 1, 1),
+    }
+
+
+# ============================================================================
+# TESTES
+# ============================================================================
+
+class TestListagem:
+
+    def test_pagina_com_filtros_e_cursor(self, repositorio, mock_conn):
+        conn, cursor = mock_conn
+        cursor.fetchall.return_value = [linha("Bidu"), linha("Bob"), linha("Boris")]
+
+        with patch.object(repositorio, '_get_conn', return_value=conn):
+            pets, proximo = repositorio.listar(cliente_id="c1", especie=" Cachorro ",
+                                               prefixo_nome="B", limite=2)
+
+        sql, parametros = cursor.execute.call_args[0]
+        assert 'ORDER BY lower(nome) COLLATE "C", uuid' in sql
+        assert parametros["especie"] == "cachorro"
+        assert parametros["prefixo"] == "b%"
+        assert parametros["limite"] == 3
+        assert [p.nome for p in pets] == ["Bidu", "Bob"]
+        assert proximo == "bob|pet-bob"
+
+    def test_segunda_pagina_usa_keyset(self, repositorio, mock_conn):
+        conn, cursor = mock_conn
+        cursor.fetchall.return_value = [linha("Boris")]
+
+        with patch.object(repositorio, '_get_conn', return_value=conn):
+            pets, proximo = repositorio.listar(limite=2, cursor="bob|pet-bob")
+
+        sql, parametros = cursor.execute.call_args[0]
+        assert "OFFSET" not in sql
+        assert (parametros["apos_nome"], parametros["apos_uuid"]) == ("bob", "pet-bob")
+        assert proximo is None
+
+    def test_prefixo_escapa_curingas(self, repositorio, mock_conn):
+        conn, cursor = mock_conn
+        cursor.fetchall.return_value = []
+
+        with patch.object(repositorio, '_get_conn', return_value=conn):
+            repositorio.listar(prefixo_nome="100%_")
+
+        assert cursor.execute.call_args[0][1]["prefixo"] == "100\\%\\_%"
+
+    def test_cursor_com_barra_no_nome(self):
+        assert PetRepositorio._ler_cursor("a|b|pet-1") == ("a|b", "pet-1")
+        with pytest.raises(ValueError, match="Cursor inválido"):
+            PetRepositorio._ler_cursor("sem separador")
+
+    @pytest.mark.parametrize("limite", [0, PetRepositorio.LIMITE_MAXIMO + 1])
+    def test_limite_invalido(self, repositorio, limite):
+        with pytest.raises(ValueError):
+            repositorio.listar(limite=limite)
+
+
+class TestCargaEmLote:
+
+    def test_uma_consulta_para_varios_clientes(self, repositorio, mock_conn):
+        conn, cursor = mock_conn
+        cursor.fetchall.return_value = [linha("Rex", "c1"), linha("Mia", "c2"), linha("Tom", "c1")]
+
+        with patch.object(repositorio, '_get_conn', return_value=conn):
+            pets = repositorio.buscar_por_clientes(["c1", "c2", "c3", "c1"])
+
+        cursor.execute.assert_called_once()
+        sql, (ids,) = cursor.execute.call_args[0]
+        assert "cliente_id = ANY(%s)" in sql
+        assert ids == ["c1", "c2", "c3"]
+        assert [p.nome for p in pets["c1"]] == ["Rex", "Tom"]
+        assert [p.nome for p in pets["c2"]] == ["Mia"]
+        assert pets["c3"] == []
+
+    def test_sem_clientes_nao_consulta(self, repositorio):
+        with patch.object(repositorio, '_get_conn') as get_conn:
+            assert repositorio.buscar_por_clientes([]) == {}
+        get_conn.assert_not_called()
+
+
+class TestEscrita:
+
+    def test_salvar_normaliza_ids(self, repositorio, mock_conn):
+        conn, cursor = mock_conn
+        pet = Pet(nome="Rex", especie="Cachorro", raca="SRD", nascimento=date(2020, 1, 1), cliente_id=7)
+
+        with patch.object(repositorio, '_get_conn', return_value=conn):
+            repositorio.salvar(pet)
+
+        valores = cursor.execute.call_args[0][1]
+        assert valores[:2] == (str(pet.pet_id), "7")
+        conn.commit.assert_called_once()
+
+    def test_deletar_inexistente(self, repositorio, mock_conn):
+        conn, cursor = mock_conn
+        cursor.rowcount = 0
+
+        with patch.object(repositorio, '_get_conn', return_value=conn):
+            assert repositorio.deletar("nao-existe") is False
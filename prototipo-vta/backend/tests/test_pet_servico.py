@@ -0,0 +1,94 @@
+"""
+Testes para o PetServico (armazenamento em memória indexado)
+pytest test_pet_servico.py -v
+"""
+
+import pytest
+from datetime import date
+from uuid import UUID, uuid4
+
+from backend.models.pet import Pet
+from backend.services.pet_servico import PetServico
+
+
+# ============================================================================
+# FIXTURES
+# ============================================================================
+
+@pytest.fixture
+def servico():
+    return PetServico()
+
+
+def novo_pet(nome="Rex", cliente_id=1, pet_id=None):
+    return Pet(nome=nome, especie="Cachorro", raca="SRD", nascimento=date(2020, 1, 1),
+               pet_id=pet_id, cliente_id=cliente_id)
+
+
+# ============================================================================
+# TESTES
+# ============================================================================
+
+class TestPetServico:
+
+    def test_criar_e_buscar_por_uuid_normalizado(self, servico):
+        pet_id = uuid4()
+        pet = servico.criar(novo_pet(pet_id=pet_id))
+
+        assert servico.buscar_por_uuid(pet_id) is pet
+        assert servico.buscar_por_uuid(str(pet_id)) is pet
+        assert servico.buscar_por_uuid(uuid4()) is None
+
+    def test_criar_duplicado_mesmo_com_tipos_diferentes(self, servico):
+        pet_id = uuid4()
+        servico.criar(novo_pet(pet_id=pet_id))
+
+        with pytest.raises(ValueError, match="já existe"):
+            servico.criar(novo_pet(pet_id=str(pet_id)))
+
+    def test_buscar_por_cliente_na_ordem_de_cadastro(self, servico):
+        rex = servico.criar(novo_pet("Rex", cliente_id=1))
+        mia = servico.criar(novo_pet("Mia", cliente_id=2))
+        bob = servico.criar(novo_pet("Bob", cliente_id=1))
+
+        assert servico.buscar_por_cliente(1) == [rex, bob]
+        assert servico.buscar_por_cliente(2) == [mia]
+        assert servico.buscar_por_cliente(99) == []
+
+    def test_atualizar_move_de_cliente_e_mantem_ordem(self, servico):
+        rex = servico.criar(novo_pet("Rex", cliente_id=1))
+        mia = servico.criar(novo_pet("Mia", cliente_id=1))
+
+        atualizado = novo_pet("Rex II", cliente_id=2, pet_id=rex.pet_id)
+        servico.atualizar(atualizado)
+
+        assert servico.buscar_por_cliente(1) == [mia]
+        assert servico.buscar_por_cliente(2) == [atualizado]
+        assert servico.listar_todos() == [atualizado, mia]
+
+    def test_atualizar_mesmo_objeto_alterado(self, servico):
+        rex = servico.criar(novo_pet(cliente_id=1))
+        rex.cliente_id = 3
+        servico.atualizar(rex)
+
+        assert servico.buscar_por_cliente(1) == []
+        assert servico.buscar_por_cliente(3) == [rex]
+
+    def test_atualizar_inexistente(self, servico):
+        with pytest.raises(ValueError, match="não encontrado"):
+            servico.atualizar(novo_pet())
+
+    def test_deletar(self, servico):
+        rex = servico.criar(novo_pet(cliente_id=1))
+
+        assert servico.deletar(UUID(rex.pet_id)) is True
+        assert servico.deletar(rex.pet_id) is False
+        assert servico.buscar_por_cliente(1) == []
+        assert servico.listar_todos() == []
+
+    def test_listagem_e_copia(self, servico):
+        servico.criar(novo_pet())
+        servico.listar_todos().clear()
+        servico.pets.clear()
+
+        assert len(servico.listar_todos()) == 1
@@ -0,0 +1,118 @@
+"""
+Testes para a política de hashing de senhas (rehash no login)
+pytest test_politica_hash.py -v
+"""
+
+import hashlib
+import pytest
+import threading
+from werkzeug.security import generate_password_hash
+
+from backend.models.usuario import Usuario
+from backend.services.executor_hash import ExecutorHashSenha
+from backend.services.politica_hash import (
+    FORMATO_PBKDF2,
+    FORMATO_SHA256_LEGADO,
+    FORMATO_WERKZEUG,
+    FORMATO_DESCONHECIDO,
+    PoliticaHash,
+    identificar_formato,
+    verificar_senha,
+)
+
+
+SENHA = "senha_segura_123"
+
+
+# ============================================================================
+# FIXTURES
+# ============================================================================
+
+@pytest.fixture
+def politica():
+    """Política com custo baixo para acelerar os testes."""
+    return PoliticaHash(versao=3, iteracoes=150_000)
+
+
+@pytest.fixture
+def executor():
+    """Executor na própria thread."""
+    return ExecutorHashSenha(max_processos=0)
+
+
+# ============================================================================
+# TESTES DE FORMATO E VERIFICAÇÃO
+# ============================================================================
+
+class TestVerificarSenha:
+    """Testes de identificar_formato e verificar_senha."""
+
+    def test_identificar_formatos(self):
+        assert identificar_formato(Usuario.hash_senha(SENHA, 100_000)) == FORMATO_PBKDF2
+        assert identificar_formato(generate_password_hash(SENHA)) == FORMATO_WERKZEUG
+        assert identificar_formato(hashlib.sha256(SENHA.encode()).hexdigest()) == FORMATO_SHA256_LEGADO
+        assert identificar_formato("") == FORMATO_DESCONHECIDO
+        assert identificar_formato(None) == FORMATO_DESCONHECIDO
+
+    @pytest.mark.parametrize("gerar", [
+        lambda s: Usuario.hash_senha(s, 100_000),
+        generate_password_hash,
+        lambda s: hashlib.sha256(s.encode()).hexdigest(),
+    ])
+    def test_verifica_todos_os_formatos(self, gerar):
+        senha_hash = gerar(SENHA)
+
+        assert verificar_senha(senha_hash, SENHA)
+        assert not verificar_senha(senha_hash, "errada")
+
+    def test_hash_desconhecido_nao_autentica(self):
+        assert not verificar_senha("lixo", SENHA)
+        assert not verificar_senha(Usuario.hash_senha(SENHA, 100_000), "")
+
+
+# ============================================================================
+# TESTES DA POLÍTICA
+# ============================================================================
+
+class TestPoliticaHash:
+    """Testes de precisa_rehash e rehash_em_segundo_plano."""
+
+    def test_precisa_rehash(self, politica):
+        assert politica.precisa_rehash(Usuario.hash_senha(SENHA, 100_000))
+        assert politica.precisa_rehash(generate_password_hash(SENHA))
+        assert politica.precisa_rehash(hashlib.sha256(SENHA.encode()).hexdigest())
+        assert not politica.precisa_rehash(politica.gerar(SENHA))
+
+    def test_iteracoes_abaixo_do_minimo(self):
+        with pytest.raises(ValueError):
+            PoliticaHash(iteracoes=1000)
+
+    def test_rehash_em_segundo_plano(self, politica, executor):
+        """Callback recebe hash no custo atual e a versão da política, fora da thread do pool."""
+        gravados = []
+        gravado = threading.Event()
+
+        def gravar(novo, versao):
+            gravados.append((novo, versao, threading.current_thread().name))
+            gravado.set()
+
+        assert politica.rehash_em_segundo_plano(executor, SENHA, gravar)
+        assert gravado.wait(5)
+
+        novo_hash, versao, thread = gravados[0]
+        assert thread.startswith("rehash-gravacao")
+        assert versao == 3
+        assert novo_hash.startswith("150000$")
+        assert verificar_senha(novo_hash, SENHA)
+
+    def test_rehash_com_fila_cheia_fica_para_depois(self, politica):
+        executor = ExecutorHashSenha(max_processos=0, max_fila=1)
+        executor._vagas.acquire()
+
+        assert not politica.rehash_em_segundo_plano(executor, SENHA, lambda *a: None)
+
+    def test_erro_ao_gravar_nao_propaga(self, politica, executor):
+        def falhar(novo, versao):
+            raise RuntimeError("banco fora")
+
+        assert politica.rehash_em_segundo_plano(executor, SENHA, falhar)
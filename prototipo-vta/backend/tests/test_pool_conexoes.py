@@ -0,0 +1,193 @@
+"""
+Testes para o pool de conexões (PoolConexoes)
+pytest test_pool_conexoes.py -v
+"""
+
+import pytest
+import psycopg2
+import psycopg2.extensions
+import psycopg2.pool
+from unittest.mock import MagicMock, patch
+
+from backend.DB.pool import PoolConexoes
+from backend.DB.conexao import Conexao
+
+
+# ============================================================================
+# FIXTURES
+# ============================================================================
+
+def nova_conexao_fake():
+    """Cria mock de conexão psycopg2 ociosa."""
+    conn = MagicMock()
+    conn.closed = 0
+    conn.info.transaction_status = psycopg2.extensions.TRANSACTION_STATUS_IDLE
+
+    def fechar():
+        conn.closed = 1
+    conn.close.side_effect = fechar
+    return conn
+
+
+@pytest.fixture
+def fabrica():
+    """Fábrica de conexões fake que registra as conexões abertas."""
+    fab = MagicMock(side_effect=nova_conexao_fake)
+    return fab
+
+
+@pytest.fixture
+def pool(fabrica):
+    """Pool pequeno para testes."""
+    return PoolConexoes(fabrica, minimo=1, maximo=2, timeout_espera=0.05)
+
+
+# ============================================================================
+# TESTES DE RETIRADA/DEVOLUÇÃO
+# ============================================================================
+
+class TestPoolConexoes:
+    """Testes do ciclo de vida das conexões no pool."""
+
+    def test_reutiliza_conexao_devolvida(self, pool, fabrica):
+        """Deve reaproveitar a conexão em vez de abrir outra."""
+        with pool.conexao() as conn1:
+            pass
+        with pool.conexao() as conn2:
+            pass
+
+        assert conn1 is conn2
+        assert fabrica.call_count == 1
+
+    def test_commit_ao_sair_sem_erro(self, pool):
+        """Deve fazer commit ao sair do bloco sem exceção."""
+        with pool.conexao() as conn:
+            pass
+
+        conn.commit.assert_called_once()
+        conn.rollback.assert_not_called()
+
+    def test_rollback_em_excecao(self, pool):
+        """Deve fazer rollback e devolver a conexão em caso de erro."""
+        with pytest.raises(ValueError):
+            with pool.conexao() as conn:
+                raise ValueError("falha")
+
+        conn.rollback.assert_called()
+        assert pool.estatisticas()["livres"] == 1
+        assert pool.estatisticas()["em_uso"] == 0
+
+    def test_descarta_conexao_com_erro_operacional(self, pool):
+        """Conexão derrubada pelo servidor não deve voltar ao pool."""
+        with pytest.raises(psycopg2.OperationalError):
+            with pool.conexao() as conn:
+                raise psycopg2.OperationalError("server closed the connection")
+
+        assert conn.closed
+        assert pool.estatisticas()["livres"] == 0
+
+    def test_pool_esgotado(self, pool):
+        """Deve falhar após o timeout quando todas as conexões estão em uso."""
+        c1 = pool.retirar()
+        c2 = pool.retirar()
+
+        with pytest.raises(psycopg2.pool.PoolError, match="esgotado"):
+            pool.retirar()
+
+        pool.devolver(c1)
+        pool.devolver(c2)
+
+    def test_pool_fechado(self, pool):
+        """Não deve emprestar conexões após fechar."""
+        pool.fechar()
+        with pytest.raises(psycopg2.pool.PoolError, match="fechado"):
+            pool.retirar()
+
+    def test_limites_invalidos(self, fabrica):
+        """Deve validar minimo/maximo."""
+        with pytest.raises(ValueError):
+            PoolConexoes(fabrica, minimo=5, maximo=2)
+
+
+# ============================================================================
+# TESTES DE HEALTH CHECK E RECOLHIMENTO
+# ============================================================================
+
+class TestPoolManutencao:
+    """Testes de verificação de saúde e recolhimento de ociosas."""
+
+    def test_substitui_conexao_fechada(self, pool, fabrica):
+        """Conexão fechada no pool deve ser trocada por uma nova."""
+        with pool.conexao() as conn1:
+            pass
+        conn1.closed = 1
+
+        with pool.conexao() as conn2:
+            pass
+
+        assert conn2 is not conn1
+        assert fabrica.call_count == 2
+
+    def test_health_check_falho_abre_nova(self, fabrica):
+        """Conexão ociosa que não responde ao SELECT 1 deve ser substituída."""
+        pool = PoolConexoes(fabrica, maximo=2, verificar_apos=0)
+        with pool.conexao() as conn1:
+            pass
+        conn1.cursor.return_value.__enter__.return_value.execute.side_effect = (
+            psycopg2.OperationalError("conexão perdida")
+        )
+
+        with pool.conexao() as conn2:
+            pass
+
+        assert conn2 is not conn1
+        assert conn1.closed
+
+    def test_recolhe_ociosas_acima_do_minimo(self, fabrica):
+        """Deve fechar conexões excedentes ociosas, preservando o mínimo."""
+        pool = PoolConexoes(fabrica, minimo=1, maximo=3, max_ociosa=0)
+        c1, c2, c3 = pool.retirar(), pool.retirar(), pool.retirar()
+        for c in (c1, c2, c3):
+            pool.devolver(c)
+
+        fechadas = pool.recolher_ociosas()
+
+        assert fechadas == 2
+        assert pool.estatisticas()["livres"] == 1
+
+    def test_rollback_de_transacao_pendente_na_devolucao(self, pool):
+        """Conexão com transação aberta deve voltar limpa ao pool."""
+        conn = pool.retirar()
+        conn.info.transaction_status = psycopg2.extensions.TRANSACTION_STATUS_INTRANS
+
+        pool.devolver(conn)
+
+        conn.rollback.assert_called_once()
+
+
+# ============================================================================
+# TESTES DE INTEGRAÇÃO COM Conexao
+# ============================================================================
+
+class TestConexaoPool:
+    """Testes do uso do pool pelas subclasses de Conexao."""
+
+    def test_instancias_compartilham_pool(self):
+        """Serviços com a mesma configuração devem usar o mesmo pool."""
+        a = Conexao("dbname='teste_pool'")
+        b = Conexao("dbname='teste_pool'")
+
+        assert a._pool() is b._pool()
+
+    def test_get_conn_usa_pool(self):
+        """_get_conn deve emprestar conexões do pool, sem reconectar."""
+        servico = Conexao("dbname='teste_pool_reuso'")
+
+        with patch("psycopg2.connect", side_effect=lambda *a, **k: nova_conexao_fake()) as connect:
+            with servico._get_conn() as conn1:
+                pass
+            with servico._get_conn() as conn2:
+                pass
+
+        assert conn1 is conn2
+        assert connect.call_count == 1
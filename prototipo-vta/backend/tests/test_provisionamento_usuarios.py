@@ -0,0 +1,171 @@
+"""
+Testes para a importação em massa de usuários
+pytest test_provisionamento_usuarios.py -v
+"""
+
+import io
+import pytest
+from unittest.mock import Mock, MagicMock, patch
+
+from backend.enums.perfil_usuario import PerfilUsuario
+from backend.models.usuario import Usuario
+from backend.services.cache_usuarios import CacheUsuarios
+from backend.services.executor_hash import ExecutorHashSenha
+from backend.services.politica_hash import PoliticaHash
+from backend.services.provisionamento_usuarios import ProvisionamentoUsuarios
+
+
+# ============================================================================
+# FIXTURES
+# ============================================================================
+
+@pytest.fixture
+def servico():
+    """Serviço com hashing na própria thread e custo mínimo."""
+    return ProvisionamentoUsuarios(
+        executor_hash=ExecutorHashSenha(max_processos=0, max_fila=2),
+        politica_hash=PoliticaHash(versao=2, iteracoes=100_000),
+        cache_usuarios=CacheUsuarios()
+    )
+
+
+@pytest.fixture
+def mock_conn():
+    """Cria mock de conexão do banco."""
+    conn = MagicMock()
+    cursor = MagicMock()
+
+    conn.__enter__ = Mock(return_value=conn)
+    conn.__exit__ = Mock(return_value=False)
+    cursor.__enter__ = Mock(return_value=cursor)
+    cursor.__exit__ = Mock(return_value=False)
+
+    conn.cursor.return_value = cursor
+
+    return conn, cursor
+
+
+def execute_values_fake(inseridos):
+    """Simula execute_values devolvendo os emails efetivamente inseridos em usuario."""
+    def execute_values(cur, sql, linhas, **kwargs):
+        if "INSERT INTO usuarios" in sql:
+            execute_values.login = linhas
+            return None
+        execute_values.linhas = linhas
+        return [{"email": linha[2]} for linha in linhas if linha[2] in inseridos]
+    execute_values.login = None
+    return execute_values
+
+
+# ============================================================================
+# TESTES
+# ============================================================================
+
+class TestImportar:
+    """Testes do método importar."""
+
+    def test_relatorio_com_falhas_por_linha(self, servico, mock_conn):
+        """Linhas inválidas, duplicadas e já cadastradas não abortam o lote."""
+        conn, cursor = mock_conn
+        cursor.fetchall.return_value = [{"email": "ja@vta.com"}]
+        registros = [
+            {"nome": "Ana", "email": "Ana@VTA.com", "senha": "senha_segura_1", "perfil": "Veterinário"},
+            {"nome": "", "email": "x@vta.com", "senha": "senha_segura_1"},
+            {"nome": "Ana 2", "email": "ana@vta.com", "senha": "senha_segura_1"},
+            {"nome": "Já", "email": "ja@vta.com", "senha": "senha_segura_1"},
+            {"nome": "Bia", "email": "bia@vta.com", "senha": "curta"},
+            {"nome": "Caio", "email": "caio@vta.com", "senha": "senha_segura_1", "perfil": "gerente"},
+            {"nome": "Duda", "email": "duda@vta.com", "senha": "senha_segura_1"},
+        ]
+        fake = execute_values_fake({"ana@vta.com", "duda@vta.com"})
+
+        with patch.object(servico, '_get_conn', return_value=conn), \
+             patch("psycopg2.extras.execute_values", side_effect=fake) as ev:
+            relatorio = servico.importar(registros)
+
+        assert relatorio["total"] == 7
+        assert [c["email"] for c in relatorio["criados"]] == ["ana@vta.com", "duda@vta.com"]
+        assert [f["linha"] for f in relatorio["falhas"]] == [2, 3, 4, 5, 6]
+        assert "linha 1" in relatorio["falhas"][1]["erro"]
+
+        # Um INSERT multi-linhas por tabela, uma transação
+        assert ev.call_count == 2
+        assert conn.commit.call_count == 1
+        linhas = fake.linhas
+        assert linhas[0][5] == PerfilUsuario.VETERINARIO.value
+        assert linhas[1][5] == PerfilUsuario.RECEPCIONISTA.value
+        assert Usuario.validar_senha(linhas[0][3], "senha_segura_1")
+
+        # Só os criados em usuario vão para a tabela do login, com o mesmo hash
+        assert [linha[1] for linha in fake.login] == ["ana@vta.com", "duda@vta.com"]
+        assert fake.login[0][2] == linhas[0][3]
+        assert [linha[3] for linha in fake.login] == ["Veterinário", "Recepcionista"]
+
+    def test_conflito_no_insert_vira_falha(self, servico, mock_conn):
+        """Email criado por outro processo entre a checagem e o INSERT."""
+        conn, cursor = mock_conn
+        cursor.fetchall.return_value = []
+
+        fake = execute_values_fake(set())
+
+        with patch.object(servico, '_get_conn', return_value=conn), \
+             patch("psycopg2.extras.execute_values", side_effect=fake):
+            relatorio = servico.importar([{"nome": "Ana", "email": "ana@vta.com", "senha": "senha_segura_1"}])
+
+        assert fake.login is None
+        assert relatorio["criados"] == []
+        assert relatorio["falhas"][0]["erro"] == "Email já cadastrado"
+
+    def test_nada_valido_nao_acessa_banco(self, servico):
+        with patch.object(servico, '_get_conn') as get_conn:
+            relatorio = servico.importar([{"nome": "Ana", "email": "invalido", "senha": "senha_segura_1"}, "x"])
+
+        assert len(relatorio["falhas"]) == 2
+        get_conn.assert_not_called()
+
+    def test_senha_so_espacos_e_campos_nao_texto_viram_falha(self, servico, mock_conn):
+        """Senha de espaços e campos não-texto (JSON) são falhas da linha, não do lote."""
+        conn, cursor = mock_conn
+        cursor.fetchall.return_value = []
+        registros = [
+            {"nome": "Ana", "email": "ana@vta.com", "senha": " " * 8},
+            {"nome": 42, "email": "bia@vta.com", "senha": "senha_segura_1"},
+            {"nome": "Caio", "email": ["caio@vta.com"], "senha": "senha_segura_1"},
+            {"nome": "Duda", "email": "duda@vta.com", "senha": 12345678},
+            {"nome": "Eva", "email": "eva@vta.com", "senha": "senha_segura_1"},
+        ]
+
+        with patch.object(servico, '_get_conn', return_value=conn), \
+             patch("psycopg2.extras.execute_values", side_effect=execute_values_fake({"eva@vta.com"})):
+            relatorio = servico.importar(registros)
+
+        assert [c["email"] for c in relatorio["criados"]] == ["eva@vta.com"]
+        assert [f["linha"] for f in relatorio["falhas"]] == [1, 2, 3, 4]
+        assert "nome" in relatorio["falhas"][1]["erro"]
+        assert relatorio["falhas"][2]["email"] is None
+        assert "senha" in relatorio["falhas"][3]["erro"]
+
+    def test_hashes_na_ordem_com_fila_limitada(self, servico):
+        """Mais senhas que a fila do executor: hashes na mesma ordem da entrada."""
+        senhas = [f"senha_segura_{i}" for i in range(5)]
+
+        hashes = servico._gerar_hashes(senhas)
+
+        assert all(Usuario.validar_senha(h, s) for h, s in zip(hashes, senhas))
+
+
+class TestLeitura:
+    """Testes da leitura de CSV e JSON."""
+
+    def test_ler_csv(self):
+        arquivo = io.StringIO("nome,email,senha,perfil\nAna,ana@vta.com,senha_segura_1,admin\n")
+
+        assert ProvisionamentoUsuarios.ler_csv(arquivo) == [
+            {"nome": "Ana", "email": "ana@vta.com", "senha": "senha_segura_1", "perfil": "admin"}
+        ]
+
+    def test_ler_json(self):
+        assert ProvisionamentoUsuarios.ler_json(io.StringIO('[{"nome": "Ana"}]')) == [{"nome": "Ana"}]
+
+        with pytest.raises(ValueError):
+            ProvisionamentoUsuarios.ler_json(io.StringIO('{"nome": "Ana"}'))
@@ -0,0 +1,82 @@
+"""
+Testes para a regra de recorrência de agendamentos
+pytest test_recorrencia.py -v
+"""
+
+import pytest
+from datetime import datetime, timedelta
+
+from backend.models.recorrencia import Recorrencia
+
+
+INICIO = datetime(2025, 11, 3, 9, 0)  # segunda-feira, 09:00
+FIM = INICIO + timedelta(minutes=45)
+
+
+class TestRecorrenciaValidacoes:
+    """Testes do construtor."""
+
+    def test_frequencia_invalida(self):
+        with pytest.raises(ValueError, match="Frequência inválida"):
+            Recorrencia("mensal", contagem=3)
+
+    def test_sem_limite(self):
+        """Regra sem contagem e sem data limite é rejeitada."""
+        with pytest.raises(ValueError, match="contagem ou data limite"):
+            Recorrencia("diaria")
+
+    def test_intervalo_invalido(self):
+        with pytest.raises(ValueError, match="Intervalo"):
+            Recorrencia("diaria", intervalo=0, contagem=2)
+
+    def test_dias_semana_so_semanal(self):
+        with pytest.raises(ValueError, match="semanal"):
+            Recorrencia("diaria", contagem=2, dias_semana={0})
+
+
+class TestRecorrenciaExpandir:
+    """Testes da geração de ocorrências."""
+
+    def test_a_cada_n_dias_com_contagem(self):
+        """Série de vacinas: 3 doses a cada 21 dias."""
+        ocorrencias = Recorrencia("diaria", intervalo=21, contagem=3).expandir(INICIO, FIM)
+
+        assert [o[0] for o in ocorrencias] == [
+            INICIO, INICIO + timedelta(days=21), INICIO + timedelta(days=42)
+        ]
+        assert all(f - i == timedelta(minutes=45) for i, f in ocorrencias)
+
+    def test_semanal_ate_data(self):
+        """Semanal até a data limite (inclusiva)."""
+        ate = INICIO + timedelta(weeks=3)
+        ocorrencias = Recorrencia("semanal", ate=ate).expandir(INICIO, FIM)
+
+        assert len(ocorrencias) == 4
+        assert ocorrencias[-1][0] == ate
+
+    def test_semanal_varios_dias(self):
+        """Segundas e quintas, 4 sessões."""
+        ocorrencias = Recorrencia("semanal", dias_semana={0, 3}, contagem=4).expandir(INICIO, FIM)
+
+        assert [o[0].weekday() for o in ocorrencias] == [0, 3, 0, 3]
+        assert ocorrencias[1][0] == INICIO + timedelta(days=3)
+
+    def test_semanal_ignora_dias_antes_do_inicio(self):
+        """Dias da semana anteriores ao primeiro agendamento ficam para a semana seguinte."""
+        quarta = INICIO + timedelta(days=2)
+        ocorrencias = Recorrencia("semanal", dias_semana={0, 2}, contagem=2).expandir(
+            quarta, quarta + timedelta(hours=1)
+        )
+
+        assert ocorrencias[0][0] == quarta
+        assert ocorrencias[1][0] == INICIO + timedelta(weeks=1)
+
+    def test_limite_de_ocorrencias(self):
+        """Regras longas demais devem ser rejeitadas."""
+        regra = Recorrencia("diaria", ate=INICIO + timedelta(days=1000))
+        with pytest.raises(ValueError, match="mais de"):
+            regra.expandir(INICIO, FIM)
+
+    def test_periodo_invalido(self):
+        with pytest.raises(ValueError):
+            Recorrencia("diaria", contagem=2).expandir(FIM, INICIO)
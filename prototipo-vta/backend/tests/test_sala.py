@@ -409,6 +409,25 @@ class TestSalaStatusEm:
         
         status = sala_valida.statusEm(agora, reservas)
         assert status == "ocupada"
+    
+    def test_statusEm_reserva_dict(self, sala_valida):
+        """Deve considerar linhas do banco (dicts do RealDictCursor)."""
+        agora = datetime.now()
+        
+        reservas = [{
+            "inicio": agora - timedelta(minutes=30),
+            "fim": agora + timedelta(minutes=30)
+        }]
+        
+        status = sala_valida.statusEm(agora, reservas)
+        assert status == "ocupada"
+    
+    def test_statusEm_reserva_dict_incompleto(self, sala_valida):
+        """Deve ignorar dict sem as chaves inicio/fim."""
+        agora = datetime.now()
+        
+        status = sala_valida.statusEm(agora, [{"inicio": agora}])
+        assert status == "livre"
 
 
 # ============================================================================
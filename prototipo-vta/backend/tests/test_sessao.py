@@ -0,0 +1,160 @@
+"""
+Testes para o gerenciador de sessões no servidor
+pytest test_sessao.py -v
+"""
+
+import time
+import pytest
+from unittest.mock import Mock
+
+from backend.models.usuario import bit_acao
+from backend.services.sessao import BackendSessaoSQLite, GerenciadorSessoes
+
+
+# ============================================================================
+# FIXTURES
+# ============================================================================
+
+@pytest.fixture
+def backend():
+    b = BackendSessaoSQLite(":memory:")
+    yield b
+    b.fechar()
+
+
+@pytest.fixture
+def sessoes(relogio):
+    """Gerenciador só em memória, ttl de 60 s."""
+    return GerenciadorSessoes(ttl=60, relogio=relogio)
+
+
+# ============================================================================
+# TESTES EM MEMÓRIA
+# ============================================================================
+
+class TestGerenciadorSessoes:
+    """Testes do cache em memória."""
+
+    def test_criar_e_validar(self, sessoes):
+        token = sessoes.criar(7, "Veterinário")
+
+        sessao = sessoes.validar(token)
+        assert sessao.usuario_id == "7"
+        assert sessao.perfil == "Veterinário"
+        assert len(token) >= 43
+
+    def test_mascara_de_permissoes(self, sessoes):
+        sessao = sessoes.validar(sessoes.criar(1, "recepcionista"))
+
+        assert sessao.mascara & bit_acao("criar")
+        assert not sessao.mascara & bit_acao("excluir")
+
+    def test_token_invalido(self, sessoes):
+        assert sessoes.validar(None) is None
+        assert sessoes.validar("inexistente") is None
+
+    def test_expiracao_deslizante(self, sessoes, relogio):
+        token = sessoes.criar(1, "Admin")
+
+        for _ in range(3):
+            relogio.agora += 50
+            assert sessoes.validar(token) is not None
+
+        relogio.agora += 61
+        assert sessoes.validar(token) is None
+        assert len(sessoes) == 0
+
+    def test_revogar_usuario(self, sessoes):
+        tokens = [sessoes.criar(1, "Admin") for _ in range(3)]
+        outra = sessoes.criar(2, "Admin")
+
+        assert sessoes.revogar_usuario(1) == 3
+        assert all(sessoes.validar(t) is None for t in tokens)
+        assert sessoes.validar(outra) is not None
+
+    def test_lru_descarta_menos_usada(self, relogio):
+        sessoes = GerenciadorSessoes(ttl=60, max_em_cache=2, relogio=relogio)
+        a = sessoes.criar(1, "Admin")
+        b = sessoes.criar(2, "Admin")
+        sessoes.validar(a)
+        sessoes.criar(3, "Admin")
+
+        assert sessoes.validar(a) is not None
+        assert sessoes.validar(b) is None
+
+    def test_varrer(self, sessoes, relogio):
+        sessoes.criar(1, "Admin")
+        relogio.agora += 30
+        viva = sessoes.criar(2, "Admin")
+        relogio.agora += 31
+
+        assert sessoes.varrer() == 1
+        assert sessoes.validar(viva) is not None
+
+    def test_varredura_em_segundo_plano(self):
+        sessoes = GerenciadorSessoes(ttl=0.01)
+        sessoes.criar(1, "Admin")
+
+        sessoes.iniciar_varredura(intervalo=0.01)
+        try:
+            limite = time.monotonic() + 2
+            while len(sessoes) and time.monotonic() < limite:
+                time.sleep(0.01)
+        finally:
+            sessoes.parar_varredura()
+
+        assert len(sessoes) == 0
+
+
+# ============================================================================
+# TESTES COM BACKEND
+# ============================================================================
+
+class TestBackendSessao:
+    """Testes com o backend SQLite."""
+
+    def test_sobrevive_a_reinicio(self, backend, relogio):
+        token = GerenciadorSessoes(backend=backend, ttl=60, relogio=relogio).criar(1, "Admin")
+
+        # Novo processo: cache vazio, sessão carregada do backend
+        novo = GerenciadorSessoes(backend=backend, ttl=60, relogio=relogio)
+        assert novo.validar(token).usuario_id == "1"
+
+    def test_token_nao_gravado_em_claro(self, backend):
+        token = GerenciadorSessoes(backend=backend).criar(1, "Admin")
+
+        valores = backend._conn.execute("SELECT token_hash FROM sessao").fetchall()
+        assert token not in {v[0] for v in valores}
+
+    def test_validacao_no_cache_nao_acessa_backend(self, relogio):
+        backend = Mock()
+        sessoes = GerenciadorSessoes(backend=backend, ttl=600, revalidar_apos=3600, relogio=relogio)
+        token = sessoes.criar(1, "Admin")
+
+        relogio.agora += 10
+        assert sessoes.validar(token) is not None
+        backend.buscar.assert_not_called()
+        backend.renovar.assert_not_called()
+
+        # Renovação acumulada passa de ttl/10: regrava expira_em
+        relogio.agora += 55
+        sessoes.validar(token)
+        backend.renovar.assert_called_once()
+
+    def test_revogacao_em_outro_processo(self, backend, relogio):
+        a = GerenciadorSessoes(backend=backend, ttl=600, revalidar_apos=30, relogio=relogio)
+        b = GerenciadorSessoes(backend=backend, ttl=600, revalidar_apos=30, relogio=relogio)
+        token = a.criar(1, "Admin")
+        assert b.validar(token) is not None
+
+        a.revogar_usuario(1)
+        relogio.agora += 31
+
+        assert b.validar(token) is None
+
+    def test_varrer_backend(self, backend, relogio):
+        sessoes = GerenciadorSessoes(backend=backend, ttl=60, relogio=relogio)
+        sessoes.criar(1, "Admin")
+        relogio.agora += 61
+
+        assert GerenciadorSessoes(backend=backend, relogio=relogio).varrer() == 1
@@ -467,6 +467,31 @@ class TestPermissoes:
         assert usuario_admin.pode("   ") is False
         assert usuario_admin.pode(None) is False
         assert usuario_admin.pode(123) is False
+
+    def test_pode_acao_nao_hashable(self, usuario_admin):
+        """Ação de tipo inválido não deve quebrar a memoização."""
+        assert usuario_admin.pode(["editar"]) is False
+
+    def test_perfil_pode_por_enum_e_valor(self):
+        """Deve resolver a permissão pelo perfil (enum ou valor da sessão)."""
+        assert Usuario.perfil_pode(PerfilUsuario.RECEPCIONISTA, "criar") is True
+        assert Usuario.perfil_pode("recepcionista", " Editar ") is False
+        assert Usuario.perfil_pode("admin", "qualquer_coisa") is True
+        assert Usuario.perfil_pode("desconhecido", "visualizar") is False
+
+    def test_perfil_pode_nome_de_exibicao(self):
+        """Deve aceitar os nomes gravados na tabela usuarios."""
+        assert Usuario.perfil_pode("Administrador", "excluir") is True
+        assert Usuario.perfil_pode("Recepcionista", "criar") is True
+        assert Usuario.perfil_pode("Veterinário", "visualizar") is True
+        assert Usuario.perfil_pode("Veterinário", "editar") is False
+
+    def test_mascaras_consistentes_com_mapa(self):
+        """Máscara pré-calculada deve refletir PERMISSOES_POR_PERFIL."""
+        for perfil, permissoes in Usuario.PERMISSOES_POR_PERFIL.items():
+            for acao in ("visualizar", "criar", "editar", "excluir"):
+                esperado = perfil == PerfilUsuario.ADMIN or acao in permissoes
+                assert Usuario.perfil_pode(perfil, acao) is esperado
     
     def test_get_permissoes_admin(self, usuario_admin):
         """Deve retornar todas permissões para admin."""